@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""Análise em lote de projetos App Inventor (.aia)
+
+Atalho para a linha de comando de featury_envy.lote (equivalente a `python -m featury_envy.lote`).
+
+Exemplo:
+    python analise_em_lote.py submissoes/ --limite 3 --processos 8 -o resultados.jsonl
+"""
+
+import sys
+
+from featury_envy.lote import main
+
+if __name__ == "__main__":
+    sys.exit(main())
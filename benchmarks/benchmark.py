@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""Benchmark do analisador sobre projetos .aia sintéticos
+
+Gera projetos com o gerador_aia para cada tamanho escolhido e mede cada etapa
+(extração, leitura, parse, detecção) e o tempo ponta a ponta: tempo, vazão e pico de memória.
+Os resultados são gravados em JSON para comparação entre commits.
+
+Exemplo:
+    python benchmarks/benchmark.py --tamanhos pequeno,medio -o bench_atual.json
+    python benchmarks/benchmark.py --tamanhos pequeno,medio --comparar bench_anterior.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_REPOSITORIO)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import featury_envy as analisador
+from gerador_aia import gerar_aia
+
+# Tamanhos pré-definidos (parâmetros do gerador_aia.gerar_aia)
+TAMANHOS: Dict[str, Dict[str, int]] = {
+    "pequeno": dict(telas=1, blocos_por_tela=500, procedimentos=5, parametros=4,
+                    comprimento_next=10, profundidade=2, lastro_kb=256),
+    "medio": dict(telas=4, blocos_por_tela=5000, procedimentos=40, parametros=5,
+                  comprimento_next=25, profundidade=3, lastro_kb=2048),
+    "grande": dict(telas=2, blocos_por_tela=50000, procedimentos=200, parametros=6,
+                   comprimento_next=50, profundidade=4, lastro_kb=8192),
+    "cadeia_longa": dict(telas=1, blocos_por_tela=20000, procedimentos=2, parametros=3,
+                         comprimento_next=5000, profundidade=1, lastro_kb=0),
+}
+
+
+# =====================================
+# Medição
+# =====================================
+def medir(funcao: Callable[[], object], repeticoes: int) -> Dict[str, float]:
+    """
+    Executa a função 'repeticoes' vezes e devolve o melhor tempo, a mediana e o pico de memória
+    (tracemalloc, numa execução separada para não distorcer o tempo).
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    tempos.sort()
+    return {
+        "tempo_s": tempos[0],
+        "mediana_s": tempos[len(tempos) // 2],
+        "pico_memoria_bytes": pico,
+    }
+
+def rss_maximo_bytes() -> int:
+    """
+    RSS máximo do processo até agora (ru_maxrss é em KB no Linux e em bytes no macOS).
+    """
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def _etapas(caminho_aia: str, telas: List, diretorio_extracao: str) -> Dict[str, Callable[[], object]]:
+    componentes = analisador.ler_componentes_aia(caminho_aia) or {}
+    asts_dict = [analisador.parse_blockly_xml_to_ast(xml) for _, xml in telas]
+    asts_compactas = [analisador.parse_blockly_xml_to_ast(xml, compacta=True) for _, xml in telas]
+
+    def extrair_disco():
+        analisador.extrair_arquivo_aia(caminho_aia, diretorio_extracao)
+        for caminho in analisador.encontrar_arquivos_bky(diretorio_extracao):
+            with open(caminho, "rb") as f:
+                f.read()
+
+    def motor_regras():
+        motor = analisador.criar_motor_padrao()
+        for (nome, _), ast in zip(telas, asts_compactas):
+            motor.analisar(ast, nome, componentes.get(nome))
+
+    def ponta_a_ponta():
+        motor = analisador.criar_motor_padrao()
+        comps = analisador.ler_componentes_aia(caminho_aia) or {}
+        for nome, xml in analisador.ler_telas_aia(caminho_aia):
+            motor.analisar(analisador.parse_blockly_xml_to_ast(xml, compacta=True), nome, comps.get(nome))
+
+    def paralelo(executor: str) -> Callable[[], object]:
+        tarefas = [(nome, xml, componentes.get(nome), 3, 2.0, 3, False) for nome, xml in telas]
+        return lambda: analisador.mapear_telas(analisador.analisar_tela, tarefas, executor)
+
+    # Snapshot da revisão anterior em que só a primeira tela difere (reanálise de 1 tela em N)
+    snapshot = analisador.analisar_revisao(caminho_aia)["snapshot"]
+    primeira_tela = telas[0][0]
+    snapshot["telas"][primeira_tela] = dict(snapshot["telas"][primeira_tela], assinatura={})
+
+    return {
+        "extrair_disco": extrair_disco,
+        "ler_memoria": lambda: analisador.ler_telas_aia(caminho_aia),
+        "parse_dict": lambda: [analisador.parse_blockly_xml_to_ast(xml) for _, xml in telas],
+        "parse_compacta": lambda: [analisador.parse_blockly_xml_to_ast(xml, compacta=True) for _, xml in telas],
+        "detectar_procedimentos": lambda: [analisador.find_procedures_in_ast(ast) for ast in asts_dict],
+        "detectar_streaming": lambda: [analisador.find_procedures_streaming(xml) for _, xml in telas],
+        "motor_regras": motor_regras,
+        "ponta_a_ponta": ponta_a_ponta,
+        "telas_threads": paralelo("threads"),
+        "telas_processos": paralelo("processos"),
+        "revisao_incremental": lambda: analisador.analisar_revisao(caminho_aia, snapshot),
+    }
+
+def executar_tamanho(nome: str, parametros: Dict[str, int], repeticoes: int, diretorio: str) -> Dict:
+    """
+    Gera o projeto de um tamanho e mede todas as etapas.
+    """
+    caminho_aia = os.path.join(diretorio, f"{nome}.aia")
+    gerar_aia(caminho_aia, **parametros)
+    telas = analisador.ler_telas_aia(caminho_aia)
+    bytes_xml = sum(len(xml) for _, xml in telas)
+    blocos = sum(xml.count(b"<block ") for _, xml in telas)
+
+    resultado = {
+        "parametros": parametros,
+        "tamanho_aia_bytes": os.path.getsize(caminho_aia),
+        "bytes_xml": bytes_xml,
+        "blocos": blocos,
+        "etapas": {},
+    }
+    for etapa, funcao in _etapas(caminho_aia, telas, os.path.join(diretorio, f"{nome}_extraido")).items():
+        medida = medir(funcao, repeticoes)
+        medida["blocos_por_s"] = blocos / medida["tempo_s"] if medida["tempo_s"] > 0 else 0.0
+        medida["mb_xml_por_s"] = bytes_xml / 1e6 / medida["tempo_s"] if medida["tempo_s"] > 0 else 0.0
+        resultado["etapas"][etapa] = medida
+        print(f"  {etapa:<24} {medida['tempo_s'] * 1000:10.2f} ms  "
+              f"{medida['blocos_por_s']:12.0f} blocos/s  {medida['pico_memoria_bytes'] / 1e6:8.2f} MB pico",
+              file=sys.stderr)
+    return resultado
+
+
+# =====================================
+# Metadados e Comparação
+# =====================================
+def commit_atual() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ_REPOSITORIO,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def comparar(atual: Dict, anterior: Dict):
+    """
+    Imprime a razão atual/anterior do tempo de cada etapa (< 1.0 é mais rápido).
+    """
+    print(f"\nComparação com {anterior['meta'].get('commit')} (razão de tempo atual/anterior):", file=sys.stderr)
+    for nome, resultado in atual["resultados"].items():
+        base = anterior["resultados"].get(nome)
+        if not base:
+            continue
+        print(f"[{nome}]", file=sys.stderr)
+        for etapa, medida in resultado["etapas"].items():
+            medida_base = base["etapas"].get(etapa)
+            if medida_base and medida_base["tempo_s"] > 0:
+                razao = medida["tempo_s"] / medida_base["tempo_s"]
+                alerta = "  ⚠️ regressão" if razao > 1.10 else ""
+                print(f"  {etapa:<24} {razao:6.2f}x{alerta}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do analisador sobre projetos .aia sintéticos.")
+    parser.add_argument("--tamanhos", default="pequeno,medio",
+                        help=f"Tamanhos a medir, separados por vírgula ({', '.join(TAMANHOS)})")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("-o", "--saida", default="bench_output.json", help="Arquivo JSON de resultados")
+    parser.add_argument("--comparar", metavar="JSON", help="Resultados anteriores para comparação")
+    args = parser.parse_args()
+
+    nomes = [n.strip() for n in args.tamanhos.split(",") if n.strip()]
+    desconhecidos = [n for n in nomes if n not in TAMANHOS]
+    if desconhecidos:
+        parser.error(f"tamanho(s) desconhecido(s): {', '.join(desconhecidos)}")
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for nome in nomes:
+            print(f"[{nome}]", file=sys.stderr)
+            resultados[nome] = executar_tamanho(nome, TAMANHOS[nome], args.repeticoes, diretorio)
+
+    atual = {
+        "meta": {
+            "commit": commit_atual(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeticoes": args.repeticoes,
+            "rss_maximo_bytes": rss_maximo_bytes(),
+        },
+        "resultados": resultados,
+    }
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(atual, f, indent=2)
+    print(f"\n✅ Resultados gravados em {args.saida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            comparar(atual, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
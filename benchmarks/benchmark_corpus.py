@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Benchmark do armazém colunar do corpus (featury_envy.corpus)
+
+Grava um corpus sintético com N procedimentos (vários projetos e coortes) e mede as consultas
+vetorizadas: contagem por limite, sinalizados em todos os limites, percentis por projeto e por
+coorte, os agregados das métricas de complexidade e os piores casos. Também confere os
+percentis contra numpy.percentile e os agregados contra o pandas.
+
+Exemplo:
+    python benchmarks/benchmark_corpus.py --procedimentos 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_REPOSITORIO)
+
+import numpy as np
+
+from featury_envy.corpus import ArmazemCorpus
+
+
+def gerar_registros(procedimentos: int, projetos: int, semente: int = 0) -> List[Dict]:
+    rng = random.Random(semente)
+    registros = []
+    for i in range(procedimentos):
+        projeto = i % projetos
+        parametros = min(int(rng.expovariate(0.5)), 20)
+        decisoes = rng.randint(0, 6)
+        registros.append({
+            'cohort': f"turma{projeto % 4}",
+            'project': f"projeto{projeto}",
+            'screen_name': f"Screen{rng.randint(1, 5)}",
+            'procedure_name': f"procedimento{i % 50}",
+            'parameter_count': parametros,
+            'parameters': [f"p{j}" for j in range(parametros)],
+            'block_count': rng.randint(1, 400),
+            'max_depth': rng.randint(0, 8),
+            'decision_blocks': decisoes,
+            'cyclomatic_complexity': 1 + decisoes + rng.randint(0, 2),
+            'longest_next_chain': rng.randint(1, 60),
+        })
+    return registros
+
+def medir(funcao: Callable[[], object], repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das consultas do armazém colunar do corpus.")
+    parser.add_argument("--procedimentos", type=int, default=100000)
+    parser.add_argument("--projetos", type=int, default=2000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    registros = gerar_registros(args.procedimentos, args.projetos)
+    with tempfile.TemporaryDirectory() as diretorio:
+        inicio = time.perf_counter()
+        armazem = ArmazemCorpus(diretorio)
+        for i in range(0, len(registros), 50):
+            armazem.acrescentar(registros[i:i + 50])
+        print(f"gravação ({len(registros)} registros em lotes de 50): {time.perf_counter() - inicio:.2f}s")
+
+        inicio = time.perf_counter()
+        armazem = ArmazemCorpus(diretorio)
+        print(f"abertura: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+        consultas = {
+            "contar_acima(3)": lambda: armazem.contar_acima(3),
+            "contar_acima(3, por=project)": lambda: armazem.contar_acima(3, por='project'),
+            "sinalizados_por_limite()": lambda: armazem.sinalizados_por_limite(),
+            "percentis(por=project)": lambda: armazem.percentis(por='project'),
+            "percentis(por=cohort)": lambda: armazem.percentis(por='cohort'),
+            "percentis(cohort=turma1)": lambda: armazem.percentis(por=None, cohort='turma1'),
+            "piores(10)": lambda: armazem.piores(10),
+            "agregar(por=project)": lambda: armazem.agregar(por='project'),
+            "agregar(por=cohort)": lambda: armazem.agregar(por='cohort'),
+        }
+        for nome, consulta in consultas.items():
+            print(f"  {nome:<32} {medir(consulta, args.repeticoes) * 1000:8.2f} ms")
+
+        # Conferência dos percentis contra numpy.percentile
+        contagens = np.array([r['parameter_count'] for r in registros if r['cohort'] == 'turma1'])
+        esperado = np.percentile(contagens, [50, 90, 99])
+        obtido = armazem.percentis(por='cohort')['turma1']
+        assert np.allclose(esperado, [obtido['p50'], obtido['p90'], obtido['p99']]), (esperado, obtido)
+        print("✅ Percentis conferem com numpy.percentile")
+
+        # Conferência dos agregados contra um groupby do pandas
+        import pandas as pd
+        tabela = pd.DataFrame(registros).groupby('project')['block_count'].agg(['mean', 'max'])
+        obtido = armazem.agregar(por='project', metricas=('block_count',))
+        assert all(
+            np.isclose(obtido[projeto]['block_count_media'], linha['mean'])
+            and obtido[projeto]['block_count_maximo'] == linha['max']
+            for projeto, linha in tabela.iterrows()
+        )
+        print("✅ Agregados conferem com o pandas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Benchmark do tempo de importação do pacote featury_envy
+
+Importa o pacote em processos novos (como fazem os trabalhadores do lote) e verifica que:
+  - a importação não imprime nada;
+  - nenhuma dependência pesada ou de ambiente (pandas, plotly, streamlit, google.colab,
+    multiprocessing) é carregada;
+  - o tempo cumulativo de importação (python -X importtime) fica abaixo do limite.
+Sai com código 1 se alguma verificação falhar. tests/test_importacao.py faz as mesmas verificações
+(com um limite de tempo folgado) na suíte de testes.
+
+Exemplo:
+    python benchmarks/benchmark_importacao.py --limite-ms 100
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import List, Optional
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULOS_PROIBIDOS = ("pandas", "plotly", "streamlit", "google", "numpy", "multiprocessing")
+
+_PROGRAMA = (
+    "import sys, featury_envy; "
+    "sys.stderr.write('MODULOS=' + ','.join(sorted({m.split('.')[0] for m in sys.modules})) + '\\n')"
+)
+
+
+def medir_importacao(modulo: str = "featury_envy") -> dict:
+    """
+    Importa o módulo num processo novo com -X importtime e devolve o tempo cumulativo (µs),
+    o que foi impresso no stdout e os módulos de topo carregados.
+    """
+    programa = _PROGRAMA.replace("featury_envy", modulo)
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", programa],
+        cwd=RAIZ_REPOSITORIO, capture_output=True, text=True, check=True,
+    )
+
+    cumulativo_us: Optional[int] = None
+    modulos: List[str] = []
+    for linha in resultado.stderr.splitlines():
+        if linha.startswith("MODULOS="):
+            modulos = linha[len("MODULOS="):].split(",")
+            continue
+        # Formato: "import time: self [us] | cumulative | imported package"
+        correspondencia = re.match(r"import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S+)\s*$", linha)
+        if correspondencia and correspondencia.group(2) == modulo:
+            cumulativo_us = int(correspondencia.group(1))
+
+    return {"cumulativo_us": cumulativo_us, "stdout": resultado.stdout, "modulos": modulos}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mede e verifica o tempo de importação de featury_envy.")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--limite-ms", type=float, default=100.0,
+                        help="Tempo máximo de importação (melhor de N execuções), em ms")
+    args = parser.parse_args()
+
+    medidas = [medir_importacao() for _ in range(args.repeticoes)]
+    melhor_ms = min(m["cumulativo_us"] for m in medidas) / 1000
+    falhas = []
+
+    if any(m["stdout"] for m in medidas):
+        falhas.append(f"a importação imprimiu no stdout: {medidas[0]['stdout']!r}")
+    carregados = sorted(set(medidas[0]["modulos"]) & set(MODULOS_PROIBIDOS))
+    if carregados:
+        falhas.append(f"dependências pesadas carregadas na importação: {', '.join(carregados)}")
+    if melhor_ms > args.limite_ms:
+        falhas.append(f"importação levou {melhor_ms:.1f} ms (limite: {args.limite_ms:.1f} ms)")
+
+    print(f"Tempo de importação de featury_envy: {melhor_ms:.1f} ms (melhor de {args.repeticoes})")
+    if falhas:
+        for falha in falhas:
+            print(f"❌ {falha}")
+        return 1
+    print("✅ Importação sem efeitos colaterais e dentro do limite.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Benchmark do serviço HTTP de análise (featury_envy.servico), inteiramente em localhost
+
+Compara o custo por arquivo de iniciar um interpretador por .aia com o de pedir a análise ao
+serviço (processos já aquecidos) e verifica a contrapressão: com o pool e a fila cheios, os
+pedidos excedentes recebem 429; com um tempo limite curto, 504.
+
+Exemplo:
+    python benchmarks/benchmark_servico.py --pedidos 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Tuple
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_REPOSITORIO)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from featury_envy.servico import ServicoAnalise
+from gerador_aia import gerar_aia
+
+_PROGRAMA_POR_ARQUIVO = (
+    "import json, sys; from featury_envy import resumir_projeto; "
+    "print(json.dumps(resumir_projeto((sys.argv[1], open(sys.argv[1], 'rb').read()))))"
+)
+
+
+async def pedir(porta: int, metodo: str, caminho: str, corpo: bytes = b'') -> Tuple[int, bytes]:
+    leitor, escritor = await asyncio.open_connection('127.0.0.1', porta)
+    escritor.write(f"{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(corpo)}\r\n\r\n"
+                   .encode('latin-1') + corpo)
+    await escritor.drain()
+    resposta = await leitor.read()
+    escritor.close()
+    cabecalho, _, conteudo = resposta.partition(b'\r\n\r\n')
+    return int(cabecalho.split(b' ', 2)[1]), conteudo
+
+async def medir_servico(caminho_aia: str, pedidos: int) -> float:
+    with open(caminho_aia, 'rb') as f:
+        conteudo = f.read()
+    servico = ServicoAnalise(trabalhadores=2, tamanho_fila=pedidos)
+    await servico.iniciar(porta=0)
+    try:
+        inicio = time.perf_counter()
+        for _ in range(pedidos):
+            estado, corpo = await pedir(servico.porta, 'POST', '/analisar?limite=3', conteudo)
+            assert estado == 200, corpo
+        duracao = (time.perf_counter() - inicio) / pedidos
+        resultado = json.loads(corpo)
+        print(f"  telas: {len(resultado['screens'])}, procedimentos: "
+              f"{sum(len(t['procedures']) for t in resultado['screens'])}", file=sys.stderr)
+    finally:
+        await servico.encerrar()
+    return duracao
+
+async def verificar_contrapressao(caminho_aia: str, pedidos: int):
+    with open(caminho_aia, 'rb') as f:
+        conteudo = f.read()
+
+    servico = ServicoAnalise(trabalhadores=1, tamanho_fila=1)
+    await servico.iniciar(porta=0)
+    try:
+        estados = await asyncio.gather(*(pedir(servico.porta, 'POST', '/analisar', conteudo) for _ in range(pedidos)))
+        contagem = Counter(estado for estado, _ in estados)
+        print(f"  rajada de {pedidos} pedidos (1 processo, fila 1): {dict(contagem)}", file=sys.stderr)
+        assert contagem[429] > 0 and contagem[200] >= 1
+        _, metricas = await pedir(servico.porta, 'GET', '/metricas')
+        assert b'featury_envy_servico_rejeitados_fila_cheia_total' in metricas
+    finally:
+        await servico.encerrar()
+
+    servico = ServicoAnalise(trabalhadores=1, tamanho_fila=1, tempo_limite_s=0.001)
+    await servico.iniciar(porta=0)
+    try:
+        estado, _ = await pedir(servico.porta, 'POST', '/analisar', conteudo)
+        print(f"  tempo limite de 1 ms: {estado}", file=sys.stderr)
+        assert estado == 504
+    finally:
+        await servico.encerrar()
+
+    servico = ServicoAnalise(trabalhadores=1, tamanho_fila=1)
+    await servico.iniciar(porta=0)
+    try:
+        estado, corpo = await pedir(servico.porta, 'POST', '/analisar', b'nao e um zip')
+        print(f"  .aia corrompido: {estado} {json.loads(corpo)['erros']}", file=sys.stderr)
+        assert estado == 200
+    finally:
+        await servico.encerrar()
+
+def medir_processo_por_arquivo(caminho_aia: str, pedidos: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(pedidos):
+        subprocess.run([sys.executable, "-c", _PROGRAMA_POR_ARQUIVO, caminho_aia], cwd=RAIZ_REPOSITORIO,
+                       capture_output=True, check=True)
+    return (time.perf_counter() - inicio) / pedidos
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do serviço HTTP de análise em localhost.")
+    parser.add_argument("--pedidos", type=int, default=20)
+    parser.add_argument("--blocos-por-tela", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_aia = gerar_aia(os.path.join(diretorio, "pequeno.aia"), telas=2, blocos_por_tela=args.blocos_por_tela)
+        por_arquivo = medir_processo_por_arquivo(caminho_aia, args.pedidos)
+        servico = asyncio.run(medir_servico(caminho_aia, args.pedidos))
+        print(f"Processo por arquivo: {por_arquivo * 1000:8.1f} ms/arquivo")
+        print(f"Serviço (aquecido):   {servico * 1000:8.1f} ms/arquivo ({por_arquivo / servico:.1f}x)")
+
+        grande = gerar_aia(os.path.join(diretorio, "grande.aia"), telas=2, blocos_por_tela=20000)
+        asyncio.run(verificar_contrapressao(grande, 8))
+    print("✅ Contrapressão (429) e tempo limite (504) verificados")
+
+
+if __name__ == "__main__":
+    main()
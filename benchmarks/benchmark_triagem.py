@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Benchmark da triagem por bytes (featury_envy.procedimentos.triar_tela)
+
+Mede o lote com e sem --triagem (e com --so-longos) num corpus em que a maioria das telas não
+define procedimentos, conferindo que os registros são os mesmos. O teste diferencial tela a tela
+(dataset, telas sintéticas e casos adversariais) está em tests/test_triagem.py.
+
+Exemplo:
+    python benchmarks/benchmark_triagem.py --projetos 200
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from typing import List, Tuple
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_REPOSITORIO)
+
+from gerador_aia import gerar_aia, gerar_xml_tela
+from featury_envy.lote import executar_lote
+from featury_envy.saidas import EscritorJsonl
+
+
+def gerar_corpus(diretorio: str, projetos: int, semente: int = 0) -> List[str]:
+    """
+    Projetos com 4 telas; em cerca de 70% das telas não há procedimentos.
+    """
+    rng = random.Random(semente)
+    caminhos = []
+    for i in range(projetos):
+        caminho = os.path.join(diretorio, f"projeto{i}.aia")
+        gerar_aia(caminho, telas=1, blocos_por_tela=800, procedimentos=rng.randint(1, 4),
+                  parametros=rng.randint(0, 6), semente=i)
+        with zipfile.ZipFile(caminho, 'a') as arquivo_zip:
+            for t in range(2, 5):
+                procedimentos = 0 if rng.random() < 0.9 else 2
+                xml = gerar_xml_tela(800, procedimentos, rng.randint(0, 6), semente=i * 10 + t)
+                arquivo_zip.writestr(f"src/appinventor/ai_benchmark/ProjetoSintetico/Screen{t}.bky", xml)
+        caminhos.append(caminho)
+    return caminhos
+
+def rodar_lote(caminhos: List[str], limite: int, **opcoes) -> Tuple[List[str], float]:
+    saida = io.StringIO()
+    inicio = time.perf_counter()
+    resumo = executar_lote(caminhos, limite, EscritorJsonl(saida), processos=1,
+                           progresso=io.StringIO(), **opcoes)
+    duracao = time.perf_counter() - inicio
+    assert not resumo['falhas'], resumo['falhas']
+    return sorted(saida.getvalue().splitlines()), duracao
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da triagem por bytes no lote.")
+    parser.add_argument("--projetos", type=int, default=200)
+    parser.add_argument("--limite", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = gerar_corpus(diretorio, args.projetos)
+        completo, tempo_completo = rodar_lote(caminhos, args.limite)
+        triado, tempo_triado = rodar_lote(caminhos, args.limite, triagem=True)
+        assert triado == completo, "registros diferentes com --triagem"
+
+        longos = [linha for linha in completo if '"long_parameter_list": true' in linha]
+        so_longos, tempo_so_longos = rodar_lote(caminhos, args.limite, so_longos=True)
+        triado_longos, tempo_triado_longos = rodar_lote(caminhos, args.limite, triagem=True, so_longos=True)
+        assert so_longos == longos and triado_longos == longos, "registros diferentes com --so-longos"
+
+        print(f"{len(caminhos)} projeto(s), 1 processo ({len(completo)} registros, {len(longos)} longos):")
+        print(f"  completo                   {tempo_completo:7.2f}s")
+        print(f"  --triagem                  {tempo_triado:7.2f}s ({tempo_completo / tempo_triado:.1f}x)")
+        print(f"  --so-longos                {tempo_so_longos:7.2f}s")
+        print(f"  --triagem --so-longos      {tempo_triado_longos:7.2f}s "
+              f"({tempo_so_longos / tempo_triado_longos:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
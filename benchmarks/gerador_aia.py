@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Gerador de projetos App Inventor (.aia) sintéticos
+
+Cria arquivos .aia válidos (src/**/*.bky, src/**/*.scm, project.properties e assets de lastro)
+com tamanho configurável, para medir como o analisador escala.
+
+Exemplo:
+    python benchmarks/gerador_aia.py /tmp/grande.aia --telas 4 --blocos-por-tela 50000
+"""
+
+import argparse
+import json
+import random
+import zipfile
+from typing import Dict, List
+
+BLOCKLY_NS = "https://developers.google.com/blockly/xml"
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+
+# Componentes usados nas telas geradas: (nome da instância, tipo)
+COMPONENTES = [
+    ("Botao1", "Button"),
+    ("Botao2", "Button"),
+    ("CaixaDeTexto1", "TextBox"),
+    ("Rotulo1", "Label"),
+    ("TinyDB1", "TinyDB"),
+    ("Notificador1", "Notifier"),
+]
+
+
+class _GeradorTela:
+    """
+    Monta o XML de uma tela bloco a bloco, contando os blocos emitidos.
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.partes: List[str] = []
+        self.total_blocos = 0
+
+    def _abrir_bloco(self, tipo: str, mutacao: str = "", x_y: str = ""):
+        self.total_blocos += 1
+        self.partes.append(f'<block type="{tipo}" id="b{self.total_blocos}"{x_y}>')
+        if mutacao:
+            self.partes.append(f'<mutation xmlns="{XHTML_NS}" {mutacao}></mutation>')
+
+    def _bloco_set(self):
+        """
+        Um 'set Componente.Text' com um bloco de texto no encaixe VALUE (2 blocos).
+        """
+        instancia, tipo = self.rng.choice(COMPONENTES)
+        self._abrir_bloco(
+            "component_set_get",
+            f'component_type="{tipo}" set_or_get="set" property_name="Text" '
+            f'is_generic="false" instance_name="{instancia}"',
+        )
+        self.partes.append(f'<field name="COMPONENT_SELECTOR">{instancia}</field><field name="PROP">Text</field>')
+        self.partes.append('<value name="VALUE">')
+        self._abrir_bloco("text")
+        self.partes.append(f'<field name="TEXT">t{self.total_blocos}</field></block></value>')
+
+    def cadeia(self, comprimento: int, profundidade: int):
+        """
+        Emite 'profundidade' blocos controls_if aninhados e, no mais interno, uma cadeia 'next'
+        de 'comprimento' blocos set.
+        """
+        for _ in range(profundidade):
+            self._abrir_bloco("controls_if")
+            self.partes.append('<value name="IF0">')
+            self._abrir_bloco("logic_boolean")
+            self.partes.append('<field name="BOOL">TRUE</field></block></value><statement name="DO0">')
+
+        for i in range(comprimento):
+            self._bloco_set()
+            if i < comprimento - 1:
+                self.partes.append("<next>")
+        self.partes.append("</block></next>" * (comprimento - 1))
+        if comprimento:
+            self.partes.append("</block>")
+
+        self.partes.append("</statement></block>" * profundidade)
+
+    def procedimento(self, indice: int, parametros: int, comprimento: int, profundidade: int):
+        args = "".join(f'<arg name="p{i}"></arg>' for i in range(parametros))
+        self.total_blocos += 1
+        self.partes.append(
+            f'<block type="procedures_defnoreturn" id="b{self.total_blocos}" x="0" y="{indice * 100}">'
+            f'<mutation xmlns="{XHTML_NS}">{args}</mutation>'
+            f'<field name="NAME">procedimento{indice}</field>'
+        )
+        self.partes.extend(f'<field name="VAR{i}">p{i}</field>' for i in range(parametros))
+        self.partes.append('<statement name="STACK">')
+        self.cadeia(comprimento, profundidade)
+        self.partes.append("</statement></block>")
+
+    def evento(self, indice: int, comprimento: int, profundidade: int):
+        instancia, tipo = COMPONENTES[indice % 2]
+        self._abrir_bloco(
+            "component_event",
+            f'component_type="{tipo}" is_generic="false" instance_name="{instancia}" event_name="Click"',
+            f' x="400" y="{indice * 100}"',
+        )
+        self.partes.append(f'<field name="COMPONENT_SELECTOR">{instancia}</field><statement name="DO">')
+        self.cadeia(comprimento, profundidade)
+        self.partes.append("</statement></block>")
+
+
+def gerar_xml_tela(blocos: int = 500, procedimentos: int = 5, parametros: int = 4,
+                   comprimento_next: int = 10, profundidade: int = 2, semente: int = 0) -> str:
+    """
+    Gera o XML (.bky) de uma tela com 'procedimentos' definições de 'parametros' parâmetros cada
+    e tratadores de evento até atingir aproximadamente 'blocos' blocos.
+    """
+    gerador = _GeradorTela(random.Random(semente))
+    gerador.partes.append(f'<xml xmlns="{BLOCKLY_NS}">')
+    for i in range(procedimentos):
+        gerador.procedimento(i, parametros, comprimento_next, profundidade)
+
+    indice = 0
+    while gerador.total_blocos < blocos:
+        gerador.evento(indice, comprimento_next, profundidade)
+        indice += 1
+
+    gerador.partes.append('<yacodeblocks ya-version="232" language-version="37"></yacodeblocks></xml>')
+    return "".join(gerador.partes)
+
+
+def gerar_scm_tela(nome_tela: str, nome_app: str) -> str:
+    """
+    Gera o .scm (definição dos componentes) de uma tela com os COMPONENTES usados nos blocos.
+    """
+    propriedades: Dict = {
+        "$Name": nome_tela, "$Type": "Form", "$Version": "31", "AppName": nome_app, "Title": nome_tela,
+        "Uuid": "0",
+        "$Components": [
+            {"$Name": instancia, "$Type": tipo, "$Version": "1", "Uuid": str(i + 1)}
+            for i, (instancia, tipo) in enumerate(COMPONENTES)
+        ],
+    }
+    dados = {"authURL": ["ai2.appinventor.mit.edu"], "YaVersion": "232", "Source": "Form", "Properties": propriedades}
+    return "#|\n$JSON\n" + json.dumps(dados, separators=(",", ":")) + "\n|#"
+
+
+def gerar_aia(destino: str, telas: int = 1, blocos_por_tela: int = 500, procedimentos: int = 5,
+              parametros: int = 4, comprimento_next: int = 10, profundidade: int = 2,
+              lastro_kb: int = 0, assets: int = 4, semente: int = 0) -> str:
+    """
+    Grava um .aia sintético em 'destino' e devolve o caminho.
+    'lastro_kb' é o tamanho total dos assets (imagens/sons falsos) distribuído por 'assets' arquivos.
+    """
+    nome_app = "ProjetoSintetico"
+    pacote = f"src/appinventor/ai_benchmark/{nome_app}"
+    rng = random.Random(semente)
+
+    with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+        arquivo_zip.writestr(
+            "youngandroidproject/project.properties",
+            f"main=appinventor.ai_benchmark.{nome_app}.Screen1\nname={nome_app}\nsource=../src\n",
+        )
+        for t in range(1, telas + 1):
+            nome_tela = f"Screen{t}"
+            xml = gerar_xml_tela(blocos_por_tela, procedimentos, parametros, comprimento_next,
+                                 profundidade, semente + t)
+            arquivo_zip.writestr(f"{pacote}/{nome_tela}.bky", xml)
+            arquivo_zip.writestr(f"{pacote}/{nome_tela}.scm", gerar_scm_tela(nome_tela, nome_app))
+
+        if lastro_kb > 0 and assets > 0:
+            tamanho = lastro_kb * 1024 // assets
+            for a in range(assets):
+                # Bytes aleatórios não comprimem, como PNG/MP3 reais
+                arquivo_zip.writestr(f"assets/asset{a}.png", rng.randbytes(tamanho), compress_type=zipfile.ZIP_STORED)
+
+    return destino
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um projeto App Inventor (.aia) sintético.")
+    parser.add_argument("destino", help="Caminho do .aia a gerar")
+    parser.add_argument("--telas", type=int, default=1)
+    parser.add_argument("--blocos-por-tela", type=int, default=500)
+    parser.add_argument("--procedimentos", type=int, default=5)
+    parser.add_argument("--parametros", type=int, default=4)
+    parser.add_argument("--comprimento-next", type=int, default=10)
+    parser.add_argument("--profundidade", type=int, default=2)
+    parser.add_argument("--lastro-kb", type=int, default=0, help="Tamanho total dos assets de lastro (KB)")
+    parser.add_argument("--assets", type=int, default=4, help="Número de arquivos de asset")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    gerar_aia(args.destino, args.telas, args.blocos_por_tela, args.procedimentos, args.parametros,
+              args.comprimento_next, args.profundidade, args.lastro_kb, args.assets, args.semente)
+    print(f"✅ Projeto sintético gravado em {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
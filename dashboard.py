@@ -1,22 +1,42 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import hashlib
 import os
-import tempfile
-import zipfile
-import xml.etree.ElementTree as ET
-from collections import Counter
-from typing import Dict, List, Optional, Tuple
-import json
-
-# Importar funções do processador correto
-from processador_correcto_parametros_longos_ou_feature_envy import (
-    extrair_arquivo_aia,
-    encontrar_arquivos_bky,
-    parse_blockly_xml_to_ast as parse_blockly_xml,
-    find_procedures_in_ast
-)
+import time
+
+import streamlit as st
+
+# Importar funções do analisador (pandas e plotly são carregados apenas ao desenhar os gráficos)
+from featury_envy import ler_projetos_de_zip, ler_telas_aia
+from featury_envy.cache import CacheAnalise
+from featury_envy.paralelo import mapear_telas, resumir_projeto, resumir_tela
+from featury_envy.saidas import FORMATOS, criar_escritor, criar_registro
+
+# Número de projetos analisados mantidos na sessão (chave: hash do conteúdo)
+MAX_PARSED_PROJECTS = 8
+
+# Rótulos das métricas de complexidade calculadas durante o parse
+COMPLEXITY_LABELS = {
+    'block_count': 'Blocos',
+    'max_depth': 'Profundidade',
+    'decision_blocks': 'Decisões',
+    'cyclomatic_complexity': 'Complexidade',
+    'longest_next_chain': 'Maior Sequência',
+}
+
+# Colunas e tamanho de página da tabela de procedimentos
+PROCEDURE_COLUMNS = ('Tela', 'Procedimento', 'Parâmetros', 'Nomes dos Parâmetros', 'Muitos Parâmetros',
+                     'Chamadas', 'Chamado por', 'Chama', 'Máx. Argumentos', 'Não Usado',
+                     *COMPLEXITY_LABELS.values())
+PAGE_SIZE = 50
+
+# Intervalo (segundos) entre as atualizações da página enquanto há projetos da turma em análise
+BATCH_POLL_INTERVAL = 1.0
+
+# Executores disponíveis para analisar as telas de um projeto
+EXECUTORES = {
+    "Threads": "threads",
+    "Processos": "processos",
+    "Sequencial": "sequencial",
+}
 
 # Configuração da página
 st.set_page_config(
@@ -77,6 +97,18 @@ def main():
             help="Número máximo de parâmetros permitidos antes de ser considerado um code smell"
         )
         
+        executor = EXECUTORES[st.selectbox(
+            "Execução das telas",
+            list(EXECUTORES),
+            help="Processos escalam melhor em telas grandes (o parse segura o GIL); threads arrancam mais rápido"
+        )]
+        
+        corpus_dir = st.text_input(
+            "Diretório do corpus",
+            value=os.environ.get("FEATURY_ENVY_CORPUS_DIR", ""),
+            help="Armazém colunar gravado por 'python -m featury_envy.lote ... --corpus DIRETORIO'"
+        )
+        
         st.markdown("---")
         st.markdown("### 📊 Sobre Long Parameter List")
         st.info("""
@@ -96,13 +128,15 @@ def main():
     with col1:
         st.header("📁 Upload do Projeto")
         
-        uploaded_file = st.file_uploader(
-            "Selecione um arquivo .aia",
-            type=['aia'],
-            help="Arquivo de projeto do MIT App Inventor"
+        uploaded_files = st.file_uploader(
+            "Selecione um ou mais arquivos .aia (ou um .zip com vários)",
+            type=['aia', 'zip'],
+            accept_multiple_files=True,
+            help="Arquivos de projeto do MIT App Inventor; um .zip pode conter as submissões de uma turma"
         )
         
-        if uploaded_file is not None:
+        if len(uploaded_files) == 1 and uploaded_files[0].name.endswith('.aia'):
+            uploaded_file = uploaded_files[0]
             # Mostrar informações do arquivo
             file_details = {
                 "Nome": uploaded_file.name,
@@ -112,11 +146,29 @@ def main():
             
             st.json(file_details)
             
-            # Botão para iniciar análise
+            # Botão para iniciar análise (o parse fica guardado; mudar o limite só refiltra)
             if st.button("🚀 Iniciar Análise", type="primary"):
                 with st.spinner("Analisando projeto..."):
-                    results = analyze_project(uploaded_file, param_threshold)
-                    display_results(results)
+                    parse_project(uploaded_file, executor)
+            
+            screens = st.session_state.get('parsed_projects', {}).get(project_digest(uploaded_file))
+            if screens is not None:
+                results = apply_threshold(screens, param_threshold)
+                st.session_state.analysis_results = results
+                display_results(results, param_threshold)
+                display_sensitivity(results, param_threshold)
+        elif uploaded_files:
+            projects = collect_projects(uploaded_files)
+            st.info(f"📚 {len(projects)} projeto(s) .aia selecionado(s)")
+            
+            # A análise corre em segundo plano; os resultados aparecem à medida que cada projeto termina
+            if projects and st.button(f"🚀 Analisar {len(projects)} Projetos", type="primary"):
+                start_batch(projects)
+        
+        batch_pending = display_batch(param_threshold)
+        
+        if corpus_dir:
+            display_corpus(corpus_dir, param_threshold)
     
     with col2:
         st.header("📈 Estatísticas")
@@ -126,73 +178,299 @@ def main():
             display_statistics(results)
         else:
             st.info("Faça upload de um arquivo .aia para ver as estatísticas")
-
-def analyze_project(uploaded_file, param_threshold):
-    """Analisa o projeto .aia e retorna os resultados"""
     
-    # Criar diretório temporário
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Salvar arquivo temporário
-        temp_file_path = os.path.join(temp_dir, uploaded_file.name)
-        with open(temp_file_path, 'wb') as f:
-            f.write(uploaded_file.getvalue())
-        
-        # Extrair arquivo .aia
-        extracted_dir = os.path.join(temp_dir, "extracted")
-        if not extrair_arquivo_aia(temp_file_path, extracted_dir):
-            st.error("❌ Erro ao extrair arquivo .aia")
-            return None
-        
-        # Encontrar arquivos .bky
-        bky_files = encontrar_arquivos_bky(extracted_dir)
-        if not bky_files:
-            st.warning("⚠️ Nenhum arquivo .bky encontrado no projeto")
-            return None
-        
-        # Analisar cada arquivo
-        all_results = []
-        total_screens = len(bky_files)
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i, bky_file in enumerate(bky_files):
-            screen_name = os.path.basename(bky_file).replace('.bky', '')
-            status_text.text(f"Analisando tela: {screen_name}")
-            
+    # Com projetos ainda em análise, a página é desenhada por inteiro e volta a correr pouco depois
+    if batch_pending:
+        time.sleep(BATCH_POLL_INTERVAL)
+        st.rerun()
+
+@st.cache_resource
+def get_analysis_cache():
+    """Cache de análise por conteúdo de tela, partilhado por todas as sessões"""
+    return CacheAnalise()
+
+@st.cache_resource
+def get_worker_pool():
+    """Pool de processos em segundo plano, partilhado por todas as sessões"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # 'spawn' evita copiar as threads do servidor do Streamlit para os trabalhadores
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+
+def collect_projects(uploaded_files):
+    """Lista (nome, bytes) dos projetos enviados, abrindo os .zip com várias submissões"""
+    projects = []
+    for uploaded in uploaded_files:
+        if uploaded.name.endswith('.zip'):
+            contained = ler_projetos_de_zip(uploaded.getvalue())
+            if contained is None:
+                st.error(f"❌ Não foi possível abrir {uploaded.name}")
+                continue
+            projects.extend(contained)
+        else:
+            projects.append((uploaded.name, uploaded.getvalue()))
+    return projects
+
+def start_batch(projects):
+    """Envia cada projeto ao pool em segundo plano; os futuros ficam na sessão"""
+    pool = get_worker_pool()
+    st.session_state.batch_jobs = [
+        (name, pool.submit(resumir_projeto, (name, content))) for name, content in projects
+    ]
+    st.session_state.batch_results = [None] * len(projects)
+
+def batch_summary_rows(param_threshold):
+    """Uma linha por projeto para a tabela de resumo (projetos em análise aparecem como pendentes)"""
+    rows = []
+    for (name, _), result in zip(st.session_state.batch_jobs, st.session_state.batch_results):
+        if result is None:
+            rows.append({"Projeto": name, "Estado": "⏳ Em análise"})
+            continue
+        procedures = [p for screen in result['screens'] for p in screen['procedures']]
+        rows.append({
+            "Projeto": name,
+            "Estado": "❌ " + "; ".join(result['erros']) if result['erros'] else "✅ Concluído",
+            "Telas": len(result['screens']),
+            "Procedimentos": len(procedures),
+            "Com Muitos Parâmetros": sum(1 for p in procedures if p['parameter_count'] > param_threshold),
+            "Máx. Parâmetros": max((p['parameter_count'] for p in procedures), default=0),
+        })
+    return rows
+
+def display_batch(param_threshold):
+    """
+    Mostra o resumo entre projetos com os que já terminaram, sem esperar pelos demais.
+    Devolve True enquanto houver projetos em análise (main agenda uma nova execução da página).
+    """
+    jobs = st.session_state.get('batch_jobs')
+    if not jobs:
+        return False
+    import pandas as pd
+
+    results = st.session_state.batch_results
+    # Recolhe os projetos já terminados: um arquivo lento ou corrompido não atrasa os outros
+    for i, (name, future) in enumerate(jobs):
+        if results[i] is None and future.done():
             try:
-                with open(bky_file, 'r', encoding='utf-8') as f:
-                    xml_content = f.read()
-                
-                structured_data = parse_blockly_xml(xml_content)
-                if structured_data:
-                    # Detectar procedimentos
-                    procedures = find_procedures_in_ast(structured_data)
-                    
-                    # Filtrar procedimentos com muitos parâmetros
-                    smelly_procedures = [p for p in procedures if p['parameter_count'] > param_threshold]
-                    
-                    screen_result = {
-                        'screen_name': screen_name,
-                        'procedures': procedures,
-                        'smelly_procedures': smelly_procedures,
-                        'total_procedures': len(procedures),
-                        'total_blocks': len(structured_data.get('blocks', []))
-                    }
-                    all_results.append(screen_result)
-            
+                results[i] = future.result()
             except Exception as e:
-                st.error(f"Erro ao analisar {screen_name}: {str(e)}")
-            
-            progress_bar.progress((i + 1) / total_screens)
+                results[i] = {'project': name, 'screens': [], 'erros': [f"{type(e).__name__}: {e}"]}
+
+    done = sum(1 for result in results if result is not None)
+    st.header("📚 Resumo da Turma")
+    st.progress(done / len(jobs))
+    st.dataframe(pd.DataFrame(batch_summary_rows(param_threshold)), use_container_width=True)
+    finished = [(job, result) for job, result in zip(jobs, results) if result is not None]
+    if not finished:
+        return True
+
+    # Procedimentos dos projetos terminados numa única tabela paginada
+    frames = []
+    for (name, _), result in finished:
+        frame = procedures_dataframe(result['screens'], param_threshold)
+        frame.insert(0, 'Projeto', name)
+        frames.append(frame)
+    procedures = pd.concat(frames, ignore_index=True)
+    if not procedures.empty:
+        display_parameter_histogram(procedures, param_threshold)
+        display_procedures_table(procedures, key="batch")
+    
+    units = []
+    for (name, _), result in finished:
+        frame = units_dataframe(result['screens'])
+        frame.insert(0, 'Projeto', name)
+        units.append(frame)
+    display_complexity(pd.concat(units, ignore_index=True), by='Projeto')
+    if done < len(jobs):
+        st.info(f"⏳ {len(jobs) - done} projeto(s) ainda em análise; a exportação fica disponível no fim.")
+        return True
+    display_batch_export(jobs, results, param_threshold)
+    return False
+
+def display_batch_export(jobs, results, param_threshold):
+    """Exporta os procedimentos da turma pelos escritores de featury_envy.saidas (JSONL, CSV, SARIF ou texto)"""
+    import io
+
+    st.subheader("💾 Exportar Resultados")
+    formato = st.selectbox("Formato", FORMATOS, key="batch_export_format")
+    buffer = io.StringIO()
+    with criar_escritor(buffer, formato, param_threshold) as escritor:
+        for (name, _), result in zip(jobs, results):
+            projeto = name.replace('.aia', '')
+            escritor.escrever([
+                criar_registro(projeto, screen['screen_name'], proc, param_threshold)
+                for screen in result['screens'] for proc in screen['procedures']
+            ])
+    extensao = {'texto': 'txt'}.get(formato, formato)
+    st.download_button("⬇️ Baixar", buffer.getvalue(), file_name=f"resultados.{extensao}", key="batch_export")
+
+def display_corpus(corpus_dir, param_threshold):
+    """Estatísticas de coorte lidas diretamente do armazém colunar, sem reabrir nenhum .aia"""
+    if not os.path.exists(os.path.join(corpus_dir, 'meta.json')):
+        st.warning(f"⚠️ Nenhum corpus encontrado em {corpus_dir}")
+        return
+    import pandas as pd
+    from featury_envy.corpus import ArmazemCorpus
+
+    corpus = ArmazemCorpus(corpus_dir)
+    st.header("🗄️ Corpus")
+    if not len(corpus):
+        st.info("O corpus ainda não tem registros")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Procedimentos", len(corpus))
+    with col2:
+        st.metric("Projetos", len(corpus.contar_acima(param_threshold, por='project')))
+    with col3:
+        st.metric("Com Muitos Parâmetros", corpus.contar_acima(param_threshold))
+
+    st.subheader("Percentis do número de parâmetros por coorte")
+    percentiles = pd.DataFrame.from_dict(corpus.percentis(por='cohort'), orient='index')
+    flagged = corpus.contar_acima(param_threshold, por='cohort')
+    percentiles['com muitos parâmetros'] = percentiles.index.map(flagged)
+    st.dataframe(percentiles.rename_axis('coorte'), use_container_width=True)
+
+    st.subheader("Complexidade dos procedimentos por coorte")
+    complexity = pd.DataFrame.from_dict(corpus.agregar(por='cohort'), orient='index')
+    st.dataframe(complexity.round(1).rename_axis('coorte'), use_container_width=True)
+
+    st.subheader("Piores casos")
+    st.dataframe(pd.DataFrame(corpus.piores(10)), use_container_width=True, hide_index=True)
+
+def project_digest(uploaded_file):
+    """Hash SHA-256 do conteúdo do upload, usado como chave dos dados já analisados"""
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+def parse_project(uploaded_file, executor="threads"):
+    """Gera os resumos das telas (independentes do limite) e guarda-os na sessão pelo hash do conteúdo"""
+    parsed = st.session_state.setdefault('parsed_projects', {})
+    digest = project_digest(uploaded_file)
+    if digest in parsed:
+        return parsed[digest]
+    
+    # Ler as telas diretamente do upload, sem gravar nada no disco
+    telas = ler_telas_aia(uploaded_file.getvalue())
+    if telas is None:
+        st.error("❌ Erro ao abrir arquivo .aia")
+        return None
+
+    if not telas:
+        st.warning("⚠️ Nenhum arquivo .bky encontrado no projeto")
+        return None
+
+    cache = get_analysis_cache()
+    total_screens = len(telas)
+    
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    # Consultar o cache antes de gerar a AST; só as telas ausentes vão para o pool
+    summaries = [None] * total_screens
+    pending = []
+    for i, (_, xml_content) in enumerate(telas):
+        summaries[i] = cache.obter(cache.chave(xml_content, detector='resumo_tela'))
+        if summaries[i] is None:
+            pending.append(i)
+    done = total_screens - len(pending)
+    progress_bar.progress(done / total_screens)
+
+    def on_screen_done(index, summary, completed, total):
+        i = pending[index]
+        screen_name, xml_content = telas[i]
+        if isinstance(summary, Exception):
+            st.error(f"Erro ao analisar {screen_name}: {str(summary)}")
+        else:
+            summaries[i] = summary
+            if summary is not None:
+                cache.guardar(cache.chave(xml_content, detector='resumo_tela'), summary)
+        status_text.text(f"Tela analisada: {screen_name} ({done + completed}/{total_screens})")
+        progress_bar.progress((done + completed) / total_screens)
+
+    # Com processos, reaproveita o pool 'spawn' da sessão: um fork copiaria as threads do servidor do Streamlit
+    pool = get_worker_pool() if executor == "processos" else None
+    mapear_telas(resumir_tela, [telas[i] for i in pending], executor, ao_concluir=on_screen_done, pool=pool)
+    
+    # Guardar os resumos na ordem original das telas
+    screens = [
+        dict(summary, screen_name=screen_name)
+        for (screen_name, _), summary in zip(telas, summaries) if summary
+    ]
+    status_text.text("✅ Análise concluída!")
+    
+    # Manter apenas os projetos mais recentes na sessão
+    while len(parsed) >= MAX_PARSED_PROJECTS:
+        parsed.pop(next(iter(parsed)))
+    parsed[digest] = screens
+    return screens
+
+def apply_threshold(screens, param_threshold):
+    """Filtra os procedimentos de cada tela pelo limite atual, sem refazer o parse"""
+    all_results = []
+    for screen in screens:
+        procedures = screen['procedures']
         
-        status_text.text("✅ Análise concluída!")
+        # Filtrar procedimentos com muitos parâmetros
+        smelly_procedures = [p for p in procedures if p['parameter_count'] > param_threshold]
         
-        # Salvar resultados na sessão
-        st.session_state.analysis_results = all_results
-        return all_results
+        all_results.append({
+            'screen_name': screen['screen_name'],
+            'procedures': procedures,
+            'units': screen['units'],
+            'smelly_procedures': smelly_procedures,
+            'total_procedures': len(procedures),
+            'total_blocks': screen['total_blocks']
+        })
+    return all_results
+
+def threshold_sensitivity(results):
+    """
+    Procedimentos e telas sinalizados em cada limite de 1 até o maior número de parâmetros.
+    Calculado de uma vez para todos os limites: 'mais de t parâmetros' = total - acumulado até t.
+    """
+    import numpy as np
+
+    counts = np.fromiter(
+        (p['parameter_count'] for screen in results for p in screen['procedures']), dtype=np.int64
+    )
+    screen_max = np.fromiter(
+        (max((p['parameter_count'] for p in screen['procedures']), default=0) for screen in results),
+        dtype=np.int64
+    )
+    max_threshold = max(int(counts.max(initial=0)), 1)
+    thresholds = np.arange(1, max_threshold + 1)
+
+    def flagged(values):
+        cumulative = np.cumsum(np.bincount(values, minlength=max_threshold + 1))
+        return len(values) - cumulative[thresholds]
+
+    return thresholds, flagged(counts), flagged(screen_max)
+
+def display_sensitivity(results, param_threshold):
+    """Painel de sensibilidade: quantos procedimentos e telas seriam sinalizados em cada limite"""
+    if not results:
+        return
+    import pandas as pd
+    import plotly.express as px
 
-def display_results(results):
+    thresholds, procedures, screens = threshold_sensitivity(results)
+    data = pd.DataFrame({
+        'Limite': thresholds,
+        'Procedimentos sinalizados': procedures,
+        'Telas sinalizadas': screens,
+    })
+
+    st.header("🎚️ Sensibilidade do Limite")
+    fig = px.line(
+        data, x='Limite', y=['Procedimentos sinalizados', 'Telas sinalizadas'], markers=True,
+        title="Itens sinalizados por limite de parâmetros"
+    )
+    fig.add_vline(x=param_threshold, line_dash="dash", line_color="#e74c3c")
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(data, use_container_width=True, hide_index=True)
+
+def display_results(results, param_threshold):
     """Exibe os resultados da análise"""
     
     if not results:
@@ -224,61 +502,120 @@ def display_results(results):
         else:
             st.metric("Taxa de Problemas", "0%")
     
-    # Resultados detalhados por tela
+    # Resultados detalhados: uma tabela paginada e um único gráfico agregado, qualquer que seja o tamanho do projeto
     st.header("📋 Resultados Detalhados")
     
-    for screen_result in results:
-        with st.expander(f"📱 {screen_result['screen_name']}", expanded=True):
-            procedures = screen_result.get('procedures', [])
-            smelly_procedures = screen_result.get('smelly_procedures', [])
-            
-            # Mostrar todos os procedimentos encontrados
-            if procedures:
-                st.info(f"📋 {len(procedures)} procedimento(s) encontrado(s) nesta tela")
-                for proc in procedures:
-                    is_smelly = proc['parameter_count'] > 3  # threshold padrão
-                    if is_smelly:
-                        st.warning(f"⚠️ **{proc['procedure_name']}** ({proc['parameter_count']} parâmetros)")
-                    else:
-                        st.success(f"✅ **{proc['procedure_name']}** ({proc['parameter_count']} parâmetros)")
-                    
-                    if proc['parameters']:
-                        st.markdown(f"**Parâmetros:** {', '.join(proc['parameters'])}")
-                    st.markdown("---")
-            else:
-                st.info("Nenhum procedimento encontrado nesta tela")
-            
-            # Mostrar casos problemáticos
-            if smelly_procedures:
-                st.error(f"🚨 {len(smelly_procedures)} procedimento(s) com muitos parâmetros encontrado(s)")
-                
-                for i, proc in enumerate(smelly_procedures, 1):
-                    st.markdown(f"**Problema #{i}:** {proc['procedure_name']}")
-                    
-                    # Gráfico de parâmetros
-                    fig = go.Figure(data=[
-                        go.Bar(
-                            x=['Parâmetros'],
-                            y=[proc['parameter_count']],
-                            marker_color=['#e74c3c']
-                        )
-                    ])
-                    
-                    fig.update_layout(
-                        title=f"Parâmetros - {proc['procedure_name']}",
-                        yaxis_title="Número de Parâmetros",
-                        height=300
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Detalhes dos parâmetros
-                    if proc['parameters']:
-                        st.markdown("**Parâmetros:**")
-                        for param in proc['parameters']:
-                            st.markdown(f"- {param}")
-                    
-                    st.markdown("---")
+    procedures = procedures_dataframe(results, param_threshold)
+    if procedures.empty:
+        st.info("Nenhum procedimento encontrado neste projeto")
+    else:
+        display_parameter_histogram(procedures, param_threshold)
+        display_procedures_table(procedures, key="results")
+    
+    display_complexity(units_dataframe(results), by='Tela')
+
+def procedures_dataframe(results, param_threshold):
+    """Uma linha por procedimento de todas as telas"""
+    import pandas as pd
+
+    rows = [
+        {
+            'Tela': screen['screen_name'],
+            'Procedimento': proc['procedure_name'],
+            'Parâmetros': proc['parameter_count'],
+            'Nomes dos Parâmetros': ', '.join(proc['parameters']),
+            'Muitos Parâmetros': proc['parameter_count'] > param_threshold,
+            'Chamadas': proc['call_sites'],
+            'Chamado por': proc['fan_in'],
+            'Chama': proc['fan_out'],
+            'Máx. Argumentos': proc['max_arguments_passed'],
+            'Não Usado': proc['unused'],
+            **{label: proc[metric] for metric, label in COMPLEXITY_LABELS.items()},
+        }
+        for screen in results for proc in screen.get('procedures', [])
+    ]
+    return pd.DataFrame(rows, columns=list(PROCEDURE_COLUMNS))
+
+def units_dataframe(results):
+    """Uma linha por procedimento ou tratador de evento, com as métricas de complexidade"""
+    import pandas as pd
+
+    rows = [
+        {
+            'Tela': screen['screen_name'],
+            'Tipo': 'Procedimento' if unit['kind'] == 'procedure' else 'Evento',
+            'Nome': unit['name'],
+            **{label: unit[metric] for metric, label in COMPLEXITY_LABELS.items()},
+        }
+        for screen in results for unit in screen.get('units', [])
+    ]
+    return pd.DataFrame(rows, columns=['Tela', 'Tipo', 'Nome', *COMPLEXITY_LABELS.values()])
+
+def display_complexity(units, by):
+    """Média e máximo de cada métrica de complexidade por grupo (groupby vetorizado) e as unidades mais complexas"""
+    if units.empty:
+        return
+    st.header("🧩 Complexidade")
+    metrics = list(COMPLEXITY_LABELS.values())
+    summary = units.groupby(by, sort=True)[metrics].agg(['mean', 'max'])
+    summary.columns = [f"{metric} ({'média' if stat == 'mean' else 'máx.'})" for metric, stat in summary.columns]
+    summary.insert(0, 'Unidades', units.groupby(by, sort=True).size())
+    st.dataframe(summary.round(1), use_container_width=True)
+    
+    st.subheader("Procedimentos e eventos mais complexos")
+    worst = units.sort_values(['Complexidade', 'Blocos'], ascending=False, kind="stable").head(10)
+    st.dataframe(worst, use_container_width=True, hide_index=True)
+
+def display_parameter_histogram(procedures, param_threshold):
+    """Histograma do número de parâmetros de todos os procedimentos do projeto"""
+    import plotly.express as px
+
+    fig = px.histogram(
+        procedures,
+        x='Parâmetros',
+        color='Muitos Parâmetros',
+        color_discrete_map={True: '#e74c3c', False: '#2ecc71'},
+        title="Distribuição do Número de Parâmetros",
+        labels={'count': 'Procedimentos'}
+    )
+    fig.add_vline(x=param_threshold + 0.5, line_dash="dash", line_color="#e74c3c")
+    fig.update_layout(bargap=0.1, height=350)
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_procedures_table(procedures, key):
+    """Tabela de procedimentos com filtro, ordenação e paginação (número fixo de widgets)"""
+    filter_col1, filter_col2, filter_col3 = st.columns([2, 2, 1])
+    with filter_col1:
+        search = st.text_input("Filtrar por nome", key=f"{key}_search")
+    with filter_col2:
+        screens = st.multiselect("Telas", sorted(procedures['Tela'].unique()), key=f"{key}_screens")
+    with filter_col3:
+        only_smelly = st.checkbox("Só com muitos parâmetros", key=f"{key}_only_smelly")
+    
+    filtered = procedures
+    if search:
+        filtered = filtered[filtered['Procedimento'].str.contains(search, case=False, regex=False)]
+    if screens:
+        filtered = filtered[filtered['Tela'].isin(screens)]
+    if only_smelly:
+        filtered = filtered[filtered['Muitos Parâmetros']]
+    
+    sort_col1, sort_col2, sort_col3 = st.columns([2, 1, 1])
+    with sort_col1:
+        columns = list(procedures.columns)
+        sort_by = st.selectbox("Ordenar por", columns, index=columns.index('Parâmetros'), key=f"{key}_sort_by")
+    with sort_col2:
+        descending = st.checkbox("Decrescente", value=True, key=f"{key}_descending")
+    filtered = filtered.sort_values(sort_by, ascending=not descending, kind="stable")
+    
+    pages = max(1, -(-len(filtered) // PAGE_SIZE))
+    with sort_col3:
+        page = st.number_input("Página", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    page = min(page, pages)
+    
+    start = (page - 1) * PAGE_SIZE
+    st.dataframe(filtered.iloc[start:start + PAGE_SIZE], use_container_width=True, hide_index=True)
+    st.caption(f"{len(filtered)} de {len(procedures)} procedimento(s) — página {page} de {pages}")
 
 def display_statistics(results):
     """Exibe estatísticas gerais"""
@@ -287,10 +624,11 @@ def display_statistics(results):
         return
     
     # Calcular estatísticas
-    total_smelly_procedures = sum(len(screen.get('smelly_procedures', [])) for screen in results)
     screens_with_smells = len([screen for screen in results if screen.get('smelly_procedures')])
     total_screens = len(results)
     
+    import plotly.express as px
+
     # Gráfico de pizza - Telas com/sem problemas
     fig_pie = px.pie(
         values=[screens_with_smells, total_screens - screens_with_smells],
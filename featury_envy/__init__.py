@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Detector de code smells (Long Parameter List e Feature Envy) em projetos App Inventor
+
+Importar o pacote não tem efeitos colaterais: nada é impresso, o Google Drive não é montado
+(use featury_envy.colab.montar_google_drive) e só a biblioteca padrão é carregada.
+O cache (featury_envy.cache), o armazém do corpus (featury_envy.corpus, que usa numpy),
+a reanálise incremental (featury_envy.incremental), a detecção de duplicação
+(featury_envy.duplicacao), o agrupamento de projetos semelhantes (featury_envy.similaridade,
+que usa numpy), o serviço HTTP (featury_envy.servico) e o processamento em lote
+(featury_envy.lote) são carregados apenas quando usados.
+"""
+
+from .aia import (
+    abrir_arquivo_aia,
+    encontrar_arquivos_bky,
+    extrair_arquivo_aia,
+    ler_componentes_aia,
+    ler_componentes_scm,
+    ler_projetos_de_zip,
+    ler_telas_aia,
+    listar_membros_bky,
+    listar_membros_scm,
+    nome_da_tela,
+)
+from .analise import analisar_projeto_completo
+from .arvore import (
+    ArvoreBlocos,
+    NoBloco,
+    construir_arvore_blocos,
+    contar_blocos,
+    filhos_do_bloco,
+    metricas_do_bloco,
+    parse_blockly_xml_to_ast,
+)
+from .constantes import (
+    BLOCKLY_NS,
+    BN,
+    METRICAS_COMPLEXIDADE,
+    TIPOS_DECISAO,
+    TIPOS_PROCEDIMENTO,
+    VERSAO_ANALISADOR,
+    XHTML_NS,
+    XN,
+    OrigemAia,
+)
+from .feature_envy import (
+    TIPOS_REFERENCIA_COMPONENTE,
+    construir_indice_referencias,
+    find_feature_envy,
+)
+from .instrumentacao import Instrumentacao, Sink, SinkCallback, SinkJSON, SinkPrometheus
+from .paralelo import EXECUTORES, analisar_tela, mapear_telas, resumir_projeto, resumir_tela
+from .procedimentos import (
+    detalhar_procedimento,
+    find_procedures_in_ast,
+    find_procedures_streaming,
+    iterar_procedimentos_xml,
+    limite_superior_parametros,
+    metricas_das_unidades,
+    pode_ter_procedimentos,
+    triar_tela,
+)
+from .regras import (
+    ContextoTela,
+    MotorRegras,
+    Regra,
+    RegraFeatureEnvy,
+    RegraListaParametrosLonga,
+    criar_motor_padrao,
+)
+from .relatorios import (
+    gerar_relatorio_agrupamentos,
+    gerar_relatorio_desempenho_regras,
+    gerar_relatorio_diferenca,
+    gerar_relatorio_duplicacao,
+    gerar_relatorio_feature_envy,
+    gerar_relatorio_smell,
+)
+from .saidas import (
+    FORMATOS,
+    EscritorCsv,
+    EscritorJsonl,
+    EscritorRegistros,
+    EscritorSarif,
+    EscritorTexto,
+    criar_escritor,
+    criar_registro,
+)
+from .simbolos import (
+    IndiceSimbolos,
+    RegraIndiceSimbolos,
+    construir_indice_simbolos,
+    indexar_projeto,
+)
+
+# Nomes carregados sob demanda (módulos com dependências mais pesadas ou executáveis com python -m)
+_IMPORTACOES_TARDIAS = {
+    'CacheAnalise': ('.cache', 'CacheAnalise'),
+    'ArmazemCorpus': ('.corpus', 'ArmazemCorpus'),
+    'montar_google_drive': ('.colab', 'montar_google_drive'),
+    'analisar_revisao': ('.incremental', 'analisar_revisao'),
+    'carregar_snapshot': ('.incremental', 'carregar_snapshot'),
+    'salvar_snapshot': ('.incremental', 'salvar_snapshot'),
+    'ServicoAnalise': ('.servico', 'ServicoAnalise'),
+    'DetectorDuplicacao': ('.duplicacao', 'DetectorDuplicacao'),
+    'hashes_estruturais': ('.duplicacao', 'hashes_estruturais'),
+    'IndiceMinHash': ('.similaridade', 'IndiceMinHash'),
+    'agrupar_projetos': ('.similaridade', 'agrupar_projetos'),
+}
+
+
+__all__ = [
+    'abrir_arquivo_aia', 'encontrar_arquivos_bky', 'extrair_arquivo_aia', 'ler_componentes_aia',
+    'ler_componentes_scm', 'ler_projetos_de_zip', 'ler_telas_aia', 'listar_membros_bky',
+    'listar_membros_scm', 'nome_da_tela',
+    'analisar_projeto_completo',
+    'ArvoreBlocos', 'NoBloco', 'construir_arvore_blocos', 'contar_blocos', 'filhos_do_bloco',
+    'metricas_do_bloco', 'parse_blockly_xml_to_ast',
+    'BLOCKLY_NS', 'BN', 'METRICAS_COMPLEXIDADE', 'TIPOS_DECISAO', 'TIPOS_PROCEDIMENTO',
+    'VERSAO_ANALISADOR', 'XHTML_NS', 'XN', 'OrigemAia',
+    'TIPOS_REFERENCIA_COMPONENTE', 'construir_indice_referencias', 'find_feature_envy',
+    'Instrumentacao', 'Sink', 'SinkCallback', 'SinkJSON', 'SinkPrometheus',
+    'EXECUTORES', 'analisar_tela', 'mapear_telas', 'resumir_projeto', 'resumir_tela',
+    'detalhar_procedimento', 'find_procedures_in_ast', 'find_procedures_streaming',
+    'iterar_procedimentos_xml', 'limite_superior_parametros', 'metricas_das_unidades',
+    'pode_ter_procedimentos', 'triar_tela',
+    'ContextoTela', 'MotorRegras', 'Regra', 'RegraFeatureEnvy', 'RegraListaParametrosLonga',
+    'criar_motor_padrao',
+    'gerar_relatorio_agrupamentos', 'gerar_relatorio_desempenho_regras',
+    'gerar_relatorio_diferenca', 'gerar_relatorio_duplicacao', 'gerar_relatorio_feature_envy',
+    'gerar_relatorio_smell',
+    'FORMATOS', 'EscritorCsv', 'EscritorJsonl', 'EscritorRegistros', 'EscritorSarif',
+    'EscritorTexto', 'criar_escritor', 'criar_registro',
+    'IndiceSimbolos', 'RegraIndiceSimbolos', 'construir_indice_simbolos', 'indexar_projeto',
+    # Carregados sob demanda (_IMPORTACOES_TARDIAS)
+    'CacheAnalise', 'ArmazemCorpus', 'montar_google_drive', 'analisar_revisao', 'carregar_snapshot',
+    'salvar_snapshot', 'ServicoAnalise', 'DetectorDuplicacao', 'hashes_estruturais', 'IndiceMinHash',
+    'agrupar_projetos',
+]
+
+
+def __getattr__(nome):
+    if nome in _IMPORTACOES_TARDIAS:
+        import importlib
+        modulo, atributo = _IMPORTACOES_TARDIAS[nome]
+        valor = getattr(importlib.import_module(modulo, __name__), atributo)
+        globals()[nome] = valor
+        return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
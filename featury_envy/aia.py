@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Leitura de projetos App Inventor (.aia)"""
+
+import io
+import json
+import logging
+import os
+import posixpath
+import zipfile
+from typing import Dict, List, Optional, Tuple, Union
+
+from .constantes import OrigemAia
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================
+# Funções de Manipulação de Arquivos .aia
+# =====================================
+def extrair_arquivo_aia(caminho_aia: str, caminho_extrair: str) -> bool:
+    """
+    Extrai o conteúdo de um arquivo .aia para um diretório, limpando-o previamente.
+    """
+    try:
+        if os.path.exists(caminho_extrair):
+            import shutil
+            shutil.rmtree(caminho_extrair)
+        os.makedirs(caminho_extrair)
+
+        print(f"\n[ETAPA 1/3] Extraindo o arquivo '{os.path.basename(caminho_aia)}'...")
+        with zipfile.ZipFile(caminho_aia, 'r') as arquivo_zip:
+            arquivo_zip.extractall(caminho_extrair)
+        print("✅ Extração concluída com sucesso!")
+        return True
+    except FileNotFoundError:
+        print(f"❌ Erro: Arquivo .aia não encontrado em {caminho_aia}")
+        return False
+    except zipfile.BadZipFile:
+        print(f"❌ Erro: Arquivo {caminho_aia} não é um arquivo zip válido ou está corrompido.")
+        return False
+    except Exception as e:
+        print(f"❌ Erro ao extrair arquivo .aia: {str(e)}")
+        return False
+
+def encontrar_arquivos_bky(caminho_extraido: str) -> List[str]:
+    """
+    Encontra todos os arquivos de blocos (.bky) dentro do diretório extraído.
+    """
+    print("\n[ETAPA 2/3] Procurando por arquivos de blocos (.bky)...")
+    arquivos_bky = []
+    src_path = os.path.join(caminho_extraido, "src")
+    if not os.path.exists(src_path):
+        print("⚠️  Diretório 'src' não encontrado no projeto.")
+        return []
+
+    for root, _, files in os.walk(src_path):
+        for file in files:
+            if file.endswith(".bky"):
+                arquivos_bky.append(os.path.join(root, file))
+
+    if arquivos_bky:
+        print(f"✅ Encontrados {len(arquivos_bky)} arquivos de tela.")
+    else:
+        print("⚠️ Nenhum arquivo .bky foi encontrado.")
+
+    return arquivos_bky
+
+
+# =====================================
+# Funções de Leitura de .aia em Memória
+# =====================================
+def abrir_arquivo_aia(origem: OrigemAia) -> Optional[zipfile.ZipFile]:
+    """
+    Abre um arquivo .aia sem extraí-lo. Aceita um caminho, bytes ou um objeto tipo arquivo.
+    Devolve None se o arquivo não puder ser aberto; o motivo vai para o logging (nada é impresso).
+    """
+    try:
+        if isinstance(origem, (bytes, bytearray, memoryview)):
+            origem = io.BytesIO(origem)
+        return zipfile.ZipFile(origem, 'r')
+    except FileNotFoundError:
+        logger.warning("Arquivo .aia não encontrado em %s", origem)
+        return None
+    except zipfile.BadZipFile:
+        logger.warning("O arquivo .aia não é um arquivo zip válido ou está corrompido: %s", origem)
+        return None
+    except Exception as e:
+        logger.warning("Erro ao abrir arquivo .aia %s: %s", origem, e)
+        return None
+
+def listar_membros_bky(arquivo_zip: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """
+    Lista os membros src/**/*.bky a partir do diretório central do zip, sem descompactar nada.
+    """
+    return [
+        info for info in arquivo_zip.infolist()
+        if not info.is_dir() and info.filename.startswith("src/") and info.filename.endswith(".bky")
+    ]
+
+def nome_da_tela(caminho_bky: str) -> str:
+    """
+    Deriva o nome da tela a partir do caminho de um arquivo .bky (no disco ou no zip).
+    """
+    return posixpath.basename(caminho_bky.replace(os.sep, "/")).replace('.bky', '').replace('.scm', '')
+
+def ler_telas_aia(origem: OrigemAia) -> Optional[List[Tuple[str, bytes]]]:
+    """
+    Lê o conteúdo de todas as telas (.bky) de um .aia diretamente do zip, sem tocar no disco.
+    Retorna uma lista de pares (nome_da_tela, bytes_xml) ou None se o arquivo não puder ser aberto.
+    """
+    arquivo_zip = abrir_arquivo_aia(origem)
+    if arquivo_zip is None:
+        return None
+
+    with arquivo_zip:
+        return [
+            (nome_da_tela(info.filename), arquivo_zip.read(info))
+            for info in listar_membros_bky(arquivo_zip)
+        ]
+
+
+def listar_membros_scm(arquivo_zip: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """
+    Lista os membros src/**/*.scm (definições de componentes de cada tela) do zip.
+    """
+    return [
+        info for info in arquivo_zip.infolist()
+        if not info.is_dir() and info.filename.startswith("src/") and info.filename.endswith(".scm")
+    ]
+
+def ler_componentes_scm(conteudo_scm: Union[str, bytes]) -> Dict[str, str]:
+    """
+    Lê a definição de componentes de uma tela (.scm) e devolve {nome_da_instância: tipo}.
+    A própria tela aparece como um componente do tipo 'Form'.
+    """
+    if isinstance(conteudo_scm, bytes):
+        conteudo_scm = conteudo_scm.decode('utf-8')
+    # Formato: #|\n$JSON\n{...}\n|#
+    inicio, fim = conteudo_scm.find('{'), conteudo_scm.rfind('}')
+    if inicio < 0 or fim < inicio:
+        return {}
+    try:
+        dados = json.loads(conteudo_scm[inicio:fim + 1])
+    except ValueError:
+        return {}
+
+    componentes = {}
+    pendentes = [dados.get('Properties', {})]
+    while pendentes:
+        componente = pendentes.pop()
+        if componente.get('$Name'):
+            componentes[componente['$Name']] = componente.get('$Type')
+        pendentes.extend(componente.get('$Components', []))
+    return componentes
+
+def ler_componentes_aia(origem: OrigemAia) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Lê os componentes de todas as telas de um .aia: {nome_da_tela: {instância: tipo}}.
+    """
+    arquivo_zip = abrir_arquivo_aia(origem)
+    if arquivo_zip is None:
+        return None
+
+    with arquivo_zip:
+        return {
+            nome_da_tela(info.filename): ler_componentes_scm(arquivo_zip.read(info))
+            for info in listar_membros_scm(arquivo_zip)
+        }
+
+def ler_projetos_de_zip(origem: OrigemAia) -> Optional[List[Tuple[str, bytes]]]:
+    """
+    Lê os projetos .aia contidos num zip (por exemplo, as submissões de uma turma) sem extraí-los.
+    Retorna uma lista de pares (nome_do_arquivo, bytes_do_aia) ou None se o zip não puder ser aberto.
+    """
+    arquivo_zip = abrir_arquivo_aia(origem)
+    if arquivo_zip is None:
+        return None
+
+    with arquivo_zip:
+        return [
+            (posixpath.basename(info.filename), arquivo_zip.read(info))
+            for info in arquivo_zip.infolist()
+            if not info.is_dir() and info.filename.endswith(".aia")
+            and not posixpath.basename(info.filename).startswith(".")
+        ]
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Orquestração da análise completa de um projeto .aia"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from .aia import abrir_arquivo_aia, ler_componentes_scm, listar_membros_bky, listar_membros_scm, nome_da_tela
+from .arvore import contar_blocos, parse_blockly_xml_to_ast
+from .constantes import OrigemAia
+from .instrumentacao import Instrumentacao
+from .paralelo import analisar_tela, mapear_telas, somar_estatisticas_regras
+from .procedimentos import find_procedures_streaming
+from .regras import RegraFeatureEnvy, RegraListaParametrosLonga, criar_motor_padrao
+from .relatorios import gerar_relatorio_desempenho_regras, gerar_relatorio_feature_envy, gerar_relatorio_smell
+
+
+# =====================================
+# Relatório de uma Tela
+# =====================================
+def _imprimir_cabecalho_tela(screen_name: str):
+    print("\n" + "#" * 70)
+    print(f"## Analisando a Tela: {screen_name}")
+    print("#" * 70)
+
+def _imprimir_relatorio_tela(todos_os_procedimentos: List[Dict], achados: Optional[Dict[str, List[Dict]]],
+                             param_threshold: int, razao_feature_envy: float, minimo_acessos: int):
+    print("\n\n---------- 3. Análise e Relatório Final ----------")
+    if not todos_os_procedimentos:
+        print("Nenhum procedimento definido foi encontrado nesta tela.")
+    elif achados is None:
+        gerar_relatorio_smell(todos_os_procedimentos, param_threshold)
+    else:
+        gerar_relatorio_smell(achados[RegraListaParametrosLonga.nome], param_threshold)
+
+    if achados is not None:
+        gerar_relatorio_feature_envy(achados[RegraFeatureEnvy.nome], razao_feature_envy, minimo_acessos)
+
+
+# =====================================
+# Função Principal de Análise
+# =====================================
+def analisar_projeto_completo(caminho_aia: OrigemAia, param_threshold: int, streaming: bool = False,
+                              razao_feature_envy: float = 2.0, minimo_acessos: int = 3,
+                              instrumentacao: Optional[Instrumentacao] = None,
+                              executor: Optional[str] = None, trabalhadores: Optional[int] = None):
+    """
+    Orquestra todo o processo de análise de um arquivo .aia.
+    O projeto é lido diretamente do zip, sem extração para o disco.
+    Com streaming=True, os procedimentos são detectados sem construir a AST
+    (e a verificação de Feature Envy, que precisa da árvore, é omitida).
+    Com executor='threads' ou 'processos', as telas são analisadas em paralelo
+    ('trabalhadores' limita o tamanho do pool) e os relatórios saem na ordem original das telas.
+    Cada etapa é medida pela 'instrumentacao'; os despejos do XML e da AST só
+    são impressos com Instrumentacao(depurar=True).
+    """
+    instrumentacao = instrumentacao or Instrumentacao()
+    nome_projeto = os.path.basename(caminho_aia) if isinstance(caminho_aia, (str, os.PathLike)) else "projeto em memória"
+
+    print(f"\n[ETAPA 1/3] Abrindo o arquivo '{nome_projeto}'...")
+    with instrumentacao.etapa('extrair', projeto=nome_projeto):
+        arquivo_zip = abrir_arquivo_aia(caminho_aia)
+    if arquivo_zip is None:
+        print(f"❌ Erro: O arquivo '{nome_projeto}' não foi encontrado ou não é um .aia válido.")
+        instrumentacao.finalizar()
+        return
+
+    with arquivo_zip:
+        print("\n[ETAPA 2/3] Procurando por arquivos de blocos (.bky)...")
+        with instrumentacao.etapa('descobrir', projeto=nome_projeto) as medidas:
+            membros_bky = listar_membros_bky(arquivo_zip)
+            componentes_por_tela = {
+                nome_da_tela(info.filename): ler_componentes_scm(arquivo_zip.read(info))
+                for info in listar_membros_scm(arquivo_zip)
+            }
+            medidas['telas'] = len(membros_bky)
+        if not membros_bky:
+            print("⚠️ Nenhum arquivo .bky foi encontrado.")
+            instrumentacao.finalizar()
+            return
+        print(f"✅ Encontrados {len(membros_bky)} arquivos de tela.")
+
+        print("\n[ETAPA 3/3] Analisando cada tela individualmente...")
+
+        if executor not in (None, 'sequencial'):
+            _analisar_telas_em_paralelo(arquivo_zip, membros_bky, componentes_por_tela, nome_projeto,
+                                        param_threshold, streaming, razao_feature_envy, minimo_acessos,
+                                        instrumentacao, executor, trabalhadores)
+            instrumentacao.finalizar()
+            print("\n\n================ ANÁLISE COMPLETA CONCLUÍDA ================")
+            return
+
+        motor = criar_motor_padrao(param_threshold, razao_feature_envy, minimo_acessos)
+        for info in membros_bky:
+            screen_name = nome_da_tela(info.filename)
+            _imprimir_cabecalho_tela(screen_name)
+
+            # --- Transformação 1: Ler o XML Bruto ---
+            try:
+                with instrumentacao.etapa('ler', projeto=nome_projeto, tela=screen_name) as medidas:
+                    xml_bytes = arquivo_zip.read(info)
+                    medidas['bytes'] = len(xml_bytes)
+            except Exception as e:
+                print(f"❌ Não foi possível ler a tela {screen_name}: {e}")
+                instrumentacao.contar('telas_com_erro', projeto=nome_projeto, tela=screen_name)
+                continue
+            instrumentacao.depuracao(
+                "1. XML Original (.bky)",
+                lambda: xml_bytes[:1000].decode('utf-8', 'replace') + ("..." if len(xml_bytes) > 1000 else "")
+            )
+
+            if streaming:
+                # --- Transformações 2 e 3 fundidas: detecção direta sobre o XML ---
+                with instrumentacao.etapa('detectar', projeto=nome_projeto, tela=screen_name) as medidas:
+                    contagens = {}
+                    todos_os_procedimentos = find_procedures_streaming(xml_bytes, contagens)
+                    medidas['procedimentos'] = len(todos_os_procedimentos)
+                    medidas['blocos'] = contagens.get('blocos', 0)
+                with instrumentacao.etapa('relatorio', projeto=nome_projeto, tela=screen_name):
+                    _imprimir_relatorio_tela(todos_os_procedimentos, None, param_threshold,
+                                             razao_feature_envy, minimo_acessos)
+                continue
+
+            # --- Transformação 2: Converter XML para a árvore de blocos ---
+            with instrumentacao.etapa('parse', projeto=nome_projeto, tela=screen_name) as medidas:
+                ast = parse_blockly_xml_to_ast(xml_bytes, compacta=True)
+                medidas['bytes'] = len(xml_bytes)
+                if ast:
+                    medidas['blocos'] = contar_blocos(ast)
+            if not ast:
+                print(f"⚠️ Não foi possível gerar a AST para a tela {screen_name}.")
+                instrumentacao.contar('telas_com_erro', projeto=nome_projeto, tela=screen_name)
+                continue
+            # Usamos json.dumps para imprimir o dicionário de forma legível (apenas em modo de depuração)
+            instrumentacao.depuracao("2. Estrutura de Dados (AST) Gerada", lambda: json.dumps(ast.para_dict(), indent=2))
+
+            # --- Transformação 3: Analisar a AST (todas as regras numa passagem) e Gerar Relatório ---
+            with instrumentacao.etapa('detectar', projeto=nome_projeto, tela=screen_name) as medidas:
+                achados = motor.analisar(ast, screen_name, componentes_por_tela.get(screen_name))
+                todos_os_procedimentos = motor.regra(RegraListaParametrosLonga.nome).procedimentos
+                medidas['procedimentos'] = len(todos_os_procedimentos)
+                medidas['achados'] = sum(len(a) for a in achados.values())
+
+            with instrumentacao.etapa('relatorio', projeto=nome_projeto, tela=screen_name):
+                _imprimir_relatorio_tela(todos_os_procedimentos, achados, param_threshold,
+                                         razao_feature_envy, minimo_acessos)
+
+    if not streaming:
+        gerar_relatorio_desempenho_regras(motor.estatisticas())
+    instrumentacao.finalizar()
+    print("\n\n================ ANÁLISE COMPLETA CONCLUÍDA ================")
+
+def _analisar_telas_em_paralelo(arquivo_zip, membros_bky, componentes_por_tela: Dict, nome_projeto: str,
+                                param_threshold: int, streaming: bool, razao_feature_envy: float,
+                                minimo_acessos: int, instrumentacao: Instrumentacao,
+                                executor: str, trabalhadores: Optional[int]):
+    """
+    Lê as telas no processo principal (o ZipFile não é partilhado com o pool), analisa-as no
+    executor escolhido e imprime os relatórios na ordem original das telas.
+    """
+    tarefas = []
+    for info in membros_bky:
+        screen_name = nome_da_tela(info.filename)
+        try:
+            with instrumentacao.etapa('ler', projeto=nome_projeto, tela=screen_name) as medidas:
+                xml_bytes = arquivo_zip.read(info)
+                medidas['bytes'] = len(xml_bytes)
+        except Exception as e:
+            print(f"❌ Não foi possível ler a tela {screen_name}: {e}")
+            instrumentacao.contar('telas_com_erro', projeto=nome_projeto, tela=screen_name)
+            continue
+        tarefas.append((screen_name, xml_bytes, componentes_por_tela.get(screen_name),
+                        param_threshold, razao_feature_envy, minimo_acessos, streaming))
+
+    resultados = mapear_telas(analisar_tela, tarefas, executor, trabalhadores)
+
+    for (screen_name, *_), resultado in zip(tarefas, resultados):
+        _imprimir_cabecalho_tela(screen_name)
+        if isinstance(resultado, Exception):
+            print(f"❌ Erro ao analisar a tela {screen_name}: {resultado}")
+            instrumentacao.contar('telas_com_erro', projeto=nome_projeto, tela=screen_name)
+            continue
+        for etapa, medidas in resultado['etapas'].items():
+            medidas = dict(medidas)
+            instrumentacao.registrar_etapa(etapa, medidas.pop('duracao_s'), medidas,
+                                           projeto=nome_projeto, tela=screen_name)
+        if resultado['erro']:
+            print(f"⚠️ Não foi possível gerar a AST para a tela {screen_name}.")
+            instrumentacao.contar('telas_com_erro', projeto=nome_projeto, tela=screen_name)
+            continue
+
+        with instrumentacao.etapa('relatorio', projeto=nome_projeto, tela=screen_name):
+            _imprimir_relatorio_tela(resultado['procedimentos'], resultado['achados'], param_threshold,
+                                     razao_feature_envy, minimo_acessos)
+
+    if not streaming:
+        gerar_relatorio_desempenho_regras(
+            somar_estatisticas_regras(r['estatisticas_regras'] for r in resultados if isinstance(r, dict))
+        )
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""Conversão do XML do Blockly para a árvore de blocos (AST)"""
+
+import logging
+import sys
+import xml.etree.ElementTree as ET
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .constantes import BN, TIPOS_DECISAO, XN
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================
+# Árvore de Blocos (XML -> AST)
+# =====================================
+def _intern(texto: Optional[str]) -> Optional[str]:
+    return sys.intern(texto) if texto is not None else None
+
+class NoBloco(Mapping):
+    """
+    Bloco do Blockly em representação compacta (__slots__, strings internadas).
+    Funciona como um dicionário somente leitura com as mesmas chaves da AST em dicionários
+    (type, id, mutation, fields, values, statements, next), para os chamadores existentes.
+    """
+    __slots__ = ('tipo', 'id_bloco', 'mutacao', 'campos', 'valores', 'declaracoes', 'proximo')
+
+    CHAVES = ('type', 'id', 'mutation', 'fields', 'values', 'statements', 'next')
+
+    def __init__(self, tipo, id_bloco, mutacao, campos):
+        self.tipo: Optional[str] = tipo
+        self.id_bloco: Optional[str] = id_bloco
+        self.mutacao: Optional[Dict] = mutacao
+        self.campos: Tuple[Tuple[Optional[str], Optional[str]], ...] = campos
+        self.valores: Tuple[Tuple[Optional[str], Optional['NoBloco']], ...] = ()
+        self.declaracoes: Tuple[Tuple[Optional[str], Optional['NoBloco']], ...] = ()
+        self.proximo: Optional['NoBloco'] = None
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave == 'type':
+            return self.tipo
+        if chave == 'id':
+            return self.id_bloco
+        if chave == 'mutation':
+            return self.mutacao if self.mutacao is not None else {}
+        if chave == 'fields':
+            return [{"name": nome, "text": texto} for nome, texto in self.campos]
+        if chave == 'values':
+            return [{"name": nome, "block": filho} for nome, filho in self.valores]
+        if chave == 'statements':
+            return [{"name": nome, "block": filho} for nome, filho in self.declaracoes]
+        if chave == 'next':
+            return self.proximo
+        raise KeyError(chave)
+
+    def __iter__(self):
+        return iter(self.CHAVES)
+
+    def __len__(self) -> int:
+        return len(self.CHAVES)
+
+    def __repr__(self) -> str:
+        return f"NoBloco(type={self.tipo!r}, id={self.id_bloco!r})"
+
+    def para_dict(self) -> Dict:
+        """
+        Converte o bloco (e toda a sua subárvore) para dicionários, sem recursão.
+        """
+        resultado: Dict = {}
+        pilha = [(self, resultado)]
+        while pilha:
+            no, destino = pilha.pop()
+            destino["type"] = no.tipo
+            destino["id"] = no.id_bloco
+            destino["mutation"] = {}
+            if no.mutacao is not None:
+                destino["mutation"] = dict(no.mutacao)
+                destino["mutation"]['args'] = list(no.mutacao['args'])
+            destino["fields"] = [{"name": nome, "text": texto} for nome, texto in no.campos]
+            for chave, entradas in (("values", no.valores), ("statements", no.declaracoes)):
+                destino[chave] = []
+                for nome, filho in entradas:
+                    entrada = {"name": nome, "block": None}
+                    if filho is not None:
+                        entrada["block"] = {}
+                        pilha.append((filho, entrada["block"]))
+                    destino[chave].append(entrada)
+            destino["next"] = None
+            if no.proximo is not None:
+                destino["next"] = {}
+                pilha.append((no.proximo, destino["next"]))
+        return resultado
+
+class ArvoreBlocos(Mapping):
+    """
+    Árvore compacta de uma tela. Expõe a chave 'blocks' como a AST em dicionários e a chave
+    'metrics' com as métricas de complexidade de cada bloco de topo (na mesma ordem).
+    """
+    __slots__ = ('blocos', 'metricas')
+
+    def __init__(self, blocos: List[NoBloco], metricas: Optional[List[Dict[str, int]]] = None):
+        self.blocos = blocos
+        self.metricas = metricas if metricas is not None else [metricas_do_bloco(b) for b in blocos]
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave == 'blocks':
+            return self.blocos
+        if chave == 'metrics':
+            return self.metricas
+        raise KeyError(chave)
+
+    def __iter__(self):
+        return iter(('blocks', 'metrics'))
+
+    def __len__(self) -> int:
+        return 2
+
+    def para_dict(self) -> Dict:
+        return {"blocks": [b.para_dict() for b in self.blocos], "metrics": [dict(m) for m in self.metricas]}
+
+def _criar_no_bloco(block_element) -> NoBloco:
+    # O App Inventor grava <mutation> no namespace XHTML; aceita também o do Blockly
+    mutation_element = block_element.find(f"{BN}mutation")
+    if mutation_element is None:
+        mutation_element = block_element.find(f"{XN}mutation")
+    mutacao = None
+    if mutation_element is not None:
+        mutacao = {_intern(k): _intern(v) for k, v in mutation_element.attrib.items()}
+        # Extrai os nomes dos parâmetros dos elementos <arg>
+        mutacao['args'] = [arg.get('name') for arg in mutation_element.findall(f'{XN}arg')]
+
+    campos = tuple((_intern(f.get("name")), f.text) for f in block_element.findall(f'{BN}field'))
+    return NoBloco(_intern(block_element.get("type")), block_element.get("id"), mutacao, campos)
+
+def construir_arvore_blocos(root) -> ArvoreBlocos:
+    """
+    Constrói a árvore compacta a partir do elemento raiz do XML usando uma pilha explícita,
+    de modo que cadeias 'next' longas não esbarram no limite de recursão do Python.
+    As métricas de complexidade de cada bloco de topo são acumuladas no mesmo percurso.
+    """
+    blocos = []
+    acumulados = []
+    pilha = []
+    for b in root.findall(f'{BN}block'):
+        no = _criar_no_bloco(b)
+        blocos.append(no)
+        # [blocos, profundidade máxima, decisões, "senão, se", maior cadeia 'next']
+        acumulado = [0, 0, 0, 0, 0]
+        acumulados.append(acumulado)
+        pilha.append((b, no, acumulado, 0, 1))
+
+    while pilha:
+        elemento, no, acumulado, profundidade, cadeia = pilha.pop()
+        acumulado[0] += 1
+        if profundidade > acumulado[1]:
+            acumulado[1] = profundidade
+        if cadeia > acumulado[4]:
+            acumulado[4] = cadeia
+        if no.tipo in TIPOS_DECISAO:
+            acumulado[2] += 1
+            acumulado[3] += _senao_se(no.mutacao)
+
+        for tag, atributo in ((f'{BN}value', 'valores'), (f'{BN}statement', 'declaracoes')):
+            entradas = []
+            for filho_xml in elemento.findall(tag):
+                bloco_xml = filho_xml.find(f'{BN}block')
+                filho = None
+                if bloco_xml is not None:
+                    filho = _criar_no_bloco(bloco_xml)
+                    pilha.append((bloco_xml, filho, acumulado, profundidade + 1, 1))
+                entradas.append((_intern(filho_xml.get("name")), filho))
+            setattr(no, atributo, tuple(entradas))
+
+        proximo_xml = elemento.find(f'{BN}next/{BN}block')
+        if proximo_xml is not None:
+            no.proximo = _criar_no_bloco(proximo_xml)
+            pilha.append((proximo_xml, no.proximo, acumulado, profundidade, cadeia + 1))
+
+    return ArvoreBlocos(blocos, [_metricas(*acumulado) for acumulado in acumulados])
+
+def parse_blockly_xml_to_ast(xml_string: Union[str, bytes], compacta: bool = False) -> Optional[Mapping]:
+    """
+    Converte uma string XML do Blockly para uma estrutura de dicionário Python (AST).
+    Esta é a etapa de transformação principal. Aceita texto ou os bytes lidos do .aia.
+    Com compacta=True devolve uma ArvoreBlocos (mesmas chaves, muito menos memória).
+    """
+    try:
+        root = ET.fromstring(xml_string)
+    except ET.ParseError as e:
+        logger.warning("Erro ao parsear XML: %s", e)
+        return None
+
+    arvore = construir_arvore_blocos(root)
+    return arvore if compacta else arvore.para_dict()
+
+def filhos_do_bloco(bloco: Mapping) -> List[Mapping]:
+    """
+    Blocos filhos diretos (values, statements e next), para a AST em dicionários ou compacta.
+    """
+    if isinstance(bloco, NoBloco):
+        filhos = [filho for _, filho in bloco.valores if filho is not None]
+        filhos.extend(filho for _, filho in bloco.declaracoes if filho is not None)
+        if bloco.proximo is not None:
+            filhos.append(bloco.proximo)
+        return filhos
+
+    filhos = [v['block'] for v in bloco.get('values', []) if v.get('block')]
+    filhos.extend(s['block'] for s in bloco.get('statements', []) if s.get('block'))
+    if bloco.get('next'):
+        filhos.append(bloco['next'])
+    return filhos
+
+# =====================================
+# Métricas de Complexidade por Bloco de Topo
+# =====================================
+def _metricas(blocos: int, profundidade: int, decisoes: int, senao_se: int, cadeia: int) -> Dict[str, int]:
+    return {
+        'block_count': blocos,
+        'max_depth': profundidade,
+        'decision_blocks': decisoes,
+        'cyclomatic_complexity': 1 + decisoes + senao_se,
+        'longest_next_chain': cadeia,
+    }
+
+def _senao_se(mutacao) -> int:
+    # 'mutacao' é o dicionário da AST ou o próprio elemento <mutation> (no streaming)
+    if mutacao is None:
+        return 0
+    try:
+        return int(mutacao.get('elseif', 0))
+    except (TypeError, ValueError):
+        return 0
+
+def metricas_do_bloco(topo: Mapping) -> Dict[str, int]:
+    """
+    Métricas de complexidade de um bloco de topo: número de blocos, profundidade máxima de
+    aninhamento (values/statements), blocos de decisão/repetição, complexidade ciclomática
+    e maior cadeia 'next'. As árvores do parse já trazem estas métricas em 'metrics';
+    esta função serve as ASTs montadas de outra forma.
+    """
+    blocos = profundidade_maxima = decisoes = senao_se = cadeia_maxima = 0
+    pilha = [(topo, 0, 1)]
+    while pilha:
+        bloco, profundidade, cadeia = pilha.pop()
+        blocos += 1
+        profundidade_maxima = max(profundidade_maxima, profundidade)
+        cadeia_maxima = max(cadeia_maxima, cadeia)
+        if bloco.get('type') in TIPOS_DECISAO:
+            decisoes += 1
+            senao_se += _senao_se(bloco.get('mutation'))
+        if isinstance(bloco, NoBloco):
+            encaixes = [filho for _, filho in bloco.valores + bloco.declaracoes if filho is not None]
+            proximo = bloco.proximo
+        else:
+            encaixes = [e['block'] for e in bloco.get('values', []) + bloco.get('statements', []) if e.get('block')]
+            proximo = bloco.get('next')
+        pilha.extend((filho, profundidade + 1, 1) for filho in encaixes)
+        if proximo:
+            pilha.append((proximo, profundidade, cadeia + 1))
+    return _metricas(blocos, profundidade_maxima, decisoes, senao_se, cadeia_maxima)
+
+def contar_blocos(ast: Mapping) -> int:
+    """
+    Número de blocos da tela, somado das métricas de cada bloco de topo (as do parse, se houver).
+    """
+    metricas = ast.get('metrics')
+    if metricas is None:
+        metricas = [metricas_do_bloco(topo) for topo in ast.get('blocks', []) if topo]
+    return sum(m['block_count'] for m in metricas if m)
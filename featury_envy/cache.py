@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Cache de análise endereçado por conteúdo
+
+Guarda no disco local o resultado dos detectores para cada tela (.bky), usando como chave o
+hash SHA-256 do conteúdo da tela mais a versão do analisador. Telas iguais (inclusive as copiadas
+de um modelo entre projetos diferentes) são analisadas uma única vez.
+
+As entradas são JSON comprimido com zlib e o diretório é limitado por tamanho total, com
+remoção LRU (a data de modificação do arquivo marca o último acesso). O tamanho e a ordem LRU
+usados na remoção vêm do próprio diretório, que pode ser partilhado por vários processos.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+
+from .constantes import VERSAO_ANALISADOR
+
+TAMANHO_MAXIMO_PADRAO = 256 * 1024 * 1024  # 256 MB
+EXTENSAO_ENTRADA = ".json.z"
+# O diretório é varrido de novo depois de gravar esta fração do limite (outros processos também gravam)
+FRACAO_REVARREDURA = 0.1
+# A remoção desce até esta fração do limite, para não varrer o diretório a cada gravação
+FRACAO_APOS_REMOCAO = 0.9
+
+
+def diretorio_cache_padrao() -> str:
+    """
+    Diretório padrão do cache: $FEATURY_ENVY_CACHE_DIR ou ~/.cache/featury_envy.
+    """
+    return os.environ.get(
+        "FEATURY_ENVY_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "featury_envy"),
+    )
+
+
+class CacheAnalise:
+    """
+    Cache persistente de resultados de detectores, com remoção LRU por tamanho total.
+    Seguro para várias threads; vários processos podem partilhar o mesmo diretório: as gravações
+    são atômicas e, antes de remover, o índice LRU é refeito a partir do diretório (tamanhos e
+    datas de modificação), por isso cada processo vê também as entradas gravadas pelos outros.
+    Com P processos, o diretório pode passar do limite em até P × FRACAO_REVARREDURA dele.
+    """
+
+    def __init__(self, diretorio: Optional[str] = None, tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO,
+                 versao: str = VERSAO_ANALISADOR):
+        self.diretorio = diretorio or diretorio_cache_padrao()
+        self.tamanho_maximo = tamanho_maximo
+        self.versao = versao
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self._lock = threading.Lock()
+        # chave -> tamanho em bytes, do menos para o mais recentemente usado
+        self._indice: "OrderedDict[str, int]" = OrderedDict()
+        self._tamanho_total = 0
+        # Bytes gravados por este processo desde a última varredura do diretório
+        self._gravados_desde_varredura = 0
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._carregar_indice()
+
+    # ---------- Índice e caminhos ----------
+    def _carregar_indice(self):
+        self._indice.clear()
+        self._tamanho_total = 0
+        self._gravados_desde_varredura = 0
+        entradas = []
+        for root, _, files in os.walk(self.diretorio):
+            for file in files:
+                if file.endswith(EXTENSAO_ENTRADA):
+                    try:
+                        stat = os.stat(os.path.join(root, file))
+                    except OSError:
+                        continue
+                    entradas.append((stat.st_mtime, file[:-len(EXTENSAO_ENTRADA)], stat.st_size))
+
+        for _, chave, tamanho in sorted(entradas):
+            self._indice[chave] = tamanho
+            self._tamanho_total += tamanho
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave[:2], chave + EXTENSAO_ENTRADA)
+
+    def chave(self, conteudo: Union[str, bytes], detector: str = "procedures") -> str:
+        """
+        Chave da entrada: SHA-256 do conteúdo da tela, do nome do detector e da versão do analisador.
+        """
+        if isinstance(conteudo, str):
+            conteudo = conteudo.encode("utf-8")
+        h = hashlib.sha256()
+        h.update(f"{self.versao}\0{detector}\0".encode("utf-8"))
+        h.update(conteudo)
+        return h.hexdigest()
+
+    # ---------- Leitura e gravação ----------
+    def obter(self, chave: str) -> Optional[Any]:
+        """
+        Devolve o valor guardado para a chave, ou None se não existir.
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "rb") as f:
+                valor = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+            os.utime(caminho)
+        except (OSError, ValueError, zlib.error):
+            with self._lock:
+                self.falhas += 1
+                self._descartar(chave)
+            return None
+
+        with self._lock:
+            self.acertos += 1
+            if chave in self._indice:
+                self._indice.move_to_end(chave)
+            else:
+                # Entrada gravada por outro processo
+                tamanho = os.path.getsize(caminho)
+                self._indice[chave] = tamanho
+                self._tamanho_total += tamanho
+        return valor
+
+    def guardar(self, chave: str, valor: Any):
+        """
+        Grava o valor de forma atômica e remove as entradas menos usadas se o limite for excedido.
+        """
+        dados = zlib.compress(json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+        except OSError:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            return
+
+        with self._lock:
+            self._tamanho_total -= self._indice.pop(chave, 0)
+            self._indice[chave] = len(dados)
+            self._tamanho_total += len(dados)
+            self._gravados_desde_varredura += len(dados)
+            if (self._tamanho_total > self.tamanho_maximo
+                    or self._gravados_desde_varredura > self.tamanho_maximo * FRACAO_REVARREDURA):
+                self._remover_excedente()
+
+    def obter_ou_calcular(self, conteudo: Union[str, bytes], calcular: Callable[[], Any],
+                          detector: str = "procedures") -> Any:
+        """
+        Consulta o cache para o conteúdo da tela; em caso de falha, executa calcular() e guarda
+        o resultado (valores None não são guardados).
+        """
+        chave = self.chave(conteudo, detector)
+        valor = self.obter(chave)
+        if valor is not None:
+            return valor
+        valor = calcular()
+        if valor is not None:
+            self.guardar(chave, valor)
+        return valor
+
+    # ---------- Remoção LRU ----------
+    def _descartar(self, chave: str):
+        self._tamanho_total -= self._indice.pop(chave, 0)
+
+    def _remover_excedente(self):
+        # O índice em memória só conhece as gravações deste processo: o tamanho real e a ordem LRU vêm do disco
+        self._carregar_indice()
+        if self._tamanho_total <= self.tamanho_maximo:
+            return
+        while self._tamanho_total > self.tamanho_maximo * FRACAO_APOS_REMOCAO and self._indice:
+            chave, tamanho = self._indice.popitem(last=False)
+            self._tamanho_total -= tamanho
+            try:
+                os.remove(self._caminho(chave))
+            except OSError:
+                pass
+            self.remocoes += 1
+
+    def limpar(self):
+        """
+        Remove todas as entradas do cache.
+        """
+        with self._lock:
+            self._carregar_indice()
+            for chave in list(self._indice):
+                try:
+                    os.remove(self._caminho(chave))
+                except OSError:
+                    pass
+            self._indice.clear()
+            self._tamanho_total = 0
+
+    def estatisticas(self) -> Dict[str, int]:
+        """
+        Contadores de acertos, falhas e remoções, mais o número e o tamanho total das entradas.
+        """
+        with self._lock:
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "entradas": len(self._indice),
+                "tamanho_bytes": self._tamanho_total,
+            }
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Integração com o Google Colab
+
+A montagem do Google Drive é feita apenas quando montar_google_drive() é chamada
+explicitamente, nunca ao importar o pacote.
+"""
+
+
+def montar_google_drive(ponto_de_montagem: str = '/content/drive') -> bool:
+    """
+    Monta o Google Drive quando executado no Google Colab. Devolve True se o Drive foi montado.
+    """
+    try:
+        from google.colab import drive
+        drive.mount(ponto_de_montagem)
+        print("✅ Google Drive montado com sucesso.")
+        return True
+    except ImportError:
+        print("Ambiente não é o Google Colab. A montagem do Drive foi ignorada.")
+    except Exception as e:
+        print(f"⚠️  Aviso ao montar o Drive: {e}")
+    return False
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Constantes partilhadas pelo analisador"""
+
+import os
+from typing import BinaryIO, Union
+
+# Versão do analisador: altere sempre que a saída dos detectores mudar (invalida o cache de análise)
+VERSAO_ANALISADOR = "5"
+
+# Origem de um projeto .aia: caminho no disco, bytes brutos ou objeto tipo arquivo
+OrigemAia = Union[str, "os.PathLike[str]", bytes, bytearray, BinaryIO]
+
+# Namespaces usados pelo App Inventor
+BLOCKLY_NS = "https://developers.google.com/blockly/xml"
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+
+# Notação de Clark para busca com namespaces
+BN = f"{{{BLOCKLY_NS}}}"
+XN = f"{{{XHTML_NS}}}"
+
+# Tipos de bloco que definem procedimentos
+TIPOS_PROCEDIMENTO = ('procedures_defnoreturn', 'procedures_defreturn')
+
+# Blocos de decisão e de repetição (cada um soma 1 à complexidade ciclomática, como cada "senão, se")
+TIPOS_DECISAO = ('controls_if', 'controls_choose', 'controls_forRange', 'controls_forEach',
+                 'controls_for_each_dict', 'controls_while')
+
+# Métricas de complexidade de cada bloco de topo (procedimento ou tratador de evento)
+METRICAS_COMPLEXIDADE = ('block_count', 'max_depth', 'decision_blocks', 'cyclomatic_complexity', 'longest_next_chain')
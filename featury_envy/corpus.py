@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""Armazém colunar dos resultados de um corpus de projetos
+
+Guarda uma linha por procedimento (coorte, projeto, tela, procedimento, número e nomes dos
+parâmetros e métricas de complexidade) em colunas binárias no disco, lidas com numpy.memmap. Os textos ficam numa tabela
+de strings à parte (uma string JSON por linha) e as colunas guardam apenas os índices inteiros.
+As consultas (contagens por limite, percentis e agregados por grupo, piores casos) são
+vetorizadas sobre as colunas, sem voltar a abrir nenhum .aia.
+
+Layout do diretório:
+    meta.json          formato, número de linhas confirmadas e tamanho da tabela de strings
+    strings.jsonl      tabela de strings (só cresce)
+    <coluna>.bin       uma coluna por arquivo (int32 para textos e métricas, int16 para parameter_count)
+
+Há um único escritor por vez (por exemplo, o processo principal do lote). Uma gravação
+interrompida não corrompe o armazém: as linhas e strings além das contadas em meta.json são ignoradas
+e sobrescritas na próxima gravação.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .constantes import METRICAS_COMPLEXIDADE
+
+FORMATO_CORPUS = 2
+COLUNAS_TEXTO = ('cohort', 'project', 'screen_name', 'procedure_name', 'parameters')
+COLUNA_CONTAGEM = 'parameter_count'
+COLUNAS_NUMERICAS = dict({COLUNA_CONTAGEM: np.int16}, **{m: np.int32 for m in METRICAS_COMPLEXIDADE})
+TIPOS_COLUNAS = dict({coluna: np.int32 for coluna in COLUNAS_TEXTO}, **COLUNAS_NUMERICAS)
+# Separador dos nomes de parâmetros dentro de uma única string da tabela
+SEPARADOR_PARAMETROS = '\x1f'
+
+
+class ArmazemCorpus:
+    """
+    Armazém colunar append-only de registros de procedimento (os mesmos campos do lote,
+    mais 'cohort'). As consultas aceitam filtros por igualdade, por exemplo cohort='turma-2024'.
+    """
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        meta = self._ler_meta()
+        self.linhas: int = meta['linhas']
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._bytes_strings: int = meta['bytes_strings']
+        self._carregar_strings(meta['strings'])
+        self._colunas: Dict[str, np.ndarray] = {}
+
+    # ---------- Metadados e tabela de strings ----------
+    def _caminho(self, nome: str) -> str:
+        return os.path.join(self.diretorio, nome)
+
+    def _ler_meta(self) -> Dict:
+        try:
+            with open(self._caminho('meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return {'formato': FORMATO_CORPUS, 'linhas': 0, 'strings': 0, 'bytes_strings': 0}
+        if meta.get('formato') != FORMATO_CORPUS:
+            raise ValueError(f"formato de corpus não suportado: {meta.get('formato')!r} "
+                             f"(recrie o armazém com a versão atual do lote)")
+        return meta
+
+    def _gravar_meta(self):
+        temporario = self._caminho(f'meta.json.{os.getpid()}.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'formato': FORMATO_CORPUS, 'linhas': self.linhas, 'strings': len(self.strings),
+                       'bytes_strings': self._bytes_strings}, f)
+        os.replace(temporario, self._caminho('meta.json'))
+
+    def _carregar_strings(self, quantidade: int):
+        try:
+            with open(self._caminho('strings.jsonl'), 'r', encoding='utf-8') as f:
+                for linha in f:
+                    if len(self.strings) == quantidade:
+                        break
+                    texto = json.loads(linha)
+                    self._ids[texto] = len(self.strings)
+                    self.strings.append(texto)
+        except FileNotFoundError:
+            pass
+
+    def _id_texto(self, texto: str, novas: List[str]) -> int:
+        identificador = self._ids.get(texto)
+        if identificador is None:
+            identificador = len(self.strings)
+            self.strings.append(texto)
+            self._ids[texto] = identificador
+            novas.append(texto)
+        return identificador
+
+    # ---------- Escrita ----------
+    def acrescentar(self, registros: Iterable[Dict], coorte: str = '') -> int:
+        """
+        Acrescenta registros de procedimento (project, screen_name, procedure_name,
+        parameter_count, parameters, as métricas de complexidade e, opcionalmente, cohort)
+        e devolve quantos foram gravados.
+        """
+        registros = list(registros)
+        if not registros:
+            return 0
+
+        novas: List[str] = []
+        quantidade_strings = len(self.strings)
+        colunas = {
+            coluna: np.fromiter(
+                (self._id_texto(self._texto(registro, coluna, coorte), novas) for registro in registros),
+                dtype=TIPOS_COLUNAS[coluna], count=len(registros),
+            )
+            for coluna in COLUNAS_TEXTO
+        }
+        for coluna, tipo in COLUNAS_NUMERICAS.items():
+            colunas[coluna] = np.fromiter((registro[coluna] for registro in registros), dtype=tipo,
+                                          count=len(registros))
+
+        dados_strings = ''.join(json.dumps(texto, ensure_ascii=False) + '\n' for texto in novas).encode('utf-8')
+        try:
+            self._truncar_e_acrescentar('strings.jsonl', dados_strings, self._bytes_strings)
+            for coluna, valores in colunas.items():
+                self._truncar_e_acrescentar(f'{coluna}.bin', valores.tobytes(),
+                                            self.linhas * np.dtype(TIPOS_COLUNAS[coluna]).itemsize)
+        except BaseException:
+            # Desfaz as strings novas em memória; o disco fica consistente com meta.json
+            for texto in novas:
+                del self._ids[texto]
+            del self.strings[quantidade_strings:]
+            raise
+
+        self.linhas += len(registros)
+        self._bytes_strings += len(dados_strings)
+        self._gravar_meta()
+        self._colunas.clear()
+        return len(registros)
+
+    @staticmethod
+    def _texto(registro: Dict, coluna: str, coorte: str) -> str:
+        if coluna == 'parameters':
+            return SEPARADOR_PARAMETROS.join(registro.get('parameters', []))
+        if coluna == 'cohort':
+            return registro.get('cohort', coorte)
+        return registro[coluna]
+
+    def _truncar_e_acrescentar(self, nome: str, dados: bytes, tamanho_confirmado: int):
+        # Descarta restos de uma gravação interrompida antes de acrescentar
+        caminho = self._caminho(nome)
+        with open(caminho, 'ab') as f:
+            if f.tell() != tamanho_confirmado:
+                f.truncate(tamanho_confirmado)
+            f.write(dados)
+
+    # ---------- Leitura ----------
+    def __len__(self) -> int:
+        return self.linhas
+
+    def coluna(self, nome: str) -> np.ndarray:
+        """
+        Coluna inteira como array (memória mapeada, só leitura).
+        """
+        if nome not in self._colunas:
+            tipo = TIPOS_COLUNAS[nome]
+            if self.linhas == 0:
+                self._colunas[nome] = np.empty(0, dtype=tipo)
+            else:
+                self._colunas[nome] = np.memmap(self._caminho(f'{nome}.bin'), dtype=tipo, mode='r',
+                                                shape=(self.linhas,))
+        return self._colunas[nome]
+
+    def _mascara(self, filtros: Dict[str, str]) -> Optional[np.ndarray]:
+        mascara = None
+        for coluna, valor in filtros.items():
+            if coluna not in COLUNAS_TEXTO:
+                raise ValueError(f"coluna de filtro desconhecida: {coluna!r}")
+            identificador = self._ids.get(valor, -1)
+            condicao = self.coluna(coluna) == identificador
+            mascara = condicao if mascara is None else mascara & condicao
+        return mascara
+
+    def _filtrar(self, filtros: Dict[str, str]) -> np.ndarray:
+        indices = np.arange(self.linhas)
+        mascara = self._mascara(filtros)
+        return indices if mascara is None else indices[mascara]
+
+    def registros(self, indices: Sequence[int]) -> List[Dict]:
+        """
+        Reconstrói os registros (dicionários) das linhas indicadas.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        colunas = {coluna: self.coluna(coluna)[indices] for coluna in COLUNAS_TEXTO}
+        numericas = {coluna: self.coluna(coluna)[indices].tolist() for coluna in COLUNAS_NUMERICAS}
+        resultado = []
+        for i in range(len(indices)):
+            registro = {coluna: self.strings[colunas[coluna][i]] for coluna in COLUNAS_TEXTO}
+            registro['parameters'] = registro['parameters'].split(SEPARADOR_PARAMETROS) if registro['parameters'] else []
+            registro.update({coluna: valores[i] for coluna, valores in numericas.items()})
+            resultado.append(registro)
+        return resultado
+
+    # ---------- Consultas vetorizadas ----------
+    def contar_acima(self, limite: int, por: Optional[str] = None, **filtros) -> object:
+        """
+        Procedimentos com mais de 'limite' parâmetros: um total ou, com 'por' (por exemplo
+        'project' ou 'cohort'), {grupo: quantidade} para todos os grupos presentes.
+        """
+        indices = self._filtrar(filtros)
+        sinalizados = self.coluna(COLUNA_CONTAGEM)[indices] > limite
+        if por is None:
+            return int(np.count_nonzero(sinalizados))
+        grupos = self.coluna(por)[indices]
+        contagens = np.bincount(grupos[sinalizados], minlength=len(self.strings))
+        return {self.strings[g]: int(contagens[g]) for g in np.unique(grupos)}
+
+    def sinalizados_por_limite(self, **filtros) -> Dict[int, int]:
+        """
+        {limite: procedimentos com mais parâmetros do que o limite}, de 1 até o maior número de
+        parâmetros, calculado de uma vez para todos os limites (total - acumulado até o limite).
+        """
+        contagens = self.coluna(COLUNA_CONTAGEM)[self._filtrar(filtros)].astype(np.int64)
+        maximo = max(int(contagens.max(initial=0)), 1)
+        acumulado = np.cumsum(np.bincount(contagens, minlength=maximo + 1))
+        limites = np.arange(1, maximo + 1)
+        return dict(zip(limites.tolist(), (len(contagens) - acumulado[limites]).tolist()))
+
+    def percentis(self, percentis: Sequence[float] = (50, 90, 99), por: Optional[str] = 'project',
+                  metrica: str = COLUNA_CONTAGEM, **filtros) -> Dict[str, Dict[str, float]]:
+        """
+        Percentis do número de parâmetros (ou de outra 'metrica') por grupo ('project', 'cohort', ...
+        ou None para o corpus inteiro): {grupo: {'procedimentos': n, 'p50': ..., 'p90': ..., 'maximo': ...}}.
+        Usa interpolação linear (o método padrão do numpy.percentile), com uma única ordenação.
+        """
+        indices = self._filtrar(filtros)
+        if len(indices) == 0:
+            return {}
+        contagens = self.coluna(metrica)[indices].astype(np.int64)
+        grupos = self.coluna(por)[indices].astype(np.int64) if por else np.zeros(len(indices), dtype=np.int64)
+
+        # Uma única ordenação por (grupo, contagem), combinados numa chave inteira
+        base = int(contagens.max()) + 1
+        chave = grupos * base + contagens
+        chave.sort()
+        grupos, contagens = np.divmod(chave, base)
+        contagens = contagens.astype(np.float64)
+        ids, inicios, tamanhos = np.unique(grupos, return_index=True, return_counts=True)
+
+        fracoes = np.asarray(percentis, dtype=np.float64) / 100
+        posicoes = inicios[:, None] + fracoes[None, :] * (tamanhos[:, None] - 1)
+        abaixo = np.floor(posicoes).astype(np.int64)
+        acima = np.ceil(posicoes).astype(np.int64)
+        valores = contagens[abaixo] + (contagens[acima] - contagens[abaixo]) * (posicoes - abaixo)
+        maximos = contagens[inicios + tamanhos - 1]
+
+        resultado = {}
+        for linha, identificador in enumerate(ids):
+            nome = self.strings[identificador] if por else 'corpus'
+            resumo = {'procedimentos': int(tamanhos[linha])}
+            resumo.update({f'p{p:g}': float(v) for p, v in zip(percentis, valores[linha])})
+            resumo['maximo'] = int(maximos[linha])
+            resultado[nome] = resumo
+        return resultado
+
+    def piores(self, n: int = 10, metrica: str = COLUNA_CONTAGEM, **filtros) -> List[Dict]:
+        """
+        Os 'n' procedimentos com mais parâmetros (ou maior 'metrica'), do maior para o menor
+        (empates pela ordem de gravação).
+        """
+        indices = self._filtrar(filtros)
+        if len(indices) == 0 or n <= 0:
+            return []
+        contagens = self.coluna(metrica)[indices]
+        if n < len(indices):
+            # O n-ésimo maior valor separa os escolhidos; entre os empatados nele, ficam os primeiros gravados
+            limiar = np.partition(contagens, len(contagens) - n)[len(contagens) - n]
+            acima = np.flatnonzero(contagens > limiar)
+            empatados = np.flatnonzero(contagens == limiar)[:n - len(acima)]
+            candidatos = np.concatenate((acima, empatados))
+        else:
+            candidatos = np.arange(len(indices))
+        candidatos = candidatos[np.lexsort((candidatos, -contagens[candidatos]))]
+        return self.registros(indices[candidatos])
+
+    def agregar(self, por: Optional[str] = 'project', metricas: Sequence[str] = METRICAS_COMPLEXIDADE,
+                **filtros) -> Dict[str, Dict[str, float]]:
+        """
+        Média e máximo de cada métrica por grupo (ou do corpus inteiro, com por=None):
+        {grupo: {'procedimentos': n, 'block_count_media': ..., 'block_count_maximo': ..., ...}}.
+        """
+        indices = self._filtrar(filtros)
+        if len(indices) == 0:
+            return {}
+        grupos = self.coluna(por)[indices] if por else np.zeros(len(indices), dtype=np.int32)
+        ids, inversos, tamanhos = np.unique(grupos, return_inverse=True, return_counts=True)
+
+        resultado: Dict[str, Dict[str, float]] = {
+            (self.strings[identificador] if por else 'corpus'): {'procedimentos': int(tamanho)}
+            for identificador, tamanho in zip(ids, tamanhos)
+        }
+        for metrica in metricas:
+            valores = self.coluna(metrica)[indices].astype(np.int64)
+            somas = np.bincount(inversos, weights=valores, minlength=len(ids))
+            maximos = np.zeros(len(ids), dtype=np.int64)
+            np.maximum.at(maximos, inversos, valores)
+            for resumo, soma, tamanho, maximo in zip(resultado.values(), somas, tamanhos, maximos):
+                resumo[f'{metrica}_media'] = float(soma / tamanho)
+                resumo[f'{metrica}_maximo'] = int(maximo)
+        return resultado
+
+    def para_dataframe(self, **filtros):
+        """
+        O armazém (ou a parte filtrada) como DataFrame do pandas, com as colunas de texto categóricas.
+        """
+        import pandas as pd
+
+        indices = self._filtrar(filtros)
+        categorias = pd.Index(self.strings)
+        dados = {
+            coluna: pd.Categorical.from_codes(self.coluna(coluna)[indices], categories=categorias)
+            for coluna in COLUNAS_TEXTO if coluna != 'parameters'
+        }
+        for coluna in COLUNAS_NUMERICAS:
+            dados[coluna] = np.asarray(self.coluna(coluna)[indices])
+        dados['parameters'] = [
+            self.strings[i].split(SEPARADOR_PARAMETROS) if self.strings[i] else []
+            for i in self.coluna('parameters')[indices]
+        ]
+        return pd.DataFrame(dados)
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Detecção de blocos duplicados (código copiado e colado) por hash estrutural
+
+Cada subárvore recebe um hash calculado de baixo para cima a partir do 'type', dos campos,
+da mutação, dos encaixes (values/statements) e do 'next' (isto é, o bloco e o resto da pilha
+que o segue). Subárvores com o mesmo hash caem no mesmo balde, de modo que os clones são
+encontrados em tempo linear no número de blocos, sem comparar árvores aos pares.
+O hash é um BLAKE2b estável entre processos, por isso o detector pode acumular as telas de
+vários projetos (corpus).
+
+Só são reportadas as classes maximais: uma ocorrência cujo bloco pai também está duplicado
+faz parte de um clone maior e não é listada de novo.
+
+Exemplo:
+    python -m featury_envy.duplicacao projeto.aia --minimo-blocos 6 --normalizar-variaveis
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .aia import ler_telas_aia
+from .arvore import NoBloco, parse_blockly_xml_to_ast
+from .constantes import TIPOS_PROCEDIMENTO, OrigemAia
+from .feature_envy import nome_da_unidade
+from .relatorios import gerar_relatorio_duplicacao
+
+ESCOPOS = ('tela', 'projeto', 'corpus')
+# Campos que guardam nomes de variáveis (VAR em get/set e for, VAR0.. em parâmetros e locais)
+_CAMPO_VARIAVEL = re.compile(r'VAR\d*$')
+_PREFIXO_GLOBAL = 'global '
+
+
+# =====================================
+# Hash Estrutural das Subárvores
+# =====================================
+def _entradas(bloco: Mapping) -> List[Tuple[str, Optional[Mapping]]]:
+    """
+    Encaixes do bloco, na ordem do XML: ('v:NOME', filho), ('s:NOME', filho) e ('n', próximo).
+    """
+    if isinstance(bloco, NoBloco):
+        entradas = [('v:' + (nome or ''), filho) for nome, filho in bloco.valores]
+        entradas.extend(('s:' + (nome or ''), filho) for nome, filho in bloco.declaracoes)
+        entradas.append(('n', bloco.proximo))
+        return entradas
+    entradas = [('v:' + (v.get('name') or ''), v.get('block')) for v in bloco.get('values', [])]
+    entradas.extend(('s:' + (s.get('name') or ''), s.get('block')) for s in bloco.get('statements', []))
+    entradas.append(('n', bloco.get('next')))
+    return entradas
+
+def _normalizar(nome: Optional[str]) -> str:
+    return _PREFIXO_GLOBAL + '?' if (nome or '').startswith(_PREFIXO_GLOBAL) else '?'
+
+def _assinatura_local(bloco: Mapping, normalizar_variaveis: bool) -> bytes:
+    """
+    Tipo, campos e mutação do próprio bloco (sem id nem posição), serializados sem ambiguidade.
+    """
+    if isinstance(bloco, NoBloco):
+        tipo, campos, mutacao = bloco.tipo or '', bloco.campos, bloco.mutacao or {}
+    else:
+        tipo = bloco.get('type') or ''
+        campos = [(f.get('name'), f.get('text')) for f in bloco.get('fields', [])]
+        mutacao = bloco.get('mutation', {})
+    partes = [tipo]
+    for nome, texto in campos:
+        nome, texto = nome or '', texto or ''
+        variavel = _CAMPO_VARIAVEL.match(nome) or (tipo == 'global_declaration' and nome == 'NAME')
+        if normalizar_variaveis and variavel:
+            texto = _normalizar(texto)
+        partes.append(f"{nome}={texto}")
+    for chave in sorted(k for k in mutacao if k != 'args'):
+        partes.append(f"@{chave}={mutacao[chave]}")
+    for argumento in mutacao.get('args', ()):
+        partes.append('@arg=' + ('?' if normalizar_variaveis else (argumento or '')))
+    return '\x1f'.join(partes).encode('utf-8')
+
+def hashes_estruturais(topo: Mapping, normalizar_variaveis: bool = False
+                       ) -> List[Tuple[Mapping, bytes, int, Optional[Mapping]]]:
+    """
+    (bloco, hash, número_de_blocos, bloco_pai) de cada subárvore de 'topo', em pós-ordem.
+    O percurso usa uma pilha explícita; cada bloco é serializado uma única vez.
+    """
+    resultado = []
+    calculados: Dict[int, Tuple[bytes, int]] = {}
+    pilha: List[Tuple[Mapping, Optional[Mapping], Optional[list]]] = [(topo, None, None)]
+    while pilha:
+        bloco, pai, entradas = pilha.pop()
+        if entradas is None:
+            entradas = _entradas(bloco)
+            pilha.append((bloco, pai, entradas))
+            pilha.extend((filho, bloco, None) for _, filho in entradas if filho is not None)
+            continue
+
+        h = hashlib.blake2b(_assinatura_local(bloco, normalizar_variaveis), digest_size=16)
+        tamanho = 1
+        for rotulo, filho in entradas:
+            h.update(b'\x1e' + rotulo.encode('utf-8') + b'\x1d')
+            if filho is not None:
+                digest_filho, tamanho_filho = calculados[id(filho)]
+                h.update(digest_filho)
+                tamanho += tamanho_filho
+        digest = h.digest()
+        calculados[id(bloco)] = (digest, tamanho)
+        resultado.append((bloco, digest, tamanho, pai))
+    return resultado
+
+def _nome_da_unidade(topo: Mapping) -> str:
+    tipo = topo.get('type')
+    if tipo in TIPOS_PROCEDIMENTO or tipo == 'component_event':
+        return nome_da_unidade(topo)[1]
+    if tipo == 'global_declaration':
+        for field in topo.get('fields', []):
+            if field.get('name') == 'NAME':
+                return _PREFIXO_GLOBAL + (field.get('text') or '')
+    return tipo or ''
+
+
+# =====================================
+# Detector de Duplicação
+# =====================================
+class DetectorDuplicacao:
+    """
+    Acumula os hashes das subárvores com pelo menos 'minimo_blocos' blocos, tela a tela,
+    e agrupa-os em classes de clones. Acrescente as telas de um projeto para encontrar clones
+    na mesma tela e entre telas, ou de vários projetos para procurar no corpus.
+    """
+
+    def __init__(self, minimo_blocos: int = 5, normalizar_variaveis: bool = False):
+        self.minimo_blocos = minimo_blocos
+        self.normalizar_variaveis = normalizar_variaveis
+        # hash -> ocorrências (projeto, tela, unidade, id do bloco, tipo, hash do bloco pai)
+        self._baldes: Dict[bytes, List[Tuple[str, str, str, Optional[str], str, Optional[bytes]]]] = {}
+        self._tamanhos: Dict[bytes, int] = {}
+        self.blocos_analisados = 0
+
+    def acrescentar_tela(self, ast: Mapping, nome_tela: str, projeto: str = ''):
+        """
+        Calcula os hashes de todas as subárvores da tela e guarda as que atingem o tamanho mínimo.
+        """
+        for topo in (ast.get('blocks', []) if ast else []):
+            if not topo:
+                continue
+            unidade = _nome_da_unidade(topo)
+            hashes = hashes_estruturais(topo, self.normalizar_variaveis)
+            self.blocos_analisados += len(hashes)
+            digest_por_bloco = {id(bloco): digest for bloco, digest, _, _ in hashes}
+            for bloco, digest, tamanho, pai in hashes:
+                if tamanho < self.minimo_blocos:
+                    continue
+                self._tamanhos[digest] = tamanho
+                self._baldes.setdefault(digest, []).append((
+                    projeto, nome_tela, unidade, bloco.get('id'), bloco.get('type') or '',
+                    digest_por_bloco[id(pai)] if pai is not None else None,
+                ))
+
+    def acrescentar_projeto(self, origem: OrigemAia, projeto: Optional[str] = None) -> bool:
+        """
+        Acrescenta todas as telas de um .aia. Devolve False se o zip for inválido.
+        """
+        telas = ler_telas_aia(origem)
+        if telas is None:
+            return False
+        if projeto is None:
+            projeto = os.path.basename(origem) if isinstance(origem, (str, os.PathLike)) else ''
+        for nome_tela, xml_bytes in telas:
+            ast = parse_blockly_xml_to_ast(xml_bytes, compacta=True)
+            if ast:
+                self.acrescentar_tela(ast, nome_tela, projeto)
+        return True
+
+    def clones(self, escopos: Iterable[str] = ESCOPOS) -> List[Dict]:
+        """
+        Classes de clones maximais, das que duplicam mais blocos para as que duplicam menos.
+        O escopo de uma classe é 'tela' (todas as ocorrências na mesma tela), 'projeto' ou 'corpus'.
+        """
+        escopos = set(escopos)
+        duplicados = {digest for digest, ocorrencias in self._baldes.items() if len(ocorrencias) > 1}
+        classes = []
+        for digest in duplicados:
+            ocorrencias = self._baldes[digest]
+            # Se o pai de todas as ocorrências também está duplicado, a classe está contida num clone maior
+            if all(pai in duplicados for *_, pai in ocorrencias):
+                continue
+            telas = {(projeto, tela) for projeto, tela, *_ in ocorrencias}
+            if len(telas) == 1:
+                escopo = 'tela'
+            elif len({projeto for projeto, _ in telas}) == 1:
+                escopo = 'projeto'
+            else:
+                escopo = 'corpus'
+            if escopo not in escopos:
+                continue
+            classes.append({
+                'hash': digest.hex(),
+                'size': self._tamanhos[digest],
+                'type': ocorrencias[0][4],
+                'scope': escopo,
+                'occurrences': [
+                    {'project': projeto, 'screen_name': tela, 'unit': unidade, 'block_id': id_bloco}
+                    for projeto, tela, unidade, id_bloco, _, _ in ocorrencias
+                ],
+            })
+        classes.sort(key=lambda c: (-c['size'] * (len(c['occurrences']) - 1), -c['size'], c['hash']))
+        return classes
+
+
+# =====================================
+# PONTO DE ENTRADA / EXECUÇÃO
+# =====================================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Procura pilhas de blocos duplicadas em projetos .aia.")
+    parser.add_argument('aia', nargs='+', help="Projetos .aia (vários para procurar clones entre projetos)")
+    parser.add_argument('-m', '--minimo-blocos', type=int, default=5,
+                        help="Tamanho mínimo, em blocos, de um clone (padrão: 5)")
+    parser.add_argument('--normalizar-variaveis', action='store_true',
+                        help="Ignora os nomes das variáveis e parâmetros ao comparar os blocos")
+    parser.add_argument('--escopo', choices=ESCOPOS, action='append',
+                        help="Só lista clones deste escopo (pode repetir; padrão: todos)")
+    parser.add_argument('--json', action='store_true', help="Imprime as classes em JSON")
+    args = parser.parse_args(argv)
+
+    detector = DetectorDuplicacao(args.minimo_blocos, args.normalizar_variaveis)
+    for caminho in args.aia:
+        if not detector.acrescentar_projeto(caminho):
+            return 1
+    classes = detector.clones(args.escopo or ESCOPOS)
+    if args.json:
+        json.dump(classes, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        gerar_relatorio_duplicacao(classes, args.minimo_blocos)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Detecção de Feature Envy sobre um índice de referências a componentes"""
+
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
+
+
+# =====================================
+# Detecção de Feature Envy (índice de referências a componentes)
+# =====================================
+# Blocos que acessam propriedades, métodos e eventos de um componente
+TIPOS_REFERENCIA_COMPONENTE = ('component_set_get', 'component_method', 'component_event', 'component_component_block')
+
+def componente_referenciado(bloco: Mapping) -> Optional[str]:
+    """
+    Nome da instância referenciada por um bloco de componente (mutation instance_name ou campo COMPONENT_SELECTOR).
+    """
+    instancia = bloco.get('mutation', {}).get('instance_name')
+    if instancia:
+        return instancia
+    for field in bloco.get('fields', []):
+        if field.get('name') == 'COMPONENT_SELECTOR':
+            return field.get('text')
+    return None
+
+def nome_da_unidade(bloco: Mapping) -> Tuple[str, str, Optional[str]]:
+    """
+    Devolve (tipo_da_unidade, nome, componente_dono) de uma definição de procedimento ou de um tratador de evento.
+    """
+    if bloco.get('type') == 'component_event':
+        instancia = componente_referenciado(bloco)
+        evento = bloco.get('mutation', {}).get('event_name', 'Evento')
+        return 'event', f"{instancia or 'any'}.{evento}", instancia
+
+    proc_name = 'ProcedimentoSemNome'
+    for field in bloco.get('fields', []):
+        if field.get('name') == 'NAME':
+            proc_name = field.get('text')
+    return 'procedure', proc_name, None
+
+def construir_indice_referencias(ast: Mapping, componentes: Optional[Dict[str, str]] = None,
+                                 nome_tela: Optional[str] = None) -> List[Dict]:
+    """
+    Percorre a árvore de blocos UMA vez e registra, para cada procedimento e tratador de evento,
+    quantas vezes cada componente é referenciado no seu corpo.
+    Se 'componentes' (do .scm) for informado, referências a instâncias desconhecidas são ignoradas.
+    O dono de um procedimento é a própria tela; o de um tratador de evento é o componente do evento.
+    É o índice montado pela RegraFeatureEnvy, aqui num motor só com ela.
+    """
+    from .regras import MotorRegras, RegraFeatureEnvy
+
+    regra = RegraFeatureEnvy()
+    MotorRegras([regra]).analisar(ast, nome_tela, componentes)
+    return regra.indice
+
+def acessos_proprios(unidade: Mapping) -> int:
+    """
+    Acessos de uma unidade ao que lhe pertence: o seu componente (o do evento, ou a tela no caso
+    de um procedimento) e a própria tela, isto é, os componentes do tipo 'Form'.
+    """
+    dono = unidade['own_component']
+    tipos = unidade['component_types']
+    return sum(acessos for nome, acessos in unidade['references'].items()
+               if nome == dono or tipos.get(nome) == 'Form')
+
+def find_feature_envy(indice: List[Dict], razao: float = 2.0, minimo_acessos: int = 3) -> List[Dict]:
+    """
+    Sinaliza as unidades cujo componente estrangeiro mais acessado é usado pelo menos 'minimo_acessos'
+    vezes e mais do que 'razao' vezes os acessos próprios (ao seu componente e à tela).
+    Uma unidade sem nenhum acesso próprio não tem termo de comparação e não é sinalizada.
+    Custo linear no tamanho do índice.
+    """
+    casos = []
+    for unidade in indice:
+        referencias = unidade['references']
+        dono = unidade['own_component']
+        tipos = unidade['component_types']
+        proprios = acessos_proprios(unidade)
+        if not proprios:
+            continue
+
+        estrangeiros = [(n, c) for n, c in referencias.items() if n != dono and tipos.get(n) != 'Form']
+        if not estrangeiros:
+            continue
+        invejado, acessos_invejado = max(estrangeiros, key=lambda item: item[1])
+
+        if acessos_invejado >= minimo_acessos and acessos_invejado > razao * proprios:
+            casos.append({
+                "kind": unidade['kind'],
+                "name": unidade['name'],
+                "own_component": dono,
+                "own_accesses": proprios,
+                "envied_component": invejado,
+                "envied_component_type": tipos.get(invejado),
+                "envied_accesses": acessos_invejado,
+            })
+    return casos
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""Reanálise incremental de uma nova revisão de um projeto .aia
+
+Compara o CRC32 e o tamanho de cada membro src/**/*.bky e src/**/*.scm, lidos do diretório
+central do zip (sem descompactar nada), com os de um snapshot da análise anterior.
+Só as telas novas ou alteradas são lidas e analisadas; as restantes reaproveitam os achados
+guardados no snapshot. O resultado inclui a diferença de achados por procedimento/evento:
+novos, corrigidos e inalterados.
+
+Exemplo:
+    python -m featury_envy.incremental projeto_v2.aia --snapshot analise_aluno.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import zipfile
+from typing import Dict, List, Optional
+
+from .aia import abrir_arquivo_aia, ler_componentes_scm, listar_membros_bky, listar_membros_scm, nome_da_tela
+from .arvore import parse_blockly_xml_to_ast
+from .constantes import VERSAO_ANALISADOR, OrigemAia
+from .regras import MotorRegras, RegraListaParametrosLonga, criar_motor_padrao
+from .relatorios import gerar_relatorio_diferenca
+
+FORMATO_SNAPSHOT = 1
+STATUS_DIFERENCA = ('new', 'fixed', 'unchanged')
+
+
+# =====================================
+# Assinaturas dos Membros do Zip
+# =====================================
+def assinaturas_telas(arquivo_zip: zipfile.ZipFile) -> Dict[str, Dict[str, List[int]]]:
+    """
+    Assinatura de cada tela a partir do diretório central: {tela: {'bky': [crc, tamanho], 'scm': [...]}}.
+    O .scm entra na assinatura porque os componentes da tela mudam o resultado do Feature Envy.
+    """
+    assinaturas: Dict[str, Dict[str, List[int]]] = {}
+    for extensao, membros in (('bky', listar_membros_bky(arquivo_zip)), ('scm', listar_membros_scm(arquivo_zip))):
+        for info in membros:
+            assinaturas.setdefault(nome_da_tela(info.filename), {})[extensao] = [info.CRC, info.file_size]
+    return assinaturas
+
+
+# =====================================
+# Análise de uma Tela
+# =====================================
+def _analisar_tela(motor: MotorRegras, arquivo_zip: zipfile.ZipFile, info_bky: zipfile.ZipInfo,
+                   info_scm: Optional[zipfile.ZipInfo]) -> Dict:
+    nome_tela = nome_da_tela(info_bky.filename)
+    componentes = ler_componentes_scm(arquivo_zip.read(info_scm)) if info_scm is not None else None
+    ast = parse_blockly_xml_to_ast(arquivo_zip.read(info_bky), compacta=True)
+    if not ast:
+        return {'procedimentos': [], 'achados': {}, 'erro': "XML inválido"}
+
+    achados = motor.analisar(ast, nome_tela, componentes)
+    return {
+        'procedimentos': list(motor.regra(RegraListaParametrosLonga.nome).procedimentos),
+        'achados': achados,
+    }
+
+def _parametros_snapshot(param_threshold: int, razao_feature_envy: float, minimo_acessos: int) -> Dict:
+    return {
+        'param_threshold': param_threshold,
+        'razao_feature_envy': razao_feature_envy,
+        'minimo_acessos': minimo_acessos,
+    }
+
+def _snapshot_reaproveitavel(anterior: Optional[Dict], parametros: Dict) -> bool:
+    """
+    Um snapshot só pode ser reaproveitado se foi gerado pelo mesmo formato, pela mesma versão
+    do analisador e com os mesmos limites das regras.
+    """
+    return bool(anterior) and (
+        anterior.get('formato') == FORMATO_SNAPSHOT
+        and anterior.get('versao') == VERSAO_ANALISADOR
+        and anterior.get('parametros') == parametros
+    )
+
+
+# =====================================
+# Diferença de Achados
+# =====================================
+def _identidade_achado(achado: Dict) -> str:
+    # Long Parameter List identifica por 'procedure_name'; Feature Envy por 'name' (procedimento ou evento)
+    return achado.get('procedure_name', achado.get('name'))
+
+def diferenca_achados(telas_anteriores: Dict[str, Dict], telas_atuais: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+    """
+    Compara os achados de duas análises por (tela, regra, procedimento/evento) e devolve
+    {'new': [...], 'fixed': [...], 'unchanged': [...]}, cada item com screen, rule, name e finding.
+    """
+    def indexar(telas: Dict[str, Dict]) -> Dict:
+        indice = {}
+        for tela, resultado in telas.items():
+            for regra, achados in resultado.get('achados', {}).items():
+                for achado in achados:
+                    indice[(tela, regra, _identidade_achado(achado))] = achado
+        return indice
+
+    antes, depois = indexar(telas_anteriores), indexar(telas_atuais)
+    diferenca: Dict[str, List[Dict]] = {status: [] for status in STATUS_DIFERENCA}
+    for chave in sorted(set(antes) | set(depois), key=lambda c: tuple(str(p) for p in c)):
+        tela, regra, nome = chave
+        if chave not in antes:
+            status, achado = 'new', depois[chave]
+        elif chave not in depois:
+            status, achado = 'fixed', antes[chave]
+        else:
+            status, achado = 'unchanged', depois[chave]
+        diferenca[status].append({'screen': tela, 'rule': regra, 'name': nome, 'finding': achado})
+    return diferenca
+
+
+# =====================================
+# Reanálise Incremental
+# =====================================
+def analisar_revisao(origem: OrigemAia, anterior: Optional[Dict] = None, param_threshold: int = 3,
+                     razao_feature_envy: float = 2.0, minimo_acessos: int = 3) -> Optional[Dict]:
+    """
+    Analisa uma revisão de um projeto reaproveitando as telas cuja assinatura (CRC32 e tamanho
+    do .bky e do .scm) não mudou desde o snapshot 'anterior'.
+    Devolve {'snapshot', 'diferenca', 'reanalisadas', 'reaproveitadas', 'removidas'}
+    ou None se o arquivo não puder ser aberto. Sem snapshot (ou com um snapshot incompatível),
+    todas as telas são analisadas.
+    """
+    parametros = _parametros_snapshot(param_threshold, razao_feature_envy, minimo_acessos)
+    telas_anteriores = anterior.get('telas', {}) if _snapshot_reaproveitavel(anterior, parametros) else {}
+
+    arquivo_zip = abrir_arquivo_aia(origem)
+    if arquivo_zip is None:
+        return None
+
+    motor = criar_motor_padrao(param_threshold, razao_feature_envy, minimo_acessos)
+    telas: Dict[str, Dict] = {}
+    reanalisadas: List[str] = []
+    reaproveitadas: List[str] = []
+    with arquivo_zip:
+        assinaturas = assinaturas_telas(arquivo_zip)
+        membros_scm = {nome_da_tela(info.filename): info for info in listar_membros_scm(arquivo_zip)}
+        for info in listar_membros_bky(arquivo_zip):
+            nome_tela = nome_da_tela(info.filename)
+            assinatura = assinaturas[nome_tela]
+            guardada = telas_anteriores.get(nome_tela)
+            if guardada is not None and guardada.get('assinatura') == assinatura:
+                telas[nome_tela] = guardada
+                reaproveitadas.append(nome_tela)
+                continue
+
+            resultado = _analisar_tela(motor, arquivo_zip, info, membros_scm.get(nome_tela))
+            resultado['assinatura'] = assinatura
+            telas[nome_tela] = resultado
+            reanalisadas.append(nome_tela)
+
+    snapshot = {
+        'formato': FORMATO_SNAPSHOT,
+        'versao': VERSAO_ANALISADOR,
+        'parametros': parametros,
+        'telas': telas,
+    }
+    return {
+        'snapshot': snapshot,
+        'diferenca': diferenca_achados(anterior.get('telas', {}) if anterior else {}, telas),
+        'reanalisadas': reanalisadas,
+        'reaproveitadas': reaproveitadas,
+        'removidas': sorted(set(anterior.get('telas', {}) if anterior else {}) - set(telas)),
+    }
+
+
+# =====================================
+# Persistência do Snapshot
+# =====================================
+def carregar_snapshot(caminho: str) -> Optional[Dict]:
+    """
+    Lê um snapshot gravado por salvar_snapshot; devolve None se o arquivo não existir ou for inválido.
+    """
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def salvar_snapshot(snapshot: Dict, caminho: str):
+    """
+    Grava o snapshot em JSON de forma atômica (arquivo temporário + rename).
+    """
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+# =====================================
+# PONTO DE ENTRADA / EXECUÇÃO
+# =====================================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Reanalisa uma nova revisão de um projeto .aia, só para as telas alteradas."
+    )
+    parser.add_argument('aia', help="Nova revisão do projeto (.aia)")
+    parser.add_argument('-s', '--snapshot', required=True,
+                        help="Snapshot JSON da análise anterior (criado se não existir e atualizado no fim)")
+    parser.add_argument('-l', '--limite', type=int, default=3,
+                        help="Um procedimento é 'longo' se tiver MAIS do que este número de parâmetros (padrão: 3)")
+    parser.add_argument('--razao-feature-envy', type=float, default=2.0)
+    parser.add_argument('--minimo-acessos', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    resultado = analisar_revisao(args.aia, carregar_snapshot(args.snapshot), args.limite,
+                                 args.razao_feature_envy, args.minimo_acessos)
+    if resultado is None:
+        return 1
+
+    print(f"Telas reanalisadas: {len(resultado['reanalisadas'])} | "
+          f"reaproveitadas: {len(resultado['reaproveitadas'])} | removidas: {len(resultado['removidas'])}")
+    gerar_relatorio_diferenca(resultado['diferenca'])
+    salvar_snapshot(resultado['snapshot'], args.snapshot)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Instrumentação por etapa da análise
+
+Mede o tempo e os contadores de cada etapa (extrair, descobrir, ler, parse, detectar, relatorio)
+e envia os eventos para destinos plugáveis: uma função de callback, um arquivo JSON de métricas
+ou um arquivo de texto no formato do Prometheus.
+
+Os despejos de depuração (XML bruto, AST em JSON) só são gerados quando 'depurar' está ativo,
+de modo que uma execução normal não paga o custo de serializá-los.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+# Etapas instrumentadas, na ordem do pipeline
+ETAPAS = ('extrair', 'descobrir', 'ler', 'parse', 'detectar', 'relatorio')
+
+
+# =====================================
+# Destinos (sinks) de Métricas
+# =====================================
+class Sink:
+    """
+    Destino de eventos de instrumentação. 'registrar' é chamado para cada evento
+    e 'finalizar' uma vez, no fim da análise.
+    """
+
+    def registrar(self, evento: Dict[str, Any]):
+        pass
+
+    def finalizar(self):
+        pass
+
+class SinkCallback(Sink):
+    """
+    Repassa cada evento para uma função.
+    """
+
+    def __init__(self, funcao: Callable[[Dict[str, Any]], None]):
+        self.funcao = funcao
+
+    def registrar(self, evento: Dict[str, Any]):
+        self.funcao(evento)
+
+class _SinkAgregado(Sink):
+    """
+    Base dos sinks que agregam duração, execuções e medidas por etapa.
+    """
+
+    def __init__(self):
+        self.eventos: List[Dict[str, Any]] = []
+        self.agregado: Dict[str, Dict[str, float]] = {}
+        self.contadores: Dict[str, float] = {}
+
+    def registrar(self, evento: Dict[str, Any]):
+        self.eventos.append(evento)
+        if evento['tipo'] == 'contador':
+            self.contadores[evento['nome']] = self.contadores.get(evento['nome'], 0) + evento['medidas']['valor']
+            return
+        total = self.agregado.setdefault(evento['etapa'], {'execucoes': 0, 'duracao_s': 0.0})
+        total['execucoes'] += 1
+        total['duracao_s'] += evento['duracao_s']
+        for medida, valor in evento['medidas'].items():
+            total[medida] = total.get(medida, 0) + valor
+
+class SinkJSON(_SinkAgregado):
+    """
+    Grava todos os eventos e o resumo por etapa num arquivo JSON ao finalizar.
+    """
+
+    def __init__(self, caminho: str):
+        super().__init__()
+        self.caminho = caminho
+
+    def finalizar(self):
+        with open(self.caminho, 'w', encoding='utf-8') as f:
+            json.dump({'resumo': self.agregado, 'contadores': self.contadores, 'eventos': self.eventos},
+                      f, indent=2, ensure_ascii=False)
+
+class SinkPrometheus(_SinkAgregado):
+    """
+    Grava as métricas agregadas no formato de texto do Prometheus (para o textfile collector).
+    """
+
+    PREFIXO = 'featury_envy'
+
+    def __init__(self, caminho: str):
+        super().__init__()
+        self.caminho = caminho
+
+    def finalizar(self):
+        linhas = [
+            f'# HELP {self.PREFIXO}_etapa_segundos_total Tempo acumulado por etapa da análise.',
+            f'# TYPE {self.PREFIXO}_etapa_segundos_total counter',
+        ]
+        for etapa, total in self.agregado.items():
+            linhas.append(f'{self.PREFIXO}_etapa_segundos_total{{etapa="{etapa}"}} {total["duracao_s"]:.6f}')
+        linhas += [
+            f'# HELP {self.PREFIXO}_etapa_execucoes_total Número de execuções por etapa da análise.',
+            f'# TYPE {self.PREFIXO}_etapa_execucoes_total counter',
+        ]
+        for etapa, total in self.agregado.items():
+            linhas.append(f'{self.PREFIXO}_etapa_execucoes_total{{etapa="{etapa}"}} {int(total["execucoes"])}')
+
+        medidas = sorted({m for total in self.agregado.values() for m in total} - {'execucoes', 'duracao_s'})
+        for medida in medidas:
+            linhas += [
+                f'# HELP {self.PREFIXO}_{medida}_total Soma de "{medida}" por etapa da análise.',
+                f'# TYPE {self.PREFIXO}_{medida}_total counter',
+            ]
+            for etapa, total in self.agregado.items():
+                if medida in total:
+                    linhas.append(f'{self.PREFIXO}_{medida}_total{{etapa="{etapa}"}} {total[medida]}')
+
+        for nome, valor in sorted(self.contadores.items()):
+            linhas += [f'# TYPE {self.PREFIXO}_{nome}_total counter', f'{self.PREFIXO}_{nome}_total {valor}']
+
+        with open(self.caminho, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(linhas) + '\n')
+
+
+# =====================================
+# Instrumentação
+# =====================================
+class Instrumentacao:
+    """
+    Temporizadores e contadores por etapa, enviados aos sinks registrados.
+    Sem sinks e sem 'depurar', o custo é apenas o de ler o relógio.
+    """
+
+    def __init__(self, sinks: Iterable[Sink] = (), depurar: bool = False):
+        self.sinks: List[Sink] = list(sinks)
+        self.depurar = depurar
+        self._lock = threading.Lock()
+
+    def _emitir(self, evento: Dict[str, Any]):
+        if not self.sinks:
+            return
+        with self._lock:
+            for sink in self.sinks:
+                sink.registrar(evento)
+
+    @contextmanager
+    def etapa(self, nome: str, **rotulos) -> Iterator[Dict[str, float]]:
+        """
+        Mede a duração de uma etapa. O dicionário devolvido recebe as medidas da etapa
+        (por exemplo, bytes ou blocos), que seguem no evento.
+        """
+        medidas: Dict[str, float] = {}
+        inicio = time.perf_counter()
+        try:
+            yield medidas
+        finally:
+            self._emitir({
+                'tipo': 'etapa',
+                'etapa': nome,
+                'duracao_s': time.perf_counter() - inicio,
+                'rotulos': rotulos,
+                'medidas': medidas,
+            })
+
+    def registrar_etapa(self, nome: str, duracao_s: float, medidas: Dict[str, float], **rotulos):
+        """
+        Registra uma etapa medida noutro lugar (por exemplo, numa thread ou processo do pool).
+        """
+        self._emitir({
+            'tipo': 'etapa',
+            'etapa': nome,
+            'duracao_s': duracao_s,
+            'rotulos': rotulos,
+            'medidas': medidas,
+        })
+
+    def contar(self, nome: str, valor: float = 1, **rotulos):
+        """
+        Registra um contador avulso (por exemplo, telas ignoradas).
+        """
+        self._emitir({'tipo': 'contador', 'nome': nome, 'rotulos': rotulos, 'medidas': {'valor': valor}})
+
+    def depuracao(self, titulo: str, gerar_texto: Callable[[], str]):
+        """
+        Imprime um despejo de depuração. 'gerar_texto' só é chamado quando 'depurar' está ativo.
+        """
+        if self.depurar:
+            print(f"\n---------- {titulo} ----------")
+            print(gerar_texto())
+
+    def finalizar(self):
+        for sink in self.sinks:
+            sink.finalizar()
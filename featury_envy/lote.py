@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""Análise em lote de projetos App Inventor (.aia)
+
+Distribui a análise de muitos arquivos .aia por vários processos e grava um registro
+por procedimento (projeto/tela/procedimento) em JSONL ou CSV, ou os achados em SARIF ou texto,
+à medida que os resultados chegam.
+
+Exemplo:
+    python -m featury_envy.lote submissoes/ --limite 3 --processos 8 -o resultados.jsonl
+    python -m featury_envy.lote submissoes/ --agrupar-similares 0.8 --so-representantes --agrupamentos grupos.json
+"""
+
+# =====================================
+# Importação de Bibliotecas Essenciais
+# =====================================
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .aia import listar_membros_bky, nome_da_tela
+from .arvore import construir_arvore_blocos
+from .cache import CacheAnalise, TAMANHO_MAXIMO_PADRAO
+from .procedimentos import iterar_procedimentos_xml, triar_tela
+from .regras import MotorRegras, RegraListaParametrosLonga
+from .saidas import FORMATOS, EscritorRegistros, criar_escritor, criar_registro, formato_da_saida
+
+
+# =====================================
+# Descoberta dos Arquivos de Entrada
+# =====================================
+def ler_manifesto(caminho_manifesto: str) -> List[str]:
+    """
+    Lê um manifesto com um caminho de .aia por linha (linhas vazias e começadas por '#' são ignoradas).
+    Caminhos relativos são resolvidos a partir do diretório do manifesto.
+    """
+    base = os.path.dirname(os.path.abspath(caminho_manifesto))
+    caminhos = []
+    with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+        for linha in f:
+            linha = linha.strip()
+            if linha and not linha.startswith('#'):
+                caminhos.append(linha if os.path.isabs(linha) else os.path.join(base, linha))
+    return caminhos
+
+def descobrir_arquivos_aia(entradas: Iterable[str]) -> List[str]:
+    """
+    Expande diretórios (recursivamente), padrões glob e manifestos numa lista ordenada de arquivos .aia.
+    """
+    encontrados = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for root, _, files in os.walk(entrada):
+                encontrados.extend(os.path.join(root, f) for f in files if f.endswith('.aia'))
+        elif os.path.isfile(entrada) and not entrada.endswith('.aia'):
+            encontrados.extend(ler_manifesto(entrada))
+        elif os.path.isfile(entrada):
+            encontrados.append(entrada)
+        else:
+            encontrados.extend(glob.glob(entrada, recursive=True))
+
+    # Remove duplicados mantendo uma ordem estável
+    return sorted(set(encontrados))
+
+
+# =====================================
+# Trabalho Executado em Cada Processo
+# =====================================
+# Cache, motor de regras e opções de triagem do processo trabalhador (definidos pelo inicializador do pool)
+_cache_processo: Optional[CacheAnalise] = None
+_motor_processo: Optional[MotorRegras] = None
+_triagem_processo = False
+_so_longos_processo = False
+
+def inicializar_trabalhador(diretorio_cache: Optional[str], tamanho_maximo_cache: int,
+                            perfil_regras: bool = False, param_threshold: int = 3,
+                            triagem: bool = False, so_longos: bool = False):
+    global _cache_processo, _motor_processo, _triagem_processo, _so_longos_processo
+    _triagem_processo = triagem
+    _so_longos_processo = so_longos
+    if diretorio_cache:
+        _cache_processo = CacheAnalise(diretorio_cache, tamanho_maximo_cache)
+    if perfil_regras:
+        _motor_processo = MotorRegras([RegraListaParametrosLonga(param_threshold)])
+
+def _detectar_procedimentos(xml_bytes: bytes) -> List[Dict]:
+    if _motor_processo is None:
+        return list(iterar_procedimentos_xml(xml_bytes))
+    # Caminho com motor de regras: gera a árvore compacta e mede cada regra
+    _motor_processo.analisar(construir_arvore_blocos(ET.fromstring(xml_bytes)))
+    return _motor_processo.regra(RegraListaParametrosLonga.nome).procedimentos
+
+def _procedimentos_da_tela(xml_bytes: bytes) -> List[Dict]:
+    if _cache_processo is None:
+        return _detectar_procedimentos(xml_bytes)
+    return _cache_processo.obter_ou_calcular(xml_bytes, lambda: _detectar_procedimentos(xml_bytes))
+
+def _diferenca_regras(antes: Dict[str, Dict[str, float]], depois: Dict[str, Dict[str, float]]) -> Dict:
+    return {
+        nome: {k: valores[k] - antes.get(nome, {}).get(k, 0) for k in valores}
+        for nome, valores in depois.items()
+    }
+
+def analisar_aia_em_registros(tarefa: Tuple[str, int]) -> Tuple[str, List[Dict], List[str], Dict[str, int], Dict]:
+    """
+    Analisa um único .aia e devolve (caminho, registros, erros, contadores_do_cache, tempos_das_regras).
+    Nunca levanta exceções: um arquivo corrompido ou uma tela inválida aparecem apenas na lista de erros.
+    """
+    caminho_aia, param_threshold = tarefa
+    projeto = os.path.basename(caminho_aia).replace('.aia', '')
+    registros: List[Dict] = []
+    erros: List[str] = []
+    antes = _cache_processo.estatisticas() if _cache_processo else None
+    regras_antes = _motor_processo.estatisticas() if _motor_processo else None
+
+    try:
+        with zipfile.ZipFile(caminho_aia, 'r') as arquivo_zip:
+            for info in listar_membros_bky(arquivo_zip):
+                screen_name = nome_da_tela(info.filename)
+                xml_bytes = arquivo_zip.read(info)
+                # Triagem: telas sem procedimentos (ou, com --so-longos, sem nenhum possível) não passam pelo parser
+                if _triagem_processo and not triar_tela(xml_bytes, param_threshold if _so_longos_processo else None):
+                    continue
+                try:
+                    for proc in _procedimentos_da_tela(xml_bytes):
+                        if _so_longos_processo and proc['parameter_count'] <= param_threshold:
+                            continue
+                        registros.append(criar_registro(projeto, screen_name, proc, param_threshold))
+                except ET.ParseError as e:
+                    erros.append(f"{screen_name}: XML inválido ({e})")
+    except zipfile.BadZipFile:
+        erros.append("não é um arquivo zip válido ou está corrompido")
+    except Exception as e:
+        erros.append(f"{type(e).__name__}: {e}")
+
+    contadores_cache = {}
+    if _cache_processo is not None:
+        depois = _cache_processo.estatisticas()
+        contadores_cache = {k: depois[k] - antes[k] for k in ('acertos', 'falhas', 'remocoes')}
+
+    tempos_regras = {}
+    if _motor_processo is not None:
+        tempos_regras = _diferenca_regras(regras_antes, _motor_processo.estatisticas())
+
+    return caminho_aia, registros, erros, contadores_cache, tempos_regras
+
+
+# =====================================
+# Orquestração do Lote
+# =====================================
+def executar_lote(caminhos_aia: List[str], param_threshold: int, escritor: EscritorRegistros,
+                  processos: Optional[int] = None, tamanho_lote: int = 8,
+                  progresso: TextIO = sys.stderr, diretorio_cache: Optional[str] = None,
+                  tamanho_maximo_cache: int = TAMANHO_MAXIMO_PADRAO, perfil_regras: bool = False,
+                  corpus=None, coorte: str = '', triagem: bool = False, so_longos: bool = False) -> Dict:
+    """
+    Executa a análise de todos os arquivos num pool de processos, enviando as tarefas em blocos
+    (chunksize) e gravando os registros na ordem em que os projetos terminam.
+    Com diretorio_cache, as telas já analisadas são lidas do cache de análise.
+    Com perfil_regras, a detecção passa pelo motor de regras e o tempo de cada regra é somado.
+    Com 'corpus' (um ArmazemCorpus), os registros também são acrescentados ao armazém colunar,
+    marcados com a 'coorte'.
+    Com triagem, as telas cujos bytes mostram que não definem procedimentos não são analisadas;
+    com so_longos, só são gravados os procedimentos com lista de parâmetros longa.
+    Devolve um resumo com totais, falhas, vazão, contadores do cache e tempos das regras.
+    """
+    total = len(caminhos_aia)
+    falhas: List[Tuple[str, str]] = []
+    total_registros = 0
+    cache = {'acertos': 0, 'falhas': 0, 'remocoes': 0}
+    regras: Dict[str, Dict[str, float]] = {}
+    por_projeto: Dict[str, Dict[str, int]] = {}
+    inicio = time.perf_counter()
+
+    tarefas = [(caminho, param_threshold) for caminho in caminhos_aia]
+    with multiprocessing.Pool(processes=processos, initializer=inicializar_trabalhador,
+                              initargs=(diretorio_cache, tamanho_maximo_cache, perfil_regras, param_threshold,
+                                        triagem, so_longos)) as pool:
+        resultados = pool.imap_unordered(analisar_aia_em_registros, tarefas, chunksize=max(1, tamanho_lote))
+        for concluidos, (caminho, registros, erros, contadores_cache, tempos_regras) in enumerate(resultados, 1):
+            escritor.escrever(registros)
+            if corpus is not None:
+                corpus.acrescentar(registros, coorte)
+            total_registros += len(registros)
+            por_projeto[caminho] = {
+                'procedures': len(registros),
+                'long_parameter_list': sum(1 for registro in registros if registro['long_parameter_list']),
+            }
+            falhas.extend((caminho, erro) for erro in erros)
+            for contador, valor in contadores_cache.items():
+                cache[contador] += valor
+            for nome, valores in tempos_regras.items():
+                acumulado = regras.setdefault(nome, {"invocacoes": 0, "tempo_s": 0.0})
+                for chave, valor in valores.items():
+                    acumulado[chave] += valor
+
+            estado = "FALHA" if erros else "ok"
+            progresso.write(f"[{concluidos}/{total}] {estado} {caminho}\n")
+            progresso.flush()
+
+    duracao = time.perf_counter() - inicio
+    return {
+        'projetos': total,
+        'registros': total_registros,
+        'falhas': falhas,
+        'duracao_s': duracao,
+        'projetos_por_s': total / duracao if duracao > 0 else 0.0,
+        'cache': cache if diretorio_cache else None,
+        'regras': regras if perfil_regras else None,
+        'por_projeto': por_projeto,
+    }
+
+def achados_por_grupo(grupos: List[Dict], por_projeto: Dict[str, Dict[str, int]],
+                      so_representantes: bool = False) -> List[Dict]:
+    """
+    Acrescenta a cada grupo de projetos semelhantes os totais de achados dos membros analisados
+    ('procedures', 'long_parameter_list'). Com so_representantes, só o representante foi analisado
+    e os totais são os dele ('representative_procedures', 'representative_long_parameter_list').
+    """
+    vazio = {'procedures': 0, 'long_parameter_list': 0}
+    anotados = []
+    for grupo in grupos:
+        if so_representantes:
+            totais = por_projeto.get(grupo['representative'], vazio)
+            anotados.append({**grupo, **{f"representative_{chave}": valor for chave, valor in totais.items()}})
+            continue
+        membros = [por_projeto.get(membro['project'], vazio) for membro in grupo['members']]
+        anotados.append({**grupo, **{chave: sum(totais[chave] for totais in membros) for chave in vazio}})
+    return anotados
+
+def imprimir_resumo(resumo: Dict, progresso: TextIO = sys.stderr):
+    """
+    Imprime o resumo final do lote (falhas e vazão) no fluxo de progresso.
+    """
+    progresso.write("\n" + "=" * 20 + " RESUMO DO LOTE " + "=" * 20 + "\n")
+    progresso.write(f"Projetos analisados: {resumo['projetos']}\n")
+    progresso.write(f"Registros gravados: {resumo['registros']}\n")
+    progresso.write(f"Tempo total: {resumo['duracao_s']:.2f}s ({resumo['projetos_por_s']:.1f} projetos/s)\n")
+    if resumo.get('cache'):
+        cache = resumo['cache']
+        progresso.write(f"Cache: {cache['acertos']} acerto(s), {cache['falhas']} falha(s), "
+                        f"{cache['remocoes']} remoção(ões)\n")
+    if resumo.get('regras'):
+        progresso.write("Tempo por regra (soma dos processos):\n")
+        for nome, valores in sorted(resumo['regras'].items(), key=lambda item: -item[1]['tempo_s']):
+            progresso.write(f"   - {nome}: {valores['tempo_s'] * 1000:.2f} ms em "
+                            f"{int(valores['invocacoes'])} invocação(ões)\n")
+    if resumo.get('grupos') is not None:
+        grupos = resumo['grupos']
+        semelhantes = [grupo for grupo in grupos if grupo['size'] > 1]
+        nao_analisados = sum(grupo['size'] for grupo in grupos) - resumo['projetos']
+        progresso.write(f"Grupos de projetos semelhantes: {len(semelhantes)} "
+                        f"({nao_analisados} projeto(s) não reanalisado(s))\n")
+        for grupo in semelhantes:
+            if 'procedures' in grupo:
+                totais = (f"{grupo['procedures']} procedimento(s), {grupo['long_parameter_list']} "
+                          f"com lista de parâmetros longa (todos os membros)")
+            else:
+                totais = (f"{grupo['representative_procedures']} procedimento(s), "
+                          f"{grupo['representative_long_parameter_list']} com lista de parâmetros longa "
+                          f"(só o representante)")
+            progresso.write(f"   - {grupo['representative']} (+{grupo['size'] - 1}): {totais}\n")
+    if resumo['falhas']:
+        progresso.write(f"❌ {len(resumo['falhas'])} falha(s):\n")
+        for caminho, erro in resumo['falhas']:
+            progresso.write(f"   - {caminho}: {erro}\n")
+    progresso.flush()
+
+def criar_parser_argumentos() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Analisa em lote projetos App Inventor (.aia) à procura de listas de parâmetros longas."
+    )
+    parser.add_argument('entradas', nargs='+',
+                        help="Diretórios, padrões glob ou manifestos (um caminho .aia por linha)")
+    parser.add_argument('-l', '--limite', type=int, default=3,
+                        help="Um procedimento é 'longo' se tiver MAIS do que este número de parâmetros (padrão: 3)")
+    parser.add_argument('-o', '--saida', default='-',
+                        help="Arquivo de saída ('-' para stdout, padrão)")
+    parser.add_argument('-f', '--formato', choices=FORMATOS, default=None,
+                        help="Formato da saída (padrão: deduzido da extensão .csv, .sarif ou .txt, senão jsonl)")
+    parser.add_argument('-p', '--processos', type=int, default=None,
+                        help="Número de processos do pool (padrão: número de CPUs)")
+    parser.add_argument('--tamanho-lote', type=int, default=8,
+                        help="Quantidade de projetos enviados a cada processo por vez (padrão: 8)")
+    parser.add_argument('--cache', metavar='DIRETORIO', default=None,
+                        help="Diretório do cache de análise por conteúdo de tela (padrão: sem cache)")
+    parser.add_argument('--cache-max-mb', type=int, default=TAMANHO_MAXIMO_PADRAO // (1024 * 1024),
+                        help="Tamanho máximo do cache em MB, com remoção LRU (padrão: 256)")
+    parser.add_argument('--corpus', metavar='DIRETORIO', default=None,
+                        help="Acrescenta os registros ao armazém colunar do corpus neste diretório")
+    parser.add_argument('--coorte', default='',
+                        help="Coorte (turma, semestre...) gravada com os registros no corpus")
+    parser.add_argument('--perfil-regras', action='store_true',
+                        help="Detecta pelo motor de regras e mostra o tempo e as invocações de cada regra")
+    parser.add_argument('--triagem', action='store_true',
+                        help="Não analisa as telas cujos bytes mostram que não definem procedimentos")
+    parser.add_argument('--so-longos', action='store_true',
+                        help="Só grava os procedimentos com lista de parâmetros longa (com --triagem, "
+                             "as telas com poucos campos VAR também deixam de ser analisadas)")
+    parser.add_argument('--agrupar-similares', metavar='LIMIAR', type=float, nargs='?', const=0.8, default=None,
+                        help="Agrupa os projetos quase idênticos (MinHash) e informa os grupos no resumo "
+                             "(limiar de similaridade padrão: 0.8)")
+    parser.add_argument('--so-representantes', action='store_true',
+                        help="Com --agrupar-similares, só analisa o representante de cada grupo")
+    parser.add_argument('--agrupamentos', metavar='ARQUIVO', default=None,
+                        help="Com --agrupar-similares, grava os grupos e os seus achados neste arquivo JSON")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser_argumentos().parse_args(argv)
+
+    formato = formato_da_saida(args.saida, args.formato)
+    caminhos_aia = descobrir_arquivos_aia(args.entradas)
+    if not caminhos_aia:
+        sys.stderr.write("⚠️ Nenhum arquivo .aia encontrado nas entradas informadas.\n")
+        return 1
+
+    agrupamento = None
+    if args.agrupar_similares is not None:
+        from .similaridade import agrupar_projetos
+        agrupamento = agrupar_projetos(caminhos_aia, args.agrupar_similares, trabalhadores=args.processos)
+        sys.stderr.write(f"{len(caminhos_aia)} projeto(s) em {len(agrupamento['grupos'])} grupo(s) "
+                         f"de similaridade ≥ {args.agrupar_similares:.2f}\n")
+        if args.so_representantes:
+            caminhos_aia = [grupo['representative'] for grupo in agrupamento['grupos']]
+
+    sys.stderr.write(f"Analisando {len(caminhos_aia)} projeto(s) (limite > {args.limite} parâmetros)...\n")
+    opcoes = dict(processos=args.processos, tamanho_lote=args.tamanho_lote, diretorio_cache=args.cache,
+                  tamanho_maximo_cache=args.cache_max_mb * 1024 * 1024, perfil_regras=args.perfil_regras,
+                  coorte=args.coorte, triagem=args.triagem, so_longos=args.so_longos)
+    if args.corpus:
+        from .corpus import ArmazemCorpus
+        opcoes['corpus'] = ArmazemCorpus(args.corpus)
+    if args.saida == '-':
+        with criar_escritor(sys.stdout, formato, args.limite) as escritor:
+            resumo = executar_lote(caminhos_aia, args.limite, escritor, **opcoes)
+    else:
+        with open(args.saida, 'w', encoding='utf-8', newline='') as saida, \
+                criar_escritor(saida, formato, args.limite) as escritor:
+            resumo = executar_lote(caminhos_aia, args.limite, escritor, **opcoes)
+
+    if agrupamento is not None:
+        resumo['grupos'] = achados_por_grupo(agrupamento['grupos'], resumo['por_projeto'], args.so_representantes)
+        if args.agrupamentos:
+            with open(args.agrupamentos, 'w', encoding='utf-8') as arquivo:
+                json.dump(resumo['grupos'], arquivo, ensure_ascii=False, indent=2)
+    imprimir_resumo(resumo)
+    return 1 if resumo['falhas'] else 0
+
+
+# =====================================
+# PONTO DE ENTRADA / EXECUÇÃO
+# =====================================
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Análise das telas de um mesmo projeto em paralelo
+
+As telas são analisadas num pool de threads ou de processos e os resultados voltam na ordem
+original das telas, para que os relatórios sejam estáveis e comparáveis entre execuções.
+O parse com ElementTree segura o GIL, por isso o pool de processos é o que escala com
+telas grandes; o de threads tem custo de arranque menor e serve para projetos pequenos.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .aia import ler_telas_aia
+from .arvore import contar_blocos, parse_blockly_xml_to_ast
+from .procedimentos import find_procedures_streaming, metricas_das_unidades
+from .regras import MotorRegras, RegraListaParametrosLonga, criar_motor_padrao
+from .simbolos import RegraIndiceSimbolos
+
+EXECUTORES = ('sequencial', 'threads', 'processos')
+
+# (nome_da_tela, bytes_xml, componentes, param_threshold, razao_feature_envy, minimo_acessos, streaming)
+TarefaTela = Tuple[str, bytes, Optional[Dict[str, str]], int, float, int, bool]
+
+
+# =====================================
+# Execução em Pool com Ordem Determinística
+# =====================================
+def mapear_telas(funcao: Callable[[Any], Any], tarefas: Sequence, executor: str = 'threads',
+                 trabalhadores: Optional[int] = None,
+                 ao_concluir: Optional[Callable[[int, Any, int, int], None]] = None,
+                 mp_context=None, pool=None) -> List:
+    """
+    Aplica 'funcao' a cada tarefa no executor escolhido ('sequencial', 'threads' ou 'processos')
+    e devolve os resultados na ordem das tarefas, qualquer que seja a ordem de conclusão.
+    'ao_concluir(indice, resultado, concluidas, total)' é chamado na thread que chamou mapear_telas
+    assim que cada tarefa termina (por exemplo, para atualizar uma barra de progresso).
+    Uma exceção numa tarefa é devolvida no lugar do seu resultado, sem interromper as demais.
+    Com 'processos', a função e as tarefas precisam ser serializáveis (pickle); 'mp_context'
+    (por exemplo, multiprocessing.get_context('spawn')) escolhe como os processos são criados,
+    o que importa num programa com várias threads. Com 'pool' (um Executor já aberto), as tarefas
+    são enviadas a ele, que não é fechado no fim.
+    """
+    if executor not in EXECUTORES:
+        raise ValueError(f"executor desconhecido: {executor!r} (use um de {', '.join(EXECUTORES)})")
+
+    total = len(tarefas)
+    resultados: List[Any] = [None] * total
+    if pool is None and (executor == 'sequencial' or total <= 1):
+        for indice, tarefa in enumerate(tarefas):
+            try:
+                resultados[indice] = funcao(tarefa)
+            except Exception as e:
+                resultados[indice] = e
+            if ao_concluir:
+                ao_concluir(indice, resultados[indice], indice + 1, total)
+        return resultados
+
+    # Importados aqui para não carregar multiprocessing ao importar o pacote
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+    if pool is not None:
+        proprio = None
+    elif executor == 'threads':
+        proprio = pool = ThreadPoolExecutor(max_workers=trabalhadores)
+    else:
+        proprio = pool = ProcessPoolExecutor(max_workers=trabalhadores, mp_context=mp_context)
+    try:
+        futuros = {pool.submit(funcao, tarefa): indice for indice, tarefa in enumerate(tarefas)}
+        for concluidas, futuro in enumerate(as_completed(futuros), 1):
+            indice = futuros[futuro]
+            erro = futuro.exception()
+            resultados[indice] = erro if erro is not None else futuro.result()
+            if ao_concluir:
+                ao_concluir(indice, resultados[indice], concluidas, total)
+    finally:
+        if proprio is not None:
+            proprio.shutdown()
+    return resultados
+
+
+# =====================================
+# Trabalho de uma Tela
+# =====================================
+def analisar_tela(tarefa: TarefaTela) -> Dict:
+    """
+    Analisa uma tela de forma independente (parse + motor de regras, ou detecção em streaming).
+    Devolve os procedimentos, os achados por regra, as estatísticas das regras e as medidas
+    de cada etapa, para que o processo principal monte os relatórios e a instrumentação.
+    """
+    nome_tela, xml_bytes, componentes, param_threshold, razao_feature_envy, minimo_acessos, streaming = tarefa
+    relogio = time.perf_counter
+    resultado: Dict[str, Any] = {'screen_name': nome_tela, 'erro': None, 'etapas': {}}
+
+    if streaming:
+        inicio = relogio()
+        contagens: Dict[str, int] = {}
+        procedimentos = find_procedures_streaming(xml_bytes, contagens)
+        resultado['etapas']['detectar'] = {'duracao_s': relogio() - inicio, 'procedimentos': len(procedimentos),
+                                           'blocos': contagens.get('blocos', 0)}
+        resultado.update(procedimentos=procedimentos, achados=None, estatisticas_regras=None)
+        return resultado
+
+    inicio = relogio()
+    ast = parse_blockly_xml_to_ast(xml_bytes, compacta=True)
+    resultado['etapas']['parse'] = {'duracao_s': relogio() - inicio, 'bytes': len(xml_bytes)}
+    if ast:
+        resultado['etapas']['parse']['blocos'] = contar_blocos(ast)
+    if not ast:
+        resultado.update(erro="AST não gerada", procedimentos=[], achados=None, estatisticas_regras=None)
+        return resultado
+
+    motor = criar_motor_padrao(param_threshold, razao_feature_envy, minimo_acessos)
+    inicio = relogio()
+    achados = motor.analisar(ast, nome_tela, componentes)
+    procedimentos = motor.regra(RegraListaParametrosLonga.nome).procedimentos
+    resultado['etapas']['detectar'] = {
+        'duracao_s': relogio() - inicio,
+        'procedimentos': len(procedimentos),
+        'achados': sum(len(a) for a in achados.values()),
+    }
+    resultado.update(procedimentos=procedimentos, achados=achados, estatisticas_regras=motor.estatisticas())
+    return resultado
+
+def resumir_tela(tarefa: Tuple[str, bytes]) -> Optional[Dict]:
+    """
+    Procedimentos e número de blocos de topo de uma tela (nome, bytes), o resumo mostrado pelo dashboard.
+    Cada procedimento leva também as métricas do grafo de chamadas da tela (fan-in, fan-out...),
+    do índice de símbolos montado na mesma passagem; 'units' traz as métricas de complexidade
+    dos procedimentos e dos tratadores de eventos.
+    """
+    nome_tela, xml_bytes = tarefa
+    ast = parse_blockly_xml_to_ast(xml_bytes, compacta=True)
+    if not ast:
+        return None
+    procedimentos, simbolos = RegraListaParametrosLonga(), RegraIndiceSimbolos()
+    MotorRegras([procedimentos, simbolos]).analisar(ast, nome_tela)
+    return {
+        'procedures': [
+            dict(proc, **simbolos.indice.metricas_procedimento(nome_tela, proc['procedure_name']))
+            for proc in procedimentos.procedimentos
+        ],
+        'units': metricas_das_unidades(ast),
+        'total_blocks': len(ast.get('blocks', [])),
+    }
+
+def resumir_projeto(tarefa: Tuple[str, bytes]) -> Dict:
+    """
+    Resume todas as telas de um projeto (nome, bytes do .aia) com resumir_tela.
+    Nunca levanta exceções: um arquivo corrompido ou uma tela inválida aparecem em 'erros'.
+    """
+    nome_projeto, conteudo = tarefa
+    resultado: Dict[str, Any] = {'project': nome_projeto, 'screens': [], 'erros': []}
+    try:
+        telas = ler_telas_aia(conteudo)
+        if telas is None:
+            resultado['erros'].append("não é um arquivo zip válido ou está corrompido")
+            return resultado
+        for nome_tela, xml_bytes in telas:
+            resumo = resumir_tela((nome_tela, xml_bytes))
+            if resumo is None:
+                resultado['erros'].append(f"{nome_tela}: XML inválido")
+                continue
+            resultado['screens'].append(dict(resumo, screen_name=nome_tela))
+    except Exception as e:
+        resultado['erros'].append(f"{type(e).__name__}: {e}")
+    return resultado
+
+def somar_estatisticas_regras(estatisticas: Iterable[Optional[Dict[str, Dict[str, float]]]]) -> Dict:
+    """
+    Soma as estatísticas de MotorRegras.estatisticas() de várias telas.
+    """
+    total: Dict[str, Dict[str, float]] = {}
+    for por_regra in estatisticas:
+        for nome, valores in (por_regra or {}).items():
+            acumulado = total.setdefault(nome, {"invocacoes": 0, "tempo_s": 0.0})
+            for chave, valor in valores.items():
+                acumulado[chave] += valor
+    return total
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""Detecção de procedimentos e dos seus parâmetros"""
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Mapping
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+from .arvore import _metricas, _senao_se, metricas_do_bloco
+from .constantes import BN, TIPOS_DECISAO, TIPOS_PROCEDIMENTO, XN
+from .feature_envy import nome_da_unidade
+
+logger = logging.getLogger(__name__)
+
+
+# =====================================
+# Procedimentos na AST
+# =====================================
+def detalhar_procedimento(proc: Mapping) -> Dict:
+    """
+    Extrai o nome e os parâmetros (campos 'VAR...') de um bloco de definição de procedimento.
+    """
+    proc_name = 'ProcedimentoSemNome'
+    parameters = []
+
+    # Itera pelos campos para encontrar o nome e os parâmetros
+    for field in proc.get('fields', []):
+        field_name = field.get('name')
+        if field_name == 'NAME':
+            proc_name = field.get('text', 'ProcedimentoSemNome')
+        elif field_name and field_name.startswith('VAR'):
+            # Adiciona o texto do campo (nome do parâmetro) à lista
+            if field.get('text'):
+                parameters.append(field.get('text'))
+
+    return {
+        "procedure_name": proc_name,
+        "parameter_count": len(parameters),
+        "parameters": parameters,
+    }
+
+def find_procedures_in_ast(ast: Mapping) -> List[Dict]:
+    """
+    Analisa a AST e retorna uma lista de todos os procedimentos definidos.
+    CORRIGIDO: Extrai os parâmetros dos elementos 'field' com nome 'VAR...'.
+    """
+    all_procedures = []
+    if not ast or 'blocks' not in ast:
+        return []
+
+    # Métricas de complexidade calculadas durante o parse (uma entrada por bloco de topo)
+    metricas = ast.get('metrics')
+    for indice, proc in enumerate(ast.get('blocks', [])):
+        if not proc or proc.get('type') not in TIPOS_PROCEDIMENTO:
+            continue
+        proc_details = detalhar_procedimento(proc)
+        proc_details.update(metricas[indice] if metricas is not None else metricas_do_bloco(proc))
+        all_procedures.append(proc_details)
+
+    return all_procedures
+
+def metricas_das_unidades(ast: Mapping) -> List[Dict]:
+    """
+    Métricas de complexidade de cada procedimento e tratador de evento da tela:
+    {'kind': 'procedure' | 'event', 'name': ..., 'block_count': ..., ...}.
+    """
+    if not ast or 'blocks' not in ast:
+        return []
+    metricas = ast.get('metrics')
+    unidades = []
+    for indice, topo in enumerate(ast.get('blocks', [])):
+        if not topo or topo.get('type') not in TIPOS_PROCEDIMENTO + ('component_event',):
+            continue
+        tipo_unidade, nome, _ = nome_da_unidade(topo)
+        unidade = {'kind': tipo_unidade, 'name': nome}
+        unidade.update(metricas[indice] if metricas is not None else metricas_do_bloco(topo))
+        unidades.append(unidade)
+    return unidades
+
+# =====================================
+# Detecção de Procedimentos em Streaming (sem AST)
+# =====================================
+TAMANHO_BLOCO_LEITURA = 64 * 1024
+
+def _pedacos_xml(xml_source: Union[str, bytes, BinaryIO]) -> Iterator[bytes]:
+    """
+    Divide a origem do XML (texto, bytes ou objeto tipo arquivo) em pedaços para o parser incremental.
+    """
+    if isinstance(xml_source, str):
+        xml_source = xml_source.encode('utf-8')
+    if isinstance(xml_source, (bytes, bytearray, memoryview)):
+        dados = memoryview(xml_source)
+        for inicio in range(0, len(dados), TAMANHO_BLOCO_LEITURA):
+            yield bytes(dados[inicio:inicio + TAMANHO_BLOCO_LEITURA])
+        return
+    while True:
+        pedaco = xml_source.read(TAMANHO_BLOCO_LEITURA)
+        if not pedaco:
+            return
+        yield pedaco.encode('utf-8') if isinstance(pedaco, str) else pedaco
+
+def iterar_procedimentos_xml(xml_source: Union[str, bytes, BinaryIO],
+                             contagens: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    """
+    Emite os procedimentos definidos numa tela à medida que cada bloco de topo é fechado,
+    usando um XMLPullParser em vez de construir a AST completa.
+    As métricas de complexidade são acumuladas com os mesmos eventos do parser.
+    Os elementos já processados são descartados. Levanta ET.ParseError se o XML for inválido.
+    Com 'contagens', guarda em contagens['blocos'] o número de blocos de toda a tela.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    profundidade = 0
+    # Estado do bloco de topo atual (apenas se for uma definição de procedimento)
+    em_procedimento = False
+    proc_name = 'ProcedimentoSemNome'
+    parameters: List[str] = []
+    # Elementos abertos dentro do procedimento e, por bloco aberto, (aninhamento, cadeia 'next', é decisão)
+    abertos: List[str] = []
+    blocos_abertos: List[tuple] = []
+    # [blocos, profundidade máxima, decisões, "senão, se", maior cadeia 'next'], como em construir_arvore_blocos
+    acumulado = [0, 0, 0, 0, 0]
+    tag_bloco, tag_next = f'{BN}block', f'{BN}next'
+    tags_mutacao = (f'{XN}mutation', f'{BN}mutation')
+    if contagens is not None:
+        contagens['blocos'] = 0
+
+    for pedaco in _pedacos_xml(xml_source):
+        parser.feed(pedaco)
+        for evento, elem in parser.read_events():
+            if evento == 'start':
+                profundidade += 1
+                if contagens is not None and profundidade > 1 and elem.tag == tag_bloco:
+                    contagens['blocos'] += 1
+                if profundidade == 1:
+                    root = elem
+                elif profundidade == 2 and elem.tag == tag_bloco:
+                    em_procedimento = elem.get('type') in TIPOS_PROCEDIMENTO
+                    proc_name = 'ProcedimentoSemNome'
+                    parameters = []
+                    abertos = [tag_bloco]
+                    blocos_abertos = [(0, 1, False)]
+                    acumulado = [1, 0, 0, 0, 1]
+                elif em_procedimento and profundidade > 2:
+                    if elem.tag == tag_bloco:
+                        aninhamento, cadeia, _ = blocos_abertos[-1]
+                        if abertos[-1] == tag_next:
+                            cadeia += 1
+                        else:
+                            aninhamento, cadeia = aninhamento + 1, 1
+                        decisao = elem.get('type') in TIPOS_DECISAO
+                        blocos_abertos.append((aninhamento, cadeia, decisao))
+                        acumulado[0] += 1
+                        acumulado[1] = max(acumulado[1], aninhamento)
+                        acumulado[2] += decisao
+                        acumulado[4] = max(acumulado[4], cadeia)
+                    elif elem.tag in tags_mutacao and abertos[-1] == tag_bloco and blocos_abertos[-1][2]:
+                        acumulado[3] += _senao_se(elem)
+                    abertos.append(elem.tag)
+                continue
+
+            # evento == 'end'
+            if em_procedimento and profundidade > 2:
+                abertos.pop()
+                if elem.tag == tag_bloco:
+                    blocos_abertos.pop()
+            if profundidade == 3 and em_procedimento and elem.tag == f'{BN}field':
+                field_name = elem.get('name')
+                if field_name == 'NAME':
+                    proc_name = elem.text
+                elif field_name and field_name.startswith('VAR'):
+                    if elem.text:
+                        parameters.append(elem.text)
+            elif profundidade == 2:
+                if em_procedimento and elem.tag == f'{BN}block':
+                    procedimento = {
+                        "procedure_name": proc_name,
+                        "parameter_count": len(parameters),
+                        "parameters": parameters,
+                    }
+                    procedimento.update(_metricas(*acumulado))
+                    yield procedimento
+                em_procedimento = False
+                # Libera o bloco de topo já processado
+                elem.clear()
+                if root is not None:
+                    root.remove(elem)
+            profundidade -= 1
+
+    parser.close()
+
+def find_procedures_streaming(xml_source: Union[str, bytes, BinaryIO],
+                              contagens: Optional[Dict[str, int]] = None) -> List[Dict]:
+    """
+    Equivalente a find_procedures_in_ast(parse_blockly_xml_to_ast(xml)), mas em streaming.
+    """
+    try:
+        return list(iterar_procedimentos_xml(xml_source, contagens))
+    except ET.ParseError as e:
+        logger.warning("Erro ao parsear XML: %s", e)
+        return []
+
+
+# =====================================
+# Triagem pelos Bytes da Tela (sem parse)
+# =====================================
+_MARCADORES_PROCEDIMENTO = tuple(tipo.encode('ascii') for tipo in TIPOS_PROCEDIMENTO)
+# Atributo name="VAR..." (ou com aspas simples / espaços), de um campo ou de outro elemento
+_ATRIBUTO_VAR = re.compile(rb"""name\s*=\s*["']VAR""")
+
+def _bytes_inconclusivos(xml_bytes: bytes) -> bool:
+    # UTF-16 (com ou sem BOM: bytes nulos no início), referências de caractere (&#...;) e
+    # entidades declaradas podem esconder os marcadores
+    return (xml_bytes[:2] in (b'\xff\xfe', b'\xfe\xff') or b'\x00' in xml_bytes[:1024]
+            or b'&#' in xml_bytes or b'<!ENTITY' in xml_bytes)
+
+def pode_ter_procedimentos(xml_bytes: bytes) -> bool:
+    """
+    Procura os tipos de definição de procedimento nos bytes da tela, sem parse.
+    False só quando é certo que a tela não define procedimentos; um marcador num texto
+    ou num comentário apenas faz a tela seguir para o parser.
+    """
+    if _bytes_inconclusivos(xml_bytes):
+        return True
+    return any(marcador in xml_bytes for marcador in _MARCADORES_PROCEDIMENTO)
+
+def limite_superior_parametros(xml_bytes: bytes) -> Optional[int]:
+    """
+    Cota superior do número de parâmetros de qualquer procedimento da tela: o total de
+    atributos name="VAR..." nos bytes (parâmetros, mas também variáveis locais, 'for' etc.).
+    None se os bytes não permitirem uma contagem segura.
+    """
+    if _bytes_inconclusivos(xml_bytes):
+        return None
+    return len(_ATRIBUTO_VAR.findall(xml_bytes))
+
+def triar_tela(xml_bytes: bytes, param_threshold: Optional[int] = None) -> bool:
+    """
+    Diz se a tela precisa do parser: False quando não define procedimentos ou, com
+    'param_threshold', quando nenhum procedimento pode ter mais parâmetros do que o limite.
+    Nunca descarta uma tela cujo parse encontraria um procedimento (ou um longo, com o limite).
+    """
+    if not pode_ter_procedimentos(xml_bytes):
+        return False
+    if param_threshold is None:
+        return True
+    cota = limite_superior_parametros(xml_bytes)
+    return cota is None or cota > param_threshold
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""Motor de regras: uma única passagem pela árvore de blocos por tela"""
+
+import time
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .arvore import filhos_do_bloco, metricas_do_bloco
+from .constantes import TIPOS_PROCEDIMENTO
+from .feature_envy import (
+    TIPOS_REFERENCIA_COMPONENTE,
+    componente_referenciado,
+    nome_da_unidade,
+    find_feature_envy,
+)
+from .procedimentos import detalhar_procedimento
+
+
+# =====================================
+# Motor de Regras (uma única passagem por tela)
+# =====================================
+class ContextoTela:
+    """
+    Estado partilhado pelas regras durante a visita de uma tela.
+    """
+    __slots__ = ('nome_tela', 'componentes', 'bloco_topo', 'metricas_topo')
+
+    def __init__(self, nome_tela: Optional[str] = None, componentes: Optional[Dict[str, str]] = None):
+        self.nome_tela = nome_tela
+        self.componentes = componentes
+        # Bloco de topo (procedimento, evento, declaração global...) que contém o bloco visitado
+        self.bloco_topo: Optional[Mapping] = None
+        # Métricas de complexidade do bloco de topo, calculadas durante o parse (se disponíveis)
+        self.metricas_topo: Optional[Dict[str, int]] = None
+
+class Regra:
+    """
+    Regra de detecção de code smell. Cada regra declara os tipos de bloco que lhe interessam
+    em 'tipos_de_bloco'; o motor só a chama para esses blocos.
+    """
+    nome = 'regra'
+    tipos_de_bloco: Tuple[str, ...] = ()
+
+    def iniciar_tela(self, contexto: ContextoTela):
+        pass
+
+    def visitar(self, bloco: Mapping, contexto: ContextoTela):
+        raise NotImplementedError
+
+    def finalizar_tela(self, contexto: ContextoTela) -> List[Dict]:
+        return []
+
+class RegraListaParametrosLonga(Regra):
+    """
+    Long Parameter List: procedimentos com mais de 'limite' parâmetros.
+    Após cada tela, 'procedimentos' guarda todos os procedimentos encontrados.
+    """
+    nome = 'long_parameter_list'
+    tipos_de_bloco = TIPOS_PROCEDIMENTO
+
+    def __init__(self, limite: int = 3):
+        self.limite = limite
+        self.procedimentos: List[Dict] = []
+
+    def iniciar_tela(self, contexto: ContextoTela):
+        self.procedimentos = []
+
+    def visitar(self, bloco: Mapping, contexto: ContextoTela):
+        # Como em find_procedures_in_ast, só contam as definições de topo
+        if bloco is contexto.bloco_topo:
+            procedimento = detalhar_procedimento(bloco)
+            procedimento.update(contexto.metricas_topo or metricas_do_bloco(bloco))
+            self.procedimentos.append(procedimento)
+
+    def finalizar_tela(self, contexto: ContextoTela) -> List[Dict]:
+        return [p for p in self.procedimentos if p['parameter_count'] > self.limite]
+
+class RegraFeatureEnvy(Regra):
+    """
+    Feature Envy: monta o índice de referências a componentes durante a passagem do motor
+    e aplica find_feature_envy no fim da tela. É a única implementação do índice:
+    construir_indice_referencias devolve o 'indice' desta regra.
+    """
+    nome = 'feature_envy'
+    tipos_de_bloco = TIPOS_PROCEDIMENTO + TIPOS_REFERENCIA_COMPONENTE
+
+    def __init__(self, razao: float = 2.0, minimo_acessos: int = 3):
+        self.razao = razao
+        self.minimo_acessos = minimo_acessos
+        self.indice: List[Dict] = []
+        self._topo_atual: Optional[Mapping] = None
+
+    def iniciar_tela(self, contexto: ContextoTela):
+        self.indice = []
+        self._topo_atual = None
+
+    def visitar(self, bloco: Mapping, contexto: ContextoTela):
+        if bloco is contexto.bloco_topo:
+            if bloco.get('type') in TIPOS_PROCEDIMENTO + ('component_event',):
+                tipo_unidade, nome, dono = nome_da_unidade(bloco)
+                if tipo_unidade == 'procedure':
+                    dono = contexto.nome_tela
+                self.indice.append({
+                    "kind": tipo_unidade, "name": nome, "own_component": dono,
+                    "references": {}, "component_types": {},
+                })
+                self._topo_atual = bloco
+            return
+
+        if self._topo_atual is not contexto.bloco_topo:
+            return
+        instancia = componente_referenciado(bloco)
+        componentes = contexto.componentes
+        if instancia and (componentes is None or instancia in componentes):
+            unidade = self.indice[-1]
+            unidade['references'][instancia] = unidade['references'].get(instancia, 0) + 1
+            unidade['component_types'][instancia] = (
+                componentes[instancia] if componentes is not None
+                else bloco.get('mutation', {}).get('component_type')
+            )
+
+    def finalizar_tela(self, contexto: ContextoTela) -> List[Dict]:
+        return find_feature_envy(self.indice, self.razao, self.minimo_acessos)
+
+class MotorRegras:
+    """
+    Percorre a árvore de blocos de uma tela uma única vez e despacha cada bloco, pelo seu 'type',
+    apenas para as regras registradas para esse tipo. Mede o tempo e o número de chamadas de cada regra.
+    """
+
+    def __init__(self, regras: Iterable[Regra] = ()):
+        self.regras: List[Regra] = []
+        self._despacho: Dict[str, List[Regra]] = {}
+        self._estatisticas: Dict[str, Dict[str, float]] = {}
+        self._tempo_percurso = 0.0
+        self._blocos_visitados = 0
+        for regra in regras:
+            self.registrar(regra)
+
+    def registrar(self, regra: Regra):
+        self.regras.append(regra)
+        for tipo in regra.tipos_de_bloco:
+            self._despacho.setdefault(tipo, []).append(regra)
+        self._estatisticas[regra.nome] = {"invocacoes": 0, "tempo_s": 0.0}
+
+    def regra(self, nome: str) -> Optional[Regra]:
+        return next((r for r in self.regras if r.nome == nome), None)
+
+    def analisar(self, ast: Mapping, nome_tela: Optional[str] = None,
+                 componentes: Optional[Dict[str, str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Aplica todas as regras a uma tela e devolve {nome_da_regra: achados}.
+        """
+        contexto = ContextoTela(nome_tela, componentes)
+        relogio = time.perf_counter
+        estatisticas = self._estatisticas
+
+        for regra in self.regras:
+            inicio = relogio()
+            regra.iniciar_tela(contexto)
+            estatisticas[regra.nome]["tempo_s"] += relogio() - inicio
+
+        inicio_percurso = relogio()
+        tempo_regras = 0.0
+        despacho = self._despacho
+        metricas = ast.get('metrics') if ast else None
+        for indice, topo in enumerate(ast.get('blocks', []) if ast else []):
+            if not topo:
+                continue
+            contexto.bloco_topo = topo
+            contexto.metricas_topo = metricas[indice] if metricas is not None else None
+            pilha = [topo]
+            while pilha:
+                bloco = pilha.pop()
+                self._blocos_visitados += 1
+                for regra in despacho.get(bloco.get('type'), ()):
+                    inicio = relogio()
+                    regra.visitar(bloco, contexto)
+                    duracao = relogio() - inicio
+                    tempo_regras += duracao
+                    estatisticas[regra.nome]["tempo_s"] += duracao
+                    estatisticas[regra.nome]["invocacoes"] += 1
+                pilha.extend(reversed(filhos_do_bloco(bloco)))
+        self._tempo_percurso += relogio() - inicio_percurso - tempo_regras
+
+        resultados = {}
+        for regra in self.regras:
+            inicio = relogio()
+            resultados[regra.nome] = regra.finalizar_tela(contexto)
+            estatisticas[regra.nome]["tempo_s"] += relogio() - inicio
+        return resultados
+
+    def estatisticas(self) -> Dict[str, Dict[str, float]]:
+        """
+        Tempo acumulado (s) e número de invocações por regra, mais o custo do próprio percurso.
+        """
+        resumo = {nome: dict(valores) for nome, valores in self._estatisticas.items()}
+        resumo["_percurso"] = {"invocacoes": self._blocos_visitados, "tempo_s": self._tempo_percurso}
+        return resumo
+
+def criar_motor_padrao(param_threshold: int = 3, razao_feature_envy: float = 2.0,
+                       minimo_acessos: int = 3) -> MotorRegras:
+    """
+    Motor com as regras embutidas: Long Parameter List, Feature Envy e o índice de símbolos
+    (RegraIndiceSimbolos, sem achados; o índice da tela fica na regra).
+    """
+    # Importado aqui: simbolos importa este módulo
+    from .simbolos import RegraIndiceSimbolos
+
+    return MotorRegras([
+        RegraListaParametrosLonga(param_threshold),
+        RegraFeatureEnvy(razao_feature_envy, minimo_acessos),
+        RegraIndiceSimbolos(),
+    ])
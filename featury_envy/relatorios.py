@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Relatórios em texto (português) dos code smells encontrados"""
+
+from typing import Dict, List, Optional, TextIO
+
+
+def gerar_relatorio_feature_envy(casos: List[Dict], razao: float, minimo_acessos: int):
+    """
+    Imprime um relatório dos procedimentos e eventos com Feature Envy.
+    """
+    print("\n" + "=" * 20 + " RELATÓRIO DE FEATURE ENVY " + "=" * 20)
+    print(f"Analisando acessos a outros componentes (≥ {minimo_acessos} e > {razao}x os acessos ao próprio)")
+    print("-" * 67)
+
+    if not casos:
+        print("🎉 Nenhum caso de Feature Envy foi detectado.")
+        return
+
+    print(f"Encontrado(s) {len(casos)} caso(s) suspeito(s):\n")
+
+    for i, caso in enumerate(casos, 1):
+        rotulo = "Procedimento" if caso['kind'] == 'procedure' else "Evento"
+        print(f"🟠 CASO #{i}: {rotulo} '{caso['name']}'")
+        print(f"   - Componente invejado: {caso['envied_component']} ({caso['envied_component_type']}) "
+              f"com {caso['envied_accesses']} acesso(s)")
+        print(f"   - Acessos próprios ({caso['own_component']} e a tela): {caso['own_accesses']}")
+        print(f"   - Sugestão: Considere mover esta lógica para mais perto de '{caso['envied_component']}' "
+              f"ou extrair um procedimento dedicado a ele.\n")
+
+def gerar_relatorio_smell(procedures: List[Dict], threshold: int, saida: Optional[TextIO] = None):
+    """
+    Imprime um relatório focado apenas nos procedimentos com o code smell
+    (em 'saida', se indicada; é também o formato 'texto' dos escritores de featury_envy.saidas).
+    """
+    smelly_procedures = [p for p in procedures if p['parameter_count'] > threshold]
+
+    print("\n" + "=" * 20 + " RELATÓRIO DE CODE SMELL " + "=" * 20, file=saida)
+    print(f"Analisando 'Lista de Parâmetros Longa' (Limite > {threshold} parâmetros)", file=saida)
+    print("-" * 64, file=saida)
+
+    if not smelly_procedures:
+        print(f"🎉 Nenhum procedimento com mais de {threshold} parâmetros foi detectado.", file=saida)
+        return
+
+    print(f"Encontrado(s) {len(smelly_procedures)} procedimento(s) suspeito(s):\n", file=saida)
+
+    for i, case in enumerate(smelly_procedures, 1):
+        tela = f" [{case['screen_name']}]" if case.get('screen_name') else ""
+        print(f"🔴 CASO #{i}: Procedimento '{case['procedure_name']}'{tela}", file=saida)
+        print(f"   - Parâmetros Encontrados: {case['parameter_count']} (Limite era {threshold})", file=saida)
+        print(f"   - Nomes dos Parâmetros: {', '.join(case['parameters'])}", file=saida)
+        print("   - Diagnóstico: Este procedimento tem uma lista de parâmetros longa, o que pode dificultar o seu uso e manutenção.", file=saida)
+        print("   - Sugestão: Considere agrupar parâmetros em uma estrutura de dados (como uma lista ou dicionário) ou dividir o procedimento em funções menores.\n", file=saida)
+
+def gerar_relatorio_desempenho_regras(estatisticas: Dict[str, Dict[str, float]]):
+    """
+    Imprime o tempo e o número de invocações de cada regra, da mais cara para a mais barata.
+    """
+    print("\n" + "=" * 20 + " DESEMPENHO DAS REGRAS " + "=" * 20)
+    for nome, valores in sorted(estatisticas.items(), key=lambda item: -item[1]["tempo_s"]):
+        print(f"   - {nome}: {valores['tempo_s'] * 1000:.2f} ms em {int(valores['invocacoes'])} invocação(ões)")
+
+def gerar_relatorio_diferenca(diferenca: Dict[str, List[Dict]]):
+    """
+    Imprime os achados novos, corrigidos e inalterados entre duas revisões de um projeto.
+    """
+    print("\n" + "=" * 20 + " DIFERENÇA ENTRE REVISÕES " + "=" * 20)
+    print(f"Novos: {len(diferenca['new'])} | Corrigidos: {len(diferenca['fixed'])} | "
+          f"Inalterados: {len(diferenca['unchanged'])}")
+    print("-" * 66)
+
+    rotulos = (('new', "🔴 NOVO"), ('fixed', "✅ CORRIGIDO"), ('unchanged', "⚪ INALTERADO"))
+    for status, rotulo in rotulos:
+        for item in diferenca[status]:
+            print(f"{rotulo}: [{item['screen']}] {item['rule']} em '{item['name']}'")
+
+def gerar_relatorio_duplicacao(classes: List[Dict], minimo_blocos: int):
+    """
+    Imprime as classes de blocos duplicados, das que duplicam mais blocos para as que duplicam menos.
+    """
+    rotulos_escopo = {'tela': "na mesma tela", 'projeto': "entre telas", 'corpus': "entre projetos"}
+    print("\n" + "=" * 20 + " RELATÓRIO DE CÓDIGO DUPLICADO " + "=" * 20)
+    print(f"Analisando pilhas de blocos repetidas (≥ {minimo_blocos} blocos)")
+    print("-" * 71)
+
+    if not classes:
+        print("🎉 Nenhum bloco duplicado foi detectado.")
+        return
+
+    print(f"Encontrada(s) {len(classes)} classe(s) de clones:\n")
+
+    for i, classe in enumerate(classes, 1):
+        print(f"🟣 CLONE #{i}: {len(classe['occurrences'])} cópias de '{classe['type']}' "
+              f"com {classe['size']} bloco(s), {rotulos_escopo[classe['scope']]}")
+        for ocorrencia in classe['occurrences']:
+            projeto = f"{ocorrencia['project']}: " if ocorrencia['project'] else ""
+            print(f"   - {projeto}[{ocorrencia['screen_name']}] {ocorrencia['unit']} (bloco {ocorrencia['block_id']})")
+        print("   - Sugestão: Considere extrair estes blocos para um procedimento e chamá-lo nos vários lugares.\n")
+
+def gerar_relatorio_agrupamentos(grupos: List[Dict], limiar: float):
+    """
+    Imprime os grupos de projetos quase idênticos (com mais de um membro), dos maiores para os menores.
+    """
+    print("\n" + "=" * 20 + " RELATÓRIO DE PROJETOS SEMELHANTES " + "=" * 20)
+    print(f"Agrupando projetos com similaridade estimada ≥ {limiar:.2f}")
+    print("-" * 75)
+
+    total = sum(grupo['size'] for grupo in grupos)
+    semelhantes = [grupo for grupo in grupos if grupo['size'] > 1]
+    if not semelhantes:
+        print(f"🎉 Nenhum grupo de projetos semelhantes entre {total} projeto(s).")
+        return
+
+    print(f"Encontrado(s) {len(semelhantes)} grupo(s) entre {total} projeto(s):\n")
+
+    for i, grupo in enumerate(semelhantes, 1):
+        print(f"🟠 GRUPO #{i}: {grupo['size']} projetos, representante '{grupo['representative']}'")
+        for membro in grupo['members']:
+            if membro['project'] != grupo['representative']:
+                print(f"   - {membro['project']} (similaridade {membro['similarity']:.2f})")
+        print("   - Sugestão: Verifique se os projetos são cópias (plágio ou tutorial) antes de avaliá-los.\n")
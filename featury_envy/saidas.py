@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Escritores de resultados em streaming (JSONL, CSV, SARIF 2.1.0 e texto)
+
+Cada escritor recebe os registros de um projeto de cada vez ('escrever'), grava-os logo e
+descarrega o buffer; a memória não cresce com o tamanho do corpus e uma falha a meio perde,
+no máximo, o projeto em curso. 'fechar' grava o que falta no fim do documento (o fecho do
+SARIF). Os escritores são gerenciadores de contexto.
+
+Exemplo:
+    with criar_escritor(open('achados.sarif', 'w'), 'sarif', param_threshold=3) as escritor:
+        escritor.escrever(registros_do_projeto)
+"""
+
+import csv
+import json
+from typing import Dict, List, Optional, TextIO
+
+from .constantes import METRICAS_COMPLEXIDADE
+from .regras import RegraListaParametrosLonga
+from .relatorios import gerar_relatorio_smell
+
+CAMPOS_REGISTRO = ['project', 'screen_name', 'procedure_name', 'parameter_count', 'parameters', 'long_parameter_list',
+                   *METRICAS_COMPLEXIDADE]
+FORMATOS = ('jsonl', 'csv', 'sarif', 'texto')
+# Extensão do arquivo de saída -> formato (as demais saem em JSONL)
+EXTENSOES_FORMATO = {'.csv': 'csv', '.sarif': 'sarif', '.sarif.json': 'sarif', '.txt': 'texto'}
+
+URI_ESQUEMA_SARIF = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+# =====================================
+# Registros de Procedimento
+# =====================================
+def criar_registro(projeto: str, screen_name: str, proc: Dict, param_threshold: int) -> Dict:
+    """
+    Registro de um procedimento (uma linha do JSONL/CSV) a partir do resultado da detecção.
+    """
+    return {
+        'project': projeto,
+        'screen_name': screen_name,
+        'procedure_name': proc['procedure_name'],
+        'parameter_count': proc['parameter_count'],
+        'parameters': proc['parameters'],
+        'long_parameter_list': proc['parameter_count'] > param_threshold,
+        **{metrica: proc[metrica] for metrica in METRICAS_COMPLEXIDADE},
+    }
+
+def formato_da_saida(caminho: str, formato: Optional[str] = None) -> str:
+    """
+    O formato pedido ou, se não houver, o deduzido da extensão do arquivo (padrão: jsonl).
+    """
+    if formato:
+        return formato
+    for extensao, deduzido in EXTENSOES_FORMATO.items():
+        if caminho.endswith(extensao):
+            return deduzido
+    return 'jsonl'
+
+
+# =====================================
+# Escritores
+# =====================================
+class EscritorRegistros:
+    """
+    Base dos escritores: grava os registros de cada projeto e descarrega o buffer logo a seguir.
+    """
+
+    def __init__(self, saida: TextIO):
+        self.saida = saida
+
+    def escrever(self, registros: List[Dict]):
+        for registro in registros:
+            self._escrever_registro(registro)
+        self.saida.flush()
+
+    def _escrever_registro(self, registro: Dict):
+        raise NotImplementedError
+
+    def fechar(self):
+        self.saida.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+class EscritorJsonl(EscritorRegistros):
+    """
+    Um registro JSON por linha.
+    """
+
+    def _escrever_registro(self, registro: Dict):
+        self.saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+class EscritorCsv(EscritorRegistros):
+    """
+    CSV com as colunas de CAMPOS_REGISTRO; os parâmetros vão separados por ';'.
+    """
+
+    def __init__(self, saida: TextIO):
+        super().__init__(saida)
+        self._csv = csv.DictWriter(saida, fieldnames=CAMPOS_REGISTRO)
+        self._csv.writeheader()
+
+    def _escrever_registro(self, registro: Dict):
+        linha = dict(registro)
+        linha['parameters'] = ';'.join(registro['parameters'])
+        self._csv.writerow(linha)
+
+class EscritorSarif(EscritorRegistros):
+    """
+    Log SARIF 2.1.0 com um resultado por procedimento com lista de parâmetros longa, para
+    interfaces de revisão de código. O cabeçalho é gravado ao abrir e cada resultado assim que
+    chega; o documento só é JSON válido depois de 'fechar'.
+    """
+
+    def __init__(self, saida: TextIO, param_threshold: int):
+        super().__init__(saida)
+        self.param_threshold = param_threshold
+        self._resultados = 0
+        # O documento completo com 'results' vazio, dividido onde os resultados serão inseridos
+        documento = json.dumps(self._documento(), ensure_ascii=False, indent=2)
+        self._inicio, self._fim = documento.split('"results": []')
+        self.saida.write(self._inicio + '"results": [')
+
+    def _documento(self) -> Dict:
+        regra = {
+            'id': RegraListaParametrosLonga.nome,
+            'name': 'LongParameterList',
+            'shortDescription': {'text': "Lista de parâmetros longa"},
+            'fullDescription': {'text': f"Procedimento com mais de {self.param_threshold} parâmetros."},
+            'help': {'text': "Considere agrupar parâmetros em uma estrutura de dados (como uma lista ou "
+                             "dicionário) ou dividir o procedimento em funções menores."},
+            'defaultConfiguration': {'level': 'warning'},
+        }
+        return {
+            '$schema': URI_ESQUEMA_SARIF,
+            'version': '2.1.0',
+            'runs': [{
+                'tool': {'driver': {'name': 'featury_envy', 'rules': [regra]}},
+                'results': [],
+            }],
+        }
+
+    def _escrever_registro(self, registro: Dict):
+        if not registro['long_parameter_list']:
+            return
+        projeto, tela, nome = registro['project'], registro['screen_name'], registro['procedure_name']
+        resultado = {
+            'ruleId': RegraListaParametrosLonga.nome,
+            'ruleIndex': 0,
+            'level': 'warning',
+            'message': {'text': f"O procedimento '{nome}' tem {registro['parameter_count']} parâmetros "
+                                f"(limite: {self.param_threshold}): {', '.join(registro['parameters'])}"},
+            'locations': [{
+                'physicalLocation': {'artifactLocation': {'uri': f"{projeto}.aia"}},
+                'logicalLocations': [{'name': nome, 'fullyQualifiedName': f"{tela}/{nome}", 'kind': 'function'}],
+            }],
+            'partialFingerprints': {'procedimento/v1': f"{projeto}/{tela}/{nome}"},
+            'properties': {metrica: registro[metrica] for metrica in METRICAS_COMPLEXIDADE},
+        }
+        separador = ',\n' if self._resultados else '\n'
+        self.saida.write(separador + json.dumps(resultado, ensure_ascii=False))
+        self._resultados += 1
+
+    def fechar(self):
+        self.saida.write(('\n' if self._resultados else '') + ']' + self._fim + '\n')
+        super().fechar()
+
+class EscritorTexto(EscritorRegistros):
+    """
+    O relatório de code smell em texto (gerar_relatorio_smell), um bloco por projeto.
+    """
+
+    def __init__(self, saida: TextIO, param_threshold: int):
+        super().__init__(saida)
+        self.param_threshold = param_threshold
+
+    def escrever(self, registros: List[Dict]):
+        if registros:
+            self.saida.write(f"\n📦 Projeto: {registros[0]['project']}")
+            gerar_relatorio_smell(registros, self.param_threshold, self.saida)
+        self.saida.flush()
+
+def criar_escritor(saida: TextIO, formato: str, param_threshold: int = 3) -> EscritorRegistros:
+    """
+    Escritor do formato pedido ('jsonl', 'csv', 'sarif' ou 'texto') sobre 'saida'.
+    """
+    if formato == 'jsonl':
+        return EscritorJsonl(saida)
+    if formato == 'csv':
+        return EscritorCsv(saida)
+    if formato == 'sarif':
+        return EscritorSarif(saida, param_threshold)
+    if formato == 'texto':
+        return EscritorTexto(saida, param_threshold)
+    raise ValueError(f"formato desconhecido: {formato!r} (use um de {', '.join(FORMATOS)})")
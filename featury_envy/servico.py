@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""Serviço HTTP local de análise
+
+Um servidor HTTP/1.1 mínimo sobre asyncio (só biblioteca padrão) para que outras ferramentas
+(scripts de correção, plugins do LMS) peçam a análise de um .aia sem iniciar um interpretador
+por arquivo. A análise corre num pool de processos já aquecidos.
+
+Rotas:
+    POST /analisar?limite=3   corpo: bytes do .aia   -> JSON com as telas e procedimentos
+    GET  /saude                                       -> {"estado": "ok", ...}
+    GET  /metricas                                    -> métricas no formato de texto do Prometheus
+
+Com o pool e a fila cheios, novos pedidos recebem 429 (com Retry-After); um pedido que excede
+o tempo limite recebe 504. O trabalho de um pedido expirado continua a contar para a fila até
+terminar, para que a contrapressão reflita a ocupação real dos processos.
+
+Exemplo:
+    python -m featury_envy.servico --porta 8765 --trabalhadores 4
+    curl --data-binary @projeto.aia 'http://127.0.0.1:8765/analisar?limite=3'
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .constantes import VERSAO_ANALISADOR
+from .paralelo import resumir_projeto
+
+TAMANHO_MAXIMO_PADRAO = 50 * 1024 * 1024  # 50 MB por pedido
+TEMPO_LEITURA_S = 30.0
+MOTIVOS_HTTP = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 411: "Length Required", 413: "Payload Too Large",
+    429: "Too Many Requests", 500: "Internal Server Error", 504: "Gateway Timeout",
+}
+
+
+class ErroHTTP(Exception):
+    def __init__(self, estado: int, mensagem: str, cabecalhos: Optional[Dict[str, str]] = None):
+        super().__init__(mensagem)
+        self.estado = estado
+        self.cabecalhos = cabecalhos or {}
+
+
+def _aquecer() -> bool:
+    # Executado uma vez em cada processo ao iniciar o serviço: importa o analisador antes do primeiro pedido
+    return True
+
+
+class ServicoAnalise:
+    """
+    Servidor de análise: aceita pedidos enquanto houver lugar no pool ('trabalhadores') ou na
+    fila ('tamanho_fila'), e responde 429 quando ambos estão cheios.
+    """
+
+    def __init__(self, trabalhadores: int = 2, tamanho_fila: int = 8, tempo_limite_s: float = 30.0,
+                 tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO):
+        self.trabalhadores = trabalhadores
+        self.tamanho_fila = tamanho_fila
+        self.tempo_limite_s = tempo_limite_s
+        self.tamanho_maximo = tamanho_maximo
+        self.porta: Optional[int] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._pendentes = 0
+        self._metricas: Dict[str, float] = {
+            'pedidos_analise': 0, 'rejeitados_fila_cheia': 0, 'tempos_esgotados': 0,
+            'analise_segundos_soma': 0.0, 'analise_segundos_contagem': 0, 'bytes_recebidos': 0,
+        }
+        self._respostas: Dict[int, int] = {}
+
+    # ---------- Ciclo de vida ----------
+    async def iniciar(self, host: str = '127.0.0.1', porta: int = 8765):
+        """
+        Cria e aquece o pool de processos e começa a aceitar ligações (porta 0 escolhe uma livre).
+        """
+        self._pool = ProcessPoolExecutor(max_workers=self.trabalhadores)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _aquecer) for _ in range(self.trabalhadores)))
+        self._servidor = await asyncio.start_server(self._atender, host, porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def encerrar(self):
+        """
+        Deixa de aceitar ligações e encerra o pool depois das análises em curso.
+        """
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._pool is not None:
+            # Espera as análises em curso com o laço ainda ativo (os seus resultados voltam por ele)
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self._pool.shutdown, wait=True, cancel_futures=True)
+            )
+
+    async def servir_para_sempre(self):
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    # ---------- Protocolo HTTP ----------
+    async def _ler_pedido(self, leitor: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+        try:
+            cabecalho = await asyncio.wait_for(leitor.readuntil(b'\r\n\r\n'), TEMPO_LEITURA_S)
+        except asyncio.LimitOverrunError:
+            raise ErroHTTP(400, "cabeçalhos grandes demais")
+        linhas = cabecalho.decode('latin-1').split('\r\n')
+        try:
+            metodo, alvo, _ = linhas[0].split(' ', 2)
+        except ValueError:
+            raise ErroHTTP(400, "linha de pedido inválida")
+        cabecalhos = {}
+        for linha in linhas[1:]:
+            if ':' in linha:
+                nome, valor = linha.split(':', 1)
+                cabecalhos[nome.strip().lower()] = valor.strip()
+
+        corpo = b''
+        if metodo == 'POST':
+            if 'content-length' not in cabecalhos:
+                raise ErroHTTP(411, "Content-Length é obrigatório")
+            try:
+                tamanho = int(cabecalhos['content-length'])
+            except ValueError:
+                raise ErroHTTP(400, "Content-Length inválido")
+            if tamanho > self.tamanho_maximo:
+                raise ErroHTTP(413, f"o corpo excede {self.tamanho_maximo} bytes")
+            corpo = await asyncio.wait_for(leitor.readexactly(tamanho), TEMPO_LEITURA_S)
+        return metodo, alvo, cabecalhos, corpo
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        try:
+            try:
+                metodo, alvo, _, corpo = await self._ler_pedido(leitor)
+                estado, tipo, resposta, extras = await self._despachar(metodo, alvo, corpo)
+            except ErroHTTP as e:
+                estado, tipo, extras = e.estado, 'application/json', e.cabecalhos
+                resposta = json.dumps({'erro': str(e)}, ensure_ascii=False).encode('utf-8')
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                estado, tipo, extras, resposta = 408, 'application/json', {}, b'{"erro": "pedido incompleto"}'
+            except Exception as e:
+                estado, tipo, extras = 500, 'application/json', {}
+                resposta = json.dumps({'erro': f"{type(e).__name__}: {e}"}, ensure_ascii=False).encode('utf-8')
+
+            self._respostas[estado] = self._respostas.get(estado, 0) + 1
+            linhas = [f"HTTP/1.1 {estado} {MOTIVOS_HTTP.get(estado, '')}",
+                      f"Content-Type: {tipo}", f"Content-Length: {len(resposta)}", "Connection: close"]
+            linhas += [f"{nome}: {valor}" for nome, valor in extras.items()]
+            escritor.write(('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1') + resposta)
+            await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _despachar(self, metodo: str, alvo: str, corpo: bytes) -> Tuple[int, str, bytes, Dict[str, str]]:
+        url = urlsplit(alvo)
+        if url.path == '/analisar':
+            if metodo != 'POST':
+                raise ErroHTTP(405, "use POST com os bytes do .aia no corpo", {'Allow': 'POST'})
+            parametros = parse_qs(url.query)
+            try:
+                limite = int(parametros.get('limite', ['3'])[0])
+            except ValueError:
+                raise ErroHTTP(400, "'limite' deve ser um inteiro")
+            nome = parametros.get('nome', ['projeto.aia'])[0]
+            resultado = await self.analisar(nome, corpo, limite)
+            return 200, 'application/json', json.dumps(resultado, ensure_ascii=False).encode('utf-8'), {}
+        if url.path == '/saude':
+            saude = {'estado': 'ok', 'versao': VERSAO_ANALISADOR, 'pendentes': self._pendentes,
+                     'capacidade': self.trabalhadores + self.tamanho_fila}
+            return 200, 'application/json', json.dumps(saude).encode('utf-8'), {}
+        if url.path == '/metricas':
+            return 200, 'text/plain; version=0.0.4', self.metricas_prometheus().encode('utf-8'), {}
+        raise ErroHTTP(404, f"rota desconhecida: {url.path}")
+
+    # ---------- Análise com contrapressão ----------
+    async def analisar(self, nome: str, conteudo: bytes, limite: int = 3) -> Dict:
+        """
+        Analisa um .aia no pool. Levanta ErroHTTP(429) se o pool e a fila estiverem cheios
+        e ErroHTTP(504) se a análise exceder o tempo limite.
+        """
+        if self._pendentes >= self.trabalhadores + self.tamanho_fila:
+            self._metricas['rejeitados_fila_cheia'] += 1
+            raise ErroHTTP(429, "fila de análise cheia", {'Retry-After': '1'})
+
+        self._pendentes += 1
+        self._metricas['pedidos_analise'] += 1
+        self._metricas['bytes_recebidos'] += len(conteudo)
+        inicio = time.perf_counter()
+        futuro = asyncio.get_running_loop().run_in_executor(self._pool, resumir_projeto, (nome, conteudo))
+        futuro.add_done_callback(self._liberar)
+        try:
+            resumo = await asyncio.wait_for(asyncio.shield(futuro), self.tempo_limite_s)
+        except asyncio.TimeoutError:
+            self._metricas['tempos_esgotados'] += 1
+            raise ErroHTTP(504, f"a análise excedeu {self.tempo_limite_s:g}s")
+        self._metricas['analise_segundos_soma'] += time.perf_counter() - inicio
+        self._metricas['analise_segundos_contagem'] += 1
+
+        for tela in resumo['screens']:
+            for procedimento in tela['procedures']:
+                procedimento['long_parameter_list'] = procedimento['parameter_count'] > limite
+        return {
+            'project': resumo['project'],
+            'limite': limite,
+            'versao': VERSAO_ANALISADOR,
+            'screens': resumo['screens'],
+            'erros': resumo['erros'],
+        }
+
+    def _liberar(self, futuro):
+        self._pendentes -= 1
+        if not futuro.cancelled():
+            futuro.exception()  # evita o aviso de exceção nunca recuperada
+
+    def metricas_prometheus(self) -> str:
+        """
+        Métricas do serviço no formato de texto do Prometheus.
+        """
+        prefixo = 'featury_envy_servico'
+        linhas = [
+            f'# TYPE {prefixo}_pedidos_analise_total counter',
+            f'{prefixo}_pedidos_analise_total {int(self._metricas["pedidos_analise"])}',
+            f'# TYPE {prefixo}_rejeitados_fila_cheia_total counter',
+            f'{prefixo}_rejeitados_fila_cheia_total {int(self._metricas["rejeitados_fila_cheia"])}',
+            f'# TYPE {prefixo}_tempos_esgotados_total counter',
+            f'{prefixo}_tempos_esgotados_total {int(self._metricas["tempos_esgotados"])}',
+            f'# TYPE {prefixo}_bytes_recebidos_total counter',
+            f'{prefixo}_bytes_recebidos_total {int(self._metricas["bytes_recebidos"])}',
+            f'# TYPE {prefixo}_analise_segundos summary',
+            f'{prefixo}_analise_segundos_sum {self._metricas["analise_segundos_soma"]:.6f}',
+            f'{prefixo}_analise_segundos_count {int(self._metricas["analise_segundos_contagem"])}',
+            f'# TYPE {prefixo}_pendentes gauge',
+            f'{prefixo}_pendentes {self._pendentes}',
+            f'# TYPE {prefixo}_respostas_total counter',
+        ]
+        linhas += [f'{prefixo}_respostas_total{{codigo="{estado}"}} {quantidade}'
+                   for estado, quantidade in sorted(self._respostas.items())]
+        return '\n'.join(linhas) + '\n'
+
+
+# =====================================
+# PONTO DE ENTRADA / EXECUÇÃO
+# =====================================
+async def _executar(args):
+    servico = ServicoAnalise(args.trabalhadores, args.fila, args.tempo_limite, args.tamanho_maximo_mb * 1024 * 1024)
+    await servico.iniciar(args.host, args.porta)
+    sys.stderr.write(f"Serviço de análise em http://{args.host}:{servico.porta} "
+                     f"({args.trabalhadores} processo(s), fila de {args.fila})\n")
+    try:
+        await servico.servir_para_sempre()
+    finally:
+        await servico.encerrar()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serviço HTTP local de análise de projetos App Inventor (.aia).")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--trabalhadores', type=int, default=2, help="Processos de análise (padrão: 2)")
+    parser.add_argument('--fila', type=int, default=8,
+                        help="Pedidos em espera além dos que estão em análise antes de responder 429 (padrão: 8)")
+    parser.add_argument('--tempo-limite', type=float, default=30.0, help="Tempo máximo por pedido, em segundos")
+    parser.add_argument('--tamanho-maximo-mb', type=int, default=50, help="Tamanho máximo do .aia, em MB")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_executar(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""Índice de símbolos e grafo de chamadas de um projeto
+
+Uma única passagem pela árvore de cada tela registra as definições de procedimentos, os pontos
+de chamada (com o número de argumentos), as variáveis globais declaradas e lidas/alteradas e os
+componentes usados por cada unidade (procedimento, evento ou declaração global).
+As consultas (chamadores, chamados, procedimentos não usados, fan-in/fan-out...) são feitas
+sobre dicionários, sem voltar a percorrer as árvores.
+
+No App Inventor os procedimentos e as globais pertencem à tela, por isso cada símbolo é
+identificado por (nome_da_tela, nome).
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .aia import ler_telas_aia
+from .arvore import filhos_do_bloco, parse_blockly_xml_to_ast
+from .constantes import TIPOS_PROCEDIMENTO, OrigemAia
+from .feature_envy import TIPOS_REFERENCIA_COMPONENTE, componente_referenciado, nome_da_unidade
+from .procedimentos import detalhar_procedimento
+from .regras import ContextoTela, Regra
+
+TIPOS_CHAMADA = ('procedures_callnoreturn', 'procedures_callreturn')
+TIPOS_VARIAVEL = ('lexical_variable_get', 'lexical_variable_set')
+TIPO_GLOBAL = 'global_declaration'
+# Os blocos de variável gravam as globais como "global nome" no campo VAR
+PREFIXO_GLOBAL = 'global '
+
+# (nome_da_tela, nome do símbolo)
+Chave = Tuple[str, str]
+
+
+def _campo(bloco: Mapping, nome: str) -> Optional[str]:
+    for field in bloco.get('fields', []):
+        if field.get('name') == nome:
+            return field.get('text')
+    return None
+
+
+# =====================================
+# Índice de Símbolos
+# =====================================
+class IndiceSimbolos:
+    """
+    Símbolos e grafo de chamadas de uma ou mais telas.
+    Cada tela é acrescentada com 'acrescentar_tela' (ou pela RegraIndiceSimbolos durante a
+    passagem do MotorRegras); todas as consultas são buscas em dicionários.
+    """
+
+    def __init__(self):
+        # (tela, procedimento) -> detalhes da definição (como em detalhar_procedimento)
+        self.definicoes: Dict[Chave, Dict] = {}
+        # (tela, global) -> declaração
+        self.globais: Dict[Chave, Dict] = {}
+        # (tela, unidade) -> 'procedure', 'event', 'global' ou 'other'
+        self.unidades: Dict[Chave, str] = {}
+        # (tela, procedimento chamado) -> pontos de chamada
+        self.chamadas: Dict[Chave, List[Dict]] = {}
+        self._chamadores: Dict[Chave, Dict[Chave, int]] = {}
+        self._chamados: Dict[Chave, Dict[Chave, int]] = {}
+        # (tela, unidade) -> {global: {'get': n, 'set': n}}
+        self._globais_usadas: Dict[Chave, Dict[str, Dict[str, int]]] = {}
+        # (tela, unidade) -> {componente: acessos}
+        self._componentes_usados: Dict[Chave, Dict[str, int]] = {}
+
+    # ---------- Construção ----------
+    def registrar_unidade(self, topo: Mapping, nome_tela: str) -> Chave:
+        """
+        Registra um bloco de topo como unidade e devolve a sua chave.
+        """
+        tipo = topo.get('type')
+        if tipo in TIPOS_PROCEDIMENTO:
+            detalhes = detalhar_procedimento(topo)
+            chave = (nome_tela, detalhes['procedure_name'])
+            self.definicoes[chave] = dict(
+                detalhes, screen_name=nome_tela, returns=tipo == 'procedures_defreturn', block_id=topo.get('id')
+            )
+            self.unidades[chave] = 'procedure'
+        elif tipo == 'component_event':
+            chave = (nome_tela, nome_da_unidade(topo)[1])
+            self.unidades[chave] = 'event'
+        elif tipo == TIPO_GLOBAL:
+            nome = _campo(topo, 'NAME') or ''
+            chave = (nome_tela, PREFIXO_GLOBAL + nome)
+            self.globais[(nome_tela, nome)] = {'screen_name': nome_tela, 'name': nome, 'block_id': topo.get('id')}
+            self.unidades[chave] = 'global'
+        else:
+            # Blocos soltos na área de trabalho: contam como unidade própria, identificada pelo id
+            chave = (nome_tela, f"{tipo}#{topo.get('id')}")
+            self.unidades[chave] = 'other'
+        return chave
+
+    def registrar_bloco(self, bloco: Mapping, unidade: Chave):
+        """
+        Registra uma chamada, um acesso a global ou a componente feito por 'bloco' dentro de 'unidade'.
+        """
+        tipo = bloco.get('type')
+        nome_tela = unidade[0]
+        if tipo in TIPOS_CHAMADA:
+            mutacao = bloco.get('mutation', {})
+            chamado = (nome_tela, _campo(bloco, 'PROCNAME') or mutacao.get('name') or '')
+            argumentos = mutacao.get('args')
+            if argumentos is None:
+                argumentos = [v for v in bloco.get('values', []) if (v.get('name') or '').startswith('ARG')]
+            self.chamadas.setdefault(chamado, []).append({
+                'screen_name': nome_tela,
+                'procedure_name': chamado[1],
+                'caller': unidade[1],
+                'block_id': bloco.get('id'),
+                'argument_count': len(argumentos),
+            })
+            chamadores = self._chamadores.setdefault(chamado, {})
+            chamadores[unidade] = chamadores.get(unidade, 0) + 1
+            chamados = self._chamados.setdefault(unidade, {})
+            chamados[chamado] = chamados.get(chamado, 0) + 1
+        elif tipo in TIPOS_VARIAVEL:
+            variavel = _campo(bloco, 'VAR') or ''
+            if variavel.startswith(PREFIXO_GLOBAL):
+                acesso = 'set' if tipo == 'lexical_variable_set' else 'get'
+                usos = self._globais_usadas.setdefault(unidade, {}).setdefault(
+                    variavel[len(PREFIXO_GLOBAL):], {'get': 0, 'set': 0}
+                )
+                usos[acesso] += 1
+        elif tipo in TIPOS_REFERENCIA_COMPONENTE:
+            instancia = componente_referenciado(bloco)
+            if instancia:
+                usados = self._componentes_usados.setdefault(unidade, {})
+                usados[instancia] = usados.get(instancia, 0) + 1
+
+    def acrescentar_tela(self, ast: Mapping, nome_tela: str):
+        """
+        Percorre a árvore de uma tela uma vez (pilha explícita) e acrescenta os seus símbolos.
+        """
+        for topo in (ast.get('blocks', []) if ast else []):
+            if not topo:
+                continue
+            unidade = self.registrar_unidade(topo, nome_tela)
+            pilha = filhos_do_bloco(topo)
+            while pilha:
+                bloco = pilha.pop()
+                self.registrar_bloco(bloco, unidade)
+                pilha.extend(filhos_do_bloco(bloco))
+
+    # ---------- Consultas ----------
+    def definicao(self, nome_tela: str, nome: str) -> Optional[Dict]:
+        return self.definicoes.get((nome_tela, nome))
+
+    def chamadas_para(self, nome_tela: str, nome: str) -> List[Dict]:
+        """
+        Pontos de chamada de um procedimento.
+        """
+        return self.chamadas.get((nome_tela, nome), [])
+
+    def chamadores(self, nome_tela: str, nome: str) -> Dict[Chave, int]:
+        """
+        Unidades que chamam o procedimento, com o número de chamadas de cada uma.
+        """
+        return self._chamadores.get((nome_tela, nome), {})
+
+    def chamados(self, nome_tela: str, nome: str) -> Dict[Chave, int]:
+        """
+        Procedimentos chamados pela unidade, com o número de chamadas a cada um.
+        """
+        return self._chamados.get((nome_tela, nome), {})
+
+    def fan_in(self, nome_tela: str, nome: str) -> int:
+        return len(self.chamadores(nome_tela, nome))
+
+    def fan_out(self, nome_tela: str, nome: str) -> int:
+        return len(self.chamados(nome_tela, nome))
+
+    def globais_usadas(self, nome_tela: str, nome: str) -> Dict[str, Dict[str, int]]:
+        """
+        Globais lidas ('get') e alteradas ('set') pela unidade.
+        """
+        return self._globais_usadas.get((nome_tela, nome), {})
+
+    def componentes_usados(self, nome_tela: str, nome: str) -> Dict[str, int]:
+        return self._componentes_usados.get((nome_tela, nome), {})
+
+    def procedimentos_nao_usados(self) -> List[Chave]:
+        """
+        Procedimentos definidos que nenhuma unidade chama (na ordem de definição).
+        """
+        return [chave for chave in self.definicoes if chave not in self._chamadores]
+
+    def chamadas_indefinidas(self) -> List[Dict]:
+        """
+        Pontos de chamada de procedimentos sem definição na tela.
+        """
+        return [c for chave, chamadas in self.chamadas.items() if chave not in self.definicoes for c in chamadas]
+
+    def chamadas_com_muitos_argumentos(self, limite: int) -> List[Dict]:
+        """
+        Pontos de chamada que passam mais de 'limite' argumentos.
+        """
+        return [c for chamadas in self.chamadas.values() for c in chamadas if c['argument_count'] > limite]
+
+    def alcancaveis(self, nome_tela: str, nome: str) -> Set[Chave]:
+        """
+        Procedimentos alcançáveis a partir da unidade pelo grafo de chamadas (busca em largura).
+        """
+        visitados: Set[Chave] = set()
+        fila = deque(self.chamados(nome_tela, nome))
+        while fila:
+            chave = fila.popleft()
+            if chave in visitados:
+                continue
+            visitados.add(chave)
+            fila.extend(self._chamados.get(chave, ()))
+        return visitados
+
+    def metricas_procedimento(self, nome_tela: str, nome: str) -> Dict:
+        """
+        Métricas do procedimento para mostrar ao lado do número de parâmetros.
+        """
+        chamadas = self.chamadas_para(nome_tela, nome)
+        globais = self.globais_usadas(nome_tela, nome)
+        return {
+            'call_sites': len(chamadas),
+            'fan_in': self.fan_in(nome_tela, nome),
+            'fan_out': self.fan_out(nome_tela, nome),
+            'max_arguments_passed': max((c['argument_count'] for c in chamadas), default=0),
+            'globals_read': sum(1 for usos in globais.values() if usos['get']),
+            'globals_written': sum(1 for usos in globais.values() if usos['set']),
+            'unused': not chamadas,
+        }
+
+    def metricas_procedimentos(self) -> List[Dict]:
+        """
+        Uma linha por procedimento definido: nome, parâmetros e métricas do grafo de chamadas.
+        """
+        return [
+            dict(
+                {k: definicao[k] for k in ('screen_name', 'procedure_name', 'parameter_count', 'parameters')},
+                **self.metricas_procedimento(*chave)
+            )
+            for chave, definicao in self.definicoes.items()
+        ]
+
+
+# =====================================
+# Integração com o Motor de Regras
+# =====================================
+class RegraIndiceSimbolos(Regra):
+    """
+    Preenche um IndiceSimbolos durante a passagem do MotorRegras, sem percurso extra.
+    Não produz achados; o índice da tela fica em 'indice'. Com um 'indice' informado, este
+    acumula todas as telas analisadas; sem ele, cada tela começa um índice novo (o motor padrão
+    dos trabalhadores do lote analisa milhares de telas).
+    """
+    nome = 'indice_simbolos'
+    tipos_de_bloco = (TIPOS_PROCEDIMENTO + ('component_event', TIPO_GLOBAL) + TIPOS_CHAMADA
+                      + TIPOS_VARIAVEL + TIPOS_REFERENCIA_COMPONENTE)
+
+    def __init__(self, indice: Optional[IndiceSimbolos] = None):
+        self._acumular = indice is not None
+        self.indice = indice if indice is not None else IndiceSimbolos()
+        self._topo_atual: Optional[Mapping] = None
+        self._unidade: Optional[Chave] = None
+
+    def iniciar_tela(self, contexto: ContextoTela):
+        if not self._acumular:
+            self.indice = IndiceSimbolos()
+        self._topo_atual = None
+
+    def visitar(self, bloco: Mapping, contexto: ContextoTela):
+        # O bloco de topo pode não ser de um tipo registrado (bloco solto): regista-o ao primeiro filho
+        if contexto.bloco_topo is not self._topo_atual:
+            self._topo_atual = contexto.bloco_topo
+            self._unidade = self.indice.registrar_unidade(self._topo_atual, contexto.nome_tela or '')
+        if bloco is not contexto.bloco_topo:
+            self.indice.registrar_bloco(bloco, self._unidade)
+
+
+# =====================================
+# Construção a partir de Telas e Projetos
+# =====================================
+def construir_indice_simbolos(telas: Iterable[Tuple[str, Mapping]]) -> IndiceSimbolos:
+    """
+    Índice de várias telas já convertidas: (nome_da_tela, ast).
+    """
+    indice = IndiceSimbolos()
+    for nome_tela, ast in telas:
+        indice.acrescentar_tela(ast, nome_tela)
+    return indice
+
+def indexar_projeto(origem: OrigemAia) -> Optional[IndiceSimbolos]:
+    """
+    Índice de todas as telas de um .aia (caminho, bytes ou arquivo). None se o zip for inválido.
+    """
+    telas = ler_telas_aia(origem)
+    if telas is None:
+        return None
+    indice = IndiceSimbolos()
+    for nome_tela, xml_bytes in telas:
+        ast = parse_blockly_xml_to_ast(xml_bytes, compacta=True)
+        if ast:
+            indice.acrescentar_tela(ast, nome_tela)
+    return indice
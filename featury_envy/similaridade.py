@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""Agrupamento de projetos quase idênticos num corpus (MinHash + LSH)
+
+Cada .aia é reduzido a um conjunto de shingles: sequências de 'tamanho_shingle' tokens
+consecutivos (tipo de cada bloco e nome=valor de cada campo, na ordem do XML) das suas telas.
+A assinatura MinHash estima a similaridade de Jaccard entre dois conjuntos; com o LSH
+(as assinaturas divididas em bandas, cada banda num dicionário) só os projetos que
+partilham uma banda são comparados, em vez de todos os pares.
+Os candidatos confirmados (similaridade estimada ≥ limiar) são unidos em grupos e cada
+grupo tem um representante (o membro mais parecido com os demais).
+
+Exemplo:
+    python -m featury_envy.similaridade submissoes/ --limiar 0.8
+    python -m featury_envy.lote submissoes/ --agrupar-similares 0.8 --so-representantes --agrupamentos grupos.json
+"""
+
+import argparse
+import json
+import sys
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .aia import ler_telas_aia
+from .constantes import BN, OrigemAia
+from .paralelo import mapear_telas
+from .relatorios import gerar_relatorio_agrupamentos
+
+# Primo de Mersenne 2^61 - 1 para as permutações ((a*x + b) mod P) e a máscara de 32 bits do resultado
+_PRIMO = np.uint64((1 << 61) - 1)
+_MASCARA = np.uint64((1 << 32) - 1)
+# Colunas de shingles processadas de cada vez (limita a matriz permutações x shingles)
+_COLUNAS_POR_VEZ = 4096
+
+
+# =====================================
+# Shingles de um Projeto
+# =====================================
+def tokens_tela(xml_bytes: bytes) -> List[str]:
+    """
+    Tokens de uma tela na ordem do documento: 'b:tipo' para cada bloco e 'f:nome=valor' para cada campo.
+    Levanta ET.ParseError se o XML for inválido.
+    """
+    tag_bloco, tag_campo = f'{BN}block', f'{BN}field'
+    tokens = []
+    for elemento in ET.fromstring(xml_bytes).iter():
+        if elemento.tag == tag_bloco:
+            tokens.append('b:' + (elemento.get('type') or ''))
+        elif elemento.tag == tag_campo:
+            tokens.append(f"f:{elemento.get('name')}={elemento.text or ''}")
+    return tokens
+
+def shingles_projeto(origem: OrigemAia, tamanho_shingle: int = 4) -> Optional[np.ndarray]:
+    """
+    Hashes (CRC32) dos shingles de todas as telas do projeto, sem repetições.
+    None se o zip for inválido; telas com XML inválido são ignoradas.
+    """
+    telas = ler_telas_aia(origem)
+    if telas is None:
+        return None
+    hashes = set()
+    for _, xml_bytes in telas:
+        try:
+            tokens = tokens_tela(xml_bytes)
+        except ET.ParseError:
+            continue
+        # Uma tela com menos tokens do que o tamanho do shingle vira um único shingle
+        for inicio in range(max(1, len(tokens) - tamanho_shingle + 1)):
+            hashes.add(zlib.crc32('\x1f'.join(tokens[inicio:inicio + tamanho_shingle]).encode('utf-8')))
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+# =====================================
+# Assinaturas MinHash
+# =====================================
+def permutacoes(num_permutacoes: int = 128, semente: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coeficientes (a, b) das permutações h(x) = ((a*x + b) mod P) & (2^32 - 1), com a e b uniformes em [0, P).
+    O produto transborda em 64 bits (aritmética modular do numpy), o que só embaralha mais os valores.
+    """
+    gerador = np.random.default_rng(semente)
+    a = gerador.integers(1, int(_PRIMO), size=num_permutacoes, dtype=np.uint64)
+    b = gerador.integers(0, int(_PRIMO), size=num_permutacoes, dtype=np.uint64)
+    return a, b
+
+def assinatura_minhash(shingles: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Mínimo de cada permutação sobre os shingles, calculado em blocos de colunas.
+    """
+    assinatura = np.full(len(a), _MASCARA, dtype=np.uint64)
+    for inicio in range(0, len(shingles), _COLUNAS_POR_VEZ):
+        x = shingles[inicio:inicio + _COLUNAS_POR_VEZ]
+        valores = ((a[:, None] * x[None, :] + b[:, None]) % _PRIMO) & _MASCARA
+        np.minimum(assinatura, valores.min(axis=1), out=assinatura)
+    return assinatura
+
+def _assinar_projeto(tarefa: Tuple[str, int, int, int]) -> Tuple[Optional[np.ndarray], int]:
+    # Executado no pool: (caminho, tamanho_shingle, num_permutacoes, semente) -> (assinatura, shingles)
+    caminho, tamanho_shingle, num_permutacoes, semente = tarefa
+    shingles = shingles_projeto(caminho, tamanho_shingle)
+    if shingles is None:
+        return None, 0
+    if len(shingles) == 0:
+        return np.empty(0, dtype=np.uint64), 0
+    return assinatura_minhash(shingles, *permutacoes(num_permutacoes, semente)), len(shingles)
+
+def configuracao_lsh(num_permutacoes: int, limiar: float) -> Tuple[int, int]:
+    """
+    (bandas, linhas por banda) cujo limiar aproximado do LSH, (1/bandas)^(1/linhas), é o maior
+    que ainda fica abaixo de 'limiar': poucos pares acima do limiar deixam de ser candidatos.
+    """
+    opcoes = [(b, num_permutacoes // b) for b in range(1, num_permutacoes + 1) if num_permutacoes % b == 0]
+    abaixo = [(b, r) for b, r in opcoes if (1 / b) ** (1 / r) <= limiar]
+    if not abaixo:
+        return num_permutacoes, 1
+    return max(abaixo, key=lambda opcao: (1 / opcao[0]) ** (1 / opcao[1]))
+
+
+# =====================================
+# Índice LSH e Grupos
+# =====================================
+class IndiceMinHash:
+    """
+    Assinaturas MinHash de vários projetos e os seus baldes LSH. 'grupos()' une os candidatos
+    cuja similaridade estimada atinge o limiar; projetos sem candidatos ficam em grupos de um.
+    """
+
+    def __init__(self, limiar: float = 0.8, num_permutacoes: int = 128):
+        self.limiar = limiar
+        self.num_permutacoes = num_permutacoes
+        self.bandas, self.linhas = configuracao_lsh(num_permutacoes, limiar)
+        self.nomes: List[str] = []
+        self._assinaturas: List[Optional[np.ndarray]] = []
+        self._baldes: Dict[Tuple[int, bytes], List[int]] = {}
+
+    def acrescentar(self, nome: str, assinatura: Optional[np.ndarray]):
+        """
+        Acrescenta um projeto. Sem assinatura (zip inválido ou sem blocos), ele fica sozinho no seu grupo.
+        """
+        indice = len(self.nomes)
+        self.nomes.append(nome)
+        self._assinaturas.append(assinatura if assinatura is not None and len(assinatura) else None)
+        if self._assinaturas[indice] is None:
+            return
+        for banda in range(self.bandas):
+            chave = assinatura[banda * self.linhas:(banda + 1) * self.linhas].tobytes()
+            self._baldes.setdefault((banda, chave), []).append(indice)
+
+    def similaridade(self, i: int, j: int) -> float:
+        """
+        Similaridade de Jaccard estimada entre dois projetos (fração de posições iguais nas assinaturas).
+        """
+        if self._assinaturas[i] is None or self._assinaturas[j] is None:
+            return 1.0 if i == j else 0.0
+        return float(np.mean(self._assinaturas[i] == self._assinaturas[j]))
+
+    def grupos(self) -> List[Dict]:
+        """
+        Grupos de projetos quase idênticos, dos maiores para os menores:
+        {'representative': nome, 'size': n, 'members': [{'project': nome, 'similarity': s}, ...]}.
+        A similaridade de cada membro é a estimada em relação ao representante.
+        """
+        pais = list(range(len(self.nomes)))
+
+        def raiz(i: int) -> int:
+            while pais[i] != i:
+                pais[i] = pais[pais[i]]
+                i = pais[i]
+            return i
+
+        # Em cada balde, cada membro é confirmado contra um líder por grupo já visto no balde (e não contra
+        # todos os outros membros): O(n·permutações) quando o balde é um só grupo de quase cópias
+        for membros in self._baldes.values():
+            if len(membros) < 2:
+                continue
+            lideres: List[int] = []
+            for membro in membros:
+                if any(raiz(lider) == raiz(membro) for lider in lideres):
+                    continue
+                if lideres:
+                    assinaturas = np.stack([self._assinaturas[lider] for lider in lideres])
+                    similares = (assinaturas == self._assinaturas[membro]).mean(axis=1) >= self.limiar
+                    unidos = [lider for lider, similar in zip(lideres, similares) if similar]
+                else:
+                    unidos = []
+                for lider in unidos:
+                    pais[raiz(lider)] = raiz(membro)
+                # Os líderes unidos passam a ser um só grupo: fica o primeiro
+                lideres = [lider for lider in lideres if lider not in unidos[1:]]
+                if not unidos:
+                    lideres.append(membro)
+
+        por_raiz: Dict[int, List[int]] = {}
+        for i in range(len(self.nomes)):
+            por_raiz.setdefault(raiz(i), []).append(i)
+
+        grupos = []
+        for membros in por_raiz.values():
+            representante = self._representante(membros)
+            grupos.append({
+                'representative': self.nomes[representante],
+                'size': len(membros),
+                'members': [
+                    {'project': self.nomes[m], 'similarity': round(self.similaridade(representante, m), 4)}
+                    for m in membros
+                ],
+            })
+        grupos.sort(key=lambda g: (-g['size'], g['representative']))
+        return grupos
+
+    def _representante(self, membros: List[int]) -> int:
+        # O membro com maior similaridade média aos demais (empates: o primeiro acrescentado). Em cada
+        # posição, as posições iguais à do membro são as ocorrências do seu valor: uma passada, sem pares
+        if len(membros) <= 2:
+            return membros[0]
+        assinaturas = np.stack([self._assinaturas[m] for m in membros])
+        iguais = np.zeros(len(membros), dtype=np.int64)
+        for coluna in assinaturas.T:
+            _, inverso, contagens = np.unique(coluna, return_inverse=True, return_counts=True)
+            iguais += contagens[inverso]
+        return membros[int(np.argmax(iguais))]
+
+def agrupar_projetos(caminhos: Sequence[str], limiar: float = 0.8, num_permutacoes: int = 128,
+                     tamanho_shingle: int = 4, executor: str = 'processos', trabalhadores: Optional[int] = None,
+                     semente: int = 1) -> Dict:
+    """
+    Calcula as assinaturas dos projetos no executor escolhido e agrupa os quase idênticos.
+    Devolve {'grupos': [...], 'erros': [(caminho, mensagem)], 'bandas': b, 'linhas': r}.
+    Um .aia inválido aparece em 'erros' e forma um grupo sozinho.
+    """
+    tarefas = [(caminho, tamanho_shingle, num_permutacoes, semente) for caminho in caminhos]
+    resultados = mapear_telas(_assinar_projeto, tarefas, executor, trabalhadores)
+
+    indice = IndiceMinHash(limiar, num_permutacoes)
+    erros = []
+    for caminho, resultado in zip(caminhos, resultados):
+        if isinstance(resultado, Exception):
+            erros.append((caminho, f"{type(resultado).__name__}: {resultado}"))
+            assinatura = None
+        else:
+            assinatura, _ = resultado
+            if assinatura is None:
+                erros.append((caminho, "não é um arquivo zip válido ou está corrompido"))
+        indice.acrescentar(caminho, assinatura)
+    return {'grupos': indice.grupos(), 'erros': erros, 'bandas': indice.bandas, 'linhas': indice.linhas}
+
+
+# =====================================
+# PONTO DE ENTRADA / EXECUÇÃO
+# =====================================
+def main(argv: Optional[List[str]] = None) -> int:
+    from .lote import descobrir_arquivos_aia
+
+    parser = argparse.ArgumentParser(description="Agrupa projetos .aia quase idênticos (MinHash + LSH).")
+    parser.add_argument('entradas', nargs='+', help="Diretórios, padrões glob ou manifestos")
+    parser.add_argument('--limiar', type=float, default=0.8,
+                        help="Similaridade de Jaccard estimada mínima para agrupar (padrão: 0.8)")
+    parser.add_argument('--permutacoes', type=int, default=128, help="Tamanho da assinatura MinHash (padrão: 128)")
+    parser.add_argument('--shingle', type=int, default=4, help="Tokens por shingle (padrão: 4)")
+    parser.add_argument('-p', '--processos', type=int, default=None,
+                        help="Número de processos para calcular as assinaturas (padrão: número de CPUs)")
+    parser.add_argument('--json', action='store_true', help="Imprime os grupos em JSON")
+    args = parser.parse_args(argv)
+
+    caminhos = descobrir_arquivos_aia(args.entradas)
+    if not caminhos:
+        sys.stderr.write("⚠️ Nenhum arquivo .aia encontrado nas entradas informadas.\n")
+        return 1
+    resultado = agrupar_projetos(caminhos, args.limiar, args.permutacoes, args.shingle,
+                                 trabalhadores=args.processos)
+    if args.json:
+        json.dump(resultado, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        gerar_relatorio_agrupamentos(resultado['grupos'], args.limiar)
+    for caminho, erro in resultado['erros']:
+        sys.stderr.write(f"❌ {caminho}: {erro}\n")
+    return 1 if resultado['erros'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""Configuração dos testes: o pacote e o gerador de projetos sintéticos de benchmarks/"""
+
+import os
+import sys
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ_REPOSITORIO)
+sys.path.insert(0, os.path.join(RAIZ_REPOSITORIO, 'benchmarks'))
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Testes do cache de análise num diretório partilhado por vários processos"""
+
+import os
+import random
+
+from featury_envy.cache import FRACAO_REVARREDURA, CacheAnalise
+
+LIMITE = 64 * 1024
+
+
+def tamanho_diretorio(diretorio: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(diretorio) for f in files)
+
+def valor(rng: random.Random) -> str:
+    # Texto pouco compressível, cerca de 2 KB por entrada
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(2500))
+
+
+def test_diretorio_partilhado_respeita_o_limite(tmp_path):
+    # Cada instância simula um processo, com o seu próprio índice em memória
+    caches = [CacheAnalise(str(tmp_path), LIMITE) for _ in range(4)]
+    rng = random.Random(0)
+    for i in range(400):
+        cache = caches[i % len(caches)]
+        cache.guardar(cache.chave(f"tela{i}"), valor(rng))
+        assert tamanho_diretorio(str(tmp_path)) <= LIMITE * (1 + len(caches) * FRACAO_REVARREDURA)
+    assert sum(c.remocoes for c in caches) > 0
+
+def test_remocao_segue_os_acessos_dos_outros_processos(tmp_path):
+    a, b = CacheAnalise(str(tmp_path), LIMITE), CacheAnalise(str(tmp_path), LIMITE)
+    rng = random.Random(1)
+    a.guardar(a.chave("modelo"), valor(rng))
+    for i in range(100):
+        # 'b' usa sempre a entrada gravada por 'a'; 'a' só grava
+        assert b.obter(b.chave("modelo")) is not None
+        a.guardar(a.chave(f"tela{i}"), valor(rng))
+    assert a.obter(a.chave("modelo")) is not None
+    assert a.obter(a.chave("tela0")) is None
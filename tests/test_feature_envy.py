@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Testes da detecção de Feature Envy (índice de referências e regra do motor)"""
+
+import pytest
+
+from featury_envy.arvore import parse_blockly_xml_to_ast
+from featury_envy.feature_envy import construir_indice_referencias, find_feature_envy
+from featury_envy.regras import criar_motor_padrao
+
+BLOCKLY_NS = "https://developers.google.com/blockly/xml"
+COMPONENTES = {'Screen1': 'Form', 'Botao1': 'Button', 'Rotulo1': 'Label', 'TinyDB1': 'TinyDB'}
+
+
+def acesso(instancia: str, interno: str = '') -> str:
+    # 'set instancia.Text', encadeando o bloco seguinte em 'interno'
+    tipo = COMPONENTES[instancia]
+    proximo = f'<next>{interno}</next>' if interno else ''
+    return (f'<block type="component_set_get"><mutation component_type="{tipo}" set_or_get="set" '
+            f'property_name="Text" instance_name="{instancia}"></mutation>'
+            f'<field name="COMPONENT_SELECTOR">{instancia}</field>{proximo}</block>')
+
+def corpo(*instancias: str) -> str:
+    xml = ''
+    for instancia in reversed(instancias):
+        xml = acesso(instancia, xml)
+    return xml
+
+def evento(instancia: str, *acessos: str) -> str:
+    return (f'<block type="component_event"><mutation component_type="{COMPONENTES[instancia]}" '
+            f'instance_name="{instancia}" event_name="Click"></mutation>'
+            f'<field name="COMPONENT_SELECTOR">{instancia}</field>'
+            f'<statement name="DO">{corpo(*acessos)}</statement></block>')
+
+def procedimento(nome: str, *acessos: str) -> str:
+    return (f'<block type="procedures_defnoreturn"><field name="NAME">{nome}</field>'
+            f'<statement name="STACK">{corpo(*acessos)}</statement></block>')
+
+def casos(*blocos: str, componentes=COMPONENTES):
+    ast = parse_blockly_xml_to_ast(f'<xml xmlns="{BLOCKLY_NS}">{"".join(blocos)}</xml>', compacta=True)
+    pelo_indice = find_feature_envy(construir_indice_referencias(ast, componentes, 'Screen1'))
+    pelo_motor = criar_motor_padrao().analisar(ast, 'Screen1', componentes)['feature_envy']
+    assert pelo_indice == pelo_motor
+    return pelo_indice
+
+
+def test_evento_que_usa_mais_outro_componente_e_sinalizado():
+    achados = casos(evento('Botao1', 'Botao1', 'Rotulo1', 'Rotulo1', 'Rotulo1'))
+    assert len(achados) == 1
+    assert achados[0]['name'] == 'Botao1.Click'
+    assert achados[0]['own_accesses'] == 1
+    assert (achados[0]['envied_component'], achados[0]['envied_accesses']) == ('Rotulo1', 3)
+
+def test_acessos_a_tela_contam_como_proprios():
+    achados = casos(procedimento('salvar', 'Screen1', 'TinyDB1', 'TinyDB1', 'TinyDB1'))
+    assert [(a['own_accesses'], a['envied_component']) for a in achados] == [(1, 'TinyDB1')]
+    assert not casos(procedimento('salvar', 'Screen1', 'Screen1', 'TinyDB1', 'TinyDB1', 'TinyDB1'))
+
+@pytest.mark.parametrize('bloco', [
+    # Sem nenhum acesso próprio não há termo de comparação
+    evento('Botao1', 'Rotulo1', 'Rotulo1', 'Rotulo1', 'Rotulo1'),
+    procedimento('mostrar', 'Rotulo1', 'Rotulo1', 'Rotulo1'),
+    # Acessos estrangeiros que não passam de 'razao' vezes os próprios
+    evento('Botao1', 'Botao1', 'Botao1', 'Rotulo1', 'Rotulo1', 'Rotulo1', 'Rotulo1'),
+    # Menos do que 'minimo_acessos'
+    evento('Botao1', 'Botao1', 'Rotulo1', 'Rotulo1'),
+], ids=['evento sem acessos próprios', 'procedimento sem acessos à tela', 'razão', 'mínimo de acessos'])
+def test_unidades_sem_inveja_nao_sao_sinalizadas(bloco):
+    assert not casos(bloco)
+
+def test_tela_reconhecida_pelo_tipo_sem_scm():
+    # Sem o .scm, o tipo 'Form' vem da mutação do bloco
+    assert casos(evento('Botao1', 'Screen1', 'TinyDB1', 'TinyDB1', 'TinyDB1'), componentes=None)
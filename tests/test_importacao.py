@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Guarda da importação do pacote: sem efeitos colaterais, sem dependências pesadas, rápida
+
+A importação é medida num processo novo (como nos trabalhadores do lote), com o mesmo
+procedimento de benchmarks/benchmark_importacao.py. O limite de tempo aqui é folgado, para não
+falhar em máquinas lentas; só um módulo pesado carregado por engano (pandas, numpy...) o excede.
+"""
+
+import featury_envy
+from benchmark_importacao import MODULOS_PROIBIDOS, medir_importacao
+
+LIMITE_MS = 300
+
+
+def test_importacao_sem_efeitos_colaterais():
+    medida = medir_importacao()
+    assert medida["stdout"] == ""
+    assert not set(medida["modulos"]) & set(MODULOS_PROIBIDOS)
+
+def test_importacao_rapida():
+    melhor_ms = min(medir_importacao()["cumulativo_us"] for _ in range(3)) / 1000
+    assert melhor_ms < LIMITE_MS
+
+def test_nomes_publicos():
+    publicos = featury_envy.__all__
+    assert len(publicos) == len(set(publicos))
+    assert set(featury_envy._IMPORTACOES_TARDIAS) <= set(publicos)
+    for nome in publicos:
+        assert getattr(featury_envy, nome) is not None, nome
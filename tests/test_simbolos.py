@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Testes do índice de símbolos no motor padrão e no resumo de tela do dashboard"""
+
+from featury_envy.arvore import parse_blockly_xml_to_ast
+from featury_envy.paralelo import resumir_tela
+from featury_envy.regras import criar_motor_padrao
+from featury_envy.simbolos import RegraIndiceSimbolos
+
+BLOCKLY_NS = "https://developers.google.com/blockly/xml"
+# 'calcular' chama 'somar' com 2 argumentos; ninguém chama 'calcular'
+TELA = (f'<xml xmlns="{BLOCKLY_NS}">'
+        '<block type="procedures_defnoreturn"><field name="NAME">calcular</field><statement name="STACK">'
+        '<block type="procedures_callnoreturn"><mutation xmlns="http://www.w3.org/1999/xhtml" name="somar">'
+        '<arg name="a"></arg><arg name="b"></arg>'
+        '</mutation><field name="PROCNAME">somar</field>'
+        '<value name="ARG0"><block type="math_number"><field name="NUM">1</field></block></value>'
+        '<value name="ARG1"><block type="math_number"><field name="NUM">2</field></block></value>'
+        '</block></statement></block>'
+        '<block type="procedures_defreturn"><field name="NAME">somar</field>'
+        '<field name="VAR0">a</field><field name="VAR1">b</field></block>'
+        '</xml>').encode('utf-8')
+
+
+def test_resumir_tela_usa_o_nome_real_da_tela():
+    resumo = resumir_tela(('Screen2', TELA))
+    metricas = {p['procedure_name']: p for p in resumo['procedures']}
+    assert (metricas['somar']['call_sites'], metricas['somar']['fan_in'], metricas['somar']['unused']) == (1, 1, False)
+    assert metricas['somar']['max_arguments_passed'] == 2
+    assert (metricas['calcular']['fan_out'], metricas['calcular']['unused']) == (1, True)
+
+def test_motor_padrao_monta_um_indice_por_tela():
+    motor = criar_motor_padrao()
+    ast = parse_blockly_xml_to_ast(TELA, compacta=True)
+    achados = motor.analisar(ast, 'Screen1')
+    assert achados[RegraIndiceSimbolos.nome] == []
+    motor.analisar(ast, 'Screen2')
+    indice = motor.regra(RegraIndiceSimbolos.nome).indice
+    assert list(indice.definicoes) == [('Screen2', 'calcular'), ('Screen2', 'somar')]
+    assert indice.chamadores('Screen2', 'somar') == {('Screen2', 'calcular'): 1}
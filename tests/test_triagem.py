@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Teste diferencial da triagem por bytes (featury_envy.procedimentos.triar_tela)
+
+A triagem nunca pode descartar uma tela em que o parser encontraria um procedimento (ou um
+procedimento longo, para cada limite): confere-se tela a tela sobre o dataset, telas sintéticas
+e casos adversariais, e depois os registros do lote com e sem --triagem/--so-longos.
+"""
+
+import glob
+import io
+import os
+import random
+import zipfile
+from typing import List, Tuple
+
+import pytest
+
+from gerador_aia import BLOCKLY_NS, gerar_aia, gerar_xml_tela
+from featury_envy.aia import ler_telas_aia
+from featury_envy.lote import executar_lote
+from featury_envy.procedimentos import iterar_procedimentos_xml, triar_tela
+from featury_envy.saidas import EscritorJsonl
+
+RAIZ_REPOSITORIO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIMITES = range(0, 9)
+
+PROCEDIMENTO = ('<block type="procedures_defreturn" x="0" y="0"><field name="NAME">f</field>'
+                '<field name="VAR0">a</field><field name="VAR1">b</field></block>')
+UTF16 = f'<?xml version="1.0" encoding="UTF-16"?><xml xmlns="{BLOCKLY_NS}">{PROCEDIMENTO}</xml>'
+CASOS_ADVERSARIAIS = {
+    'aspas simples': f"<xml xmlns='{BLOCKLY_NS}'><block type='procedures_defnoreturn'>"
+                     "<field name='NAME'>f</field><field name='VAR0'>a</field></block></xml>".encode('utf-8'),
+    'espaços no atributo': f'<xml xmlns="{BLOCKLY_NS}"><block type="procedures_defnoreturn">'
+                           '<field name = "NAME">f</field><field name = "VAR0">a</field>'
+                           '<field name = "VAR1">b</field></block></xml>'.encode('utf-8'),
+    'referência de caractere': f'<xml xmlns="{BLOCKLY_NS}"><block type="procedures&#95;defreturn">'
+                               '<field name="NAME">f</field><field name="&#86;AR0">a</field></block></xml>'
+                               .encode('utf-8'),
+    'entidade declarada': f'<!DOCTYPE xml [<!ENTITY p "procedures_defreturn">]><xml xmlns="{BLOCKLY_NS}">'
+                          '<block type="&p;"><field name="NAME">f</field><field name="VAR0">a</field></block></xml>'
+                          .encode('utf-8'),
+    'utf-16': UTF16.encode('utf-16'),
+    'utf-16-le sem BOM': UTF16.encode('utf-16-le'),
+    'utf-16-be sem BOM': UTF16.encode('utf-16-be'),
+    'marcador num texto': f'<xml xmlns="{BLOCKLY_NS}"><block type="text">'
+                          '<field name="TEXT">procedures_defreturn</field></block></xml>'.encode('utf-8'),
+    'definição aninhada': f'<xml xmlns="{BLOCKLY_NS}"><block type="controls_if"><statement name="DO0">'
+                          f'{PROCEDIMENTO}</statement></block></xml>'.encode('utf-8'),
+    'sem procedimentos': f'<xml xmlns="{BLOCKLY_NS}"><block type="component_event"></block></xml>'.encode('utf-8'),
+    'vazia': f'<xml xmlns="{BLOCKLY_NS}"></xml>'.encode('utf-8'),
+}
+
+
+def telas_de_teste(semente: int = 0) -> List[Tuple[str, bytes]]:
+    rng = random.Random(semente)
+    telas = []
+    for caminho in sorted(glob.glob(os.path.join(RAIZ_REPOSITORIO, 'dataset', '*.aia'))):
+        telas.extend((f"{os.path.basename(caminho)}/{nome}", xml) for nome, xml in ler_telas_aia(caminho) or [])
+    for i in range(60):
+        procedimentos, parametros = rng.choice([0, 0, 1, 3]), rng.randint(0, 6)
+        xml = gerar_xml_tela(rng.randint(20, 400), procedimentos, parametros, rng.randint(1, 8),
+                             rng.randint(0, 3), semente=i)
+        telas.append((f"sintética{i} ({procedimentos}x{parametros})", xml.encode('utf-8')))
+    telas.extend(CASOS_ADVERSARIAIS.items())
+    return telas
+
+def gerar_corpus(diretorio: str, projetos: int, semente: int = 0) -> List[str]:
+    # Projetos com 4 telas; na maioria das telas não há procedimentos
+    rng = random.Random(semente)
+    caminhos = []
+    for i in range(projetos):
+        caminho = os.path.join(diretorio, f"projeto{i}.aia")
+        gerar_aia(caminho, telas=1, blocos_por_tela=100, procedimentos=rng.randint(1, 4),
+                  parametros=rng.randint(0, 6), semente=i)
+        with zipfile.ZipFile(caminho, 'a') as arquivo_zip:
+            for t in range(2, 5):
+                procedimentos = 0 if rng.random() < 0.7 else 2
+                xml = gerar_xml_tela(100, procedimentos, rng.randint(0, 6), semente=i * 10 + t)
+                arquivo_zip.writestr(f"src/appinventor/ai_teste/ProjetoSintetico/Screen{t}.bky", xml)
+        caminhos.append(caminho)
+    return caminhos
+
+def rodar_lote(caminhos: List[str], limite: int, **opcoes) -> List[str]:
+    saida = io.StringIO()
+    resumo = executar_lote(caminhos, limite, EscritorJsonl(saida), processos=1, progresso=io.StringIO(), **opcoes)
+    assert not resumo['falhas'], resumo['falhas']
+    return sorted(saida.getvalue().splitlines())
+
+
+# =====================================
+# Testes
+# =====================================
+TELAS = telas_de_teste()
+
+@pytest.mark.parametrize('nome, xml', TELAS, ids=[nome for nome, _ in TELAS])
+def test_triagem_nunca_descarta_procedimentos(nome, xml):
+    procedimentos = list(iterar_procedimentos_xml(xml))
+    if not triar_tela(xml):
+        assert not procedimentos, f"descartada com {len(procedimentos)} procedimento(s)"
+    for limite in LIMITES:
+        if not triar_tela(xml, limite):
+            longos = [p for p in procedimentos if p['parameter_count'] > limite]
+            assert not longos, f"descartada com limite {limite}, mas tem {longos}"
+
+def test_triagem_descarta_telas_sem_procedimentos():
+    assert not triar_tela(CASOS_ADVERSARIAIS['sem procedimentos'])
+    assert not triar_tela(CASOS_ADVERSARIAIS['vazia'])
+    assert triar_tela(CASOS_ADVERSARIAIS['utf-16-le sem BOM'], 1)
+
+def test_lote_com_triagem_igual_ao_completo(tmp_path):
+    caminhos = gerar_corpus(str(tmp_path), 12)
+    completo = rodar_lote(caminhos, 3)
+    assert rodar_lote(caminhos, 3, triagem=True) == completo
+
+    longos = [linha for linha in completo if '"long_parameter_list": true' in linha]
+    assert longos
+    assert rodar_lote(caminhos, 3, so_longos=True) == longos
+    assert rodar_lote(caminhos, 3, triagem=True, so_longos=True) == longos